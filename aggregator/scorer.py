@@ -15,9 +15,12 @@
 - -10 to -6: STRONG_SELL
 """
 
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Iterable, Optional, Sequence, Tuple
 import logging
 
+import numpy as np
+import pandas as pd
+
 logger = logging.getLogger(__name__)
 
 
@@ -102,6 +105,93 @@ class SignalAggregator:
             'outflow_count': len(outflow_signals)
         }
 
+    def score_matrix(
+        self,
+        signals: Any,
+        signal_names: Optional[Sequence[str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        批量计算评分与评级 (向量化，与 calculate_score 使用相同权重和阈值)
+
+        适用于回测、面板扫描等需要一次评估大量观测的场景：
+        评分 = 信号矩阵 × 权重向量，再截断到 [-10, 10] 并映射评级。
+
+        Args:
+            signals: 布尔信号矩阵 (观测 × 信号)。DataFrame 的列名即信号名；
+                ndarray 需同时提供 signal_names
+            signal_names: ndarray 各列对应的信号名
+
+        Returns:
+            (scores, ratings)：float 评分数组与评级字符串数组，长度等于观测数。
+            不在 SIGNAL_WEIGHTS 中的信号权重为 0
+        """
+        if isinstance(signals, pd.DataFrame):
+            signal_names = [str(name) for name in signals.columns]
+            matrix = signals.to_numpy()
+        else:
+            matrix = np.asarray(signals)
+            if signal_names is None:
+                raise ValueError("ndarray 信号矩阵需要提供 signal_names")
+        if matrix.ndim != 2 or matrix.shape[1] != len(signal_names):
+            raise ValueError(
+                f"信号矩阵形状 {matrix.shape} 与信号名数量 {len(signal_names)} 不一致"
+            )
+
+        weights = np.array(
+            [self.signal_weights.get(name, 0) for name in signal_names],
+            dtype=float,
+        )
+        # NaN 视为未触发，与字典接口中缺失的信号一致
+        triggered = np.nan_to_num(matrix.astype(float), nan=0.0) != 0
+        scores = np.clip(triggered.astype(float) @ weights, -10.0, 10.0)
+        return scores, self.rate_scores(scores)
+
+    def rate_scores(self, scores: Any) -> np.ndarray:
+        """
+        将评分数组映射为评级数组 (向量化的 _determine_rating)
+
+        按 SCORE_TO_RATING 的顺序取第一个包含该评分的区间，落在区间间隙中的评分为 NEUTRAL。
+
+        Args:
+            scores: 评分数组
+
+        Returns:
+            评级字符串数组
+        """
+        scores = np.asarray(scores, dtype=float)
+        ratings = list(self.score_to_rating)
+        conditions = [
+            (scores >= min_score) & (scores <= max_score)
+            for min_score, max_score in self.score_to_rating.values()
+        ]
+        return np.select(conditions, ratings, default='NEUTRAL').astype(object)
+
+    def signal_matrix(
+        self,
+        observations: Iterable[Iterable[str]],
+        signal_names: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        将每个观测触发的信号名列表转换为布尔信号矩阵 (供 score_matrix 使用)
+
+        Args:
+            observations: 每个观测触发的信号名，如回测信号日志中的 signals 列
+            signal_names: 矩阵列，默认 SIGNAL_WEIGHTS 中的全部信号
+
+        Returns:
+            布尔 DataFrame (观测 × 信号)
+        """
+        columns = list(signal_names or self.signal_weights)
+        position = {name: index for index, name in enumerate(columns)}
+        rows = [list(names) for names in observations]
+        matrix = np.zeros((len(rows), len(columns)), dtype=bool)
+        for row, names in enumerate(rows):
+            for name in names:
+                column = position.get(name)
+                if column is not None:
+                    matrix[row, column] = True
+        return pd.DataFrame(matrix, columns=columns)
+
     def _determine_rating(self, score: float) -> str:
         """
         根据评分确定评级
@@ -16,7 +16,7 @@
 """
 
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,15 +25,17 @@ logger = logging.getLogger(__name__)
 class IndicatorSignals:
     """技术指标信号分析器"""
 
-    def __init__(self, config):
+    def __init__(self, config, enabled: Optional[Iterable[str]] = None):
         """
         初始化技术指标分析器
 
         Args:
             config: 配置模块
+            enabled: 需要检测的信号名 (见 SignalPlan)，默认检测全部信号
         """
         self.config = config
         self.params = config.INDICATOR_PARAMS
+        self.enabled = frozenset(enabled) if enabled is not None else None
 
     def analyze(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -54,47 +56,59 @@ class IndicatorSignals:
         # ========== 看涨信号 (Bullish Signals) ==========
 
         # 1. OBV 看涨背离
-        obv_bullish_signal = self.detect_obv_bullish_divergence(df)
-        if obv_bullish_signal['detected']:
-            signals['OBV_BULLISH_DIVERGENCE'] = obv_bullish_signal
+        if self._enabled('OBV_BULLISH_DIVERGENCE'):
+            obv_bullish_signal = self.detect_obv_bullish_divergence(df)
+            if obv_bullish_signal['detected']:
+                signals['OBV_BULLISH_DIVERGENCE'] = obv_bullish_signal
 
         # 2. MFI 看涨背离和超卖
-        mfi_bullish_signal = self.detect_mfi_bullish_divergence(df)
-        if mfi_bullish_signal['detected']:
-            signals['MFI_BULLISH_DIVERGENCE'] = mfi_bullish_signal
+        if self._enabled('MFI_BULLISH_DIVERGENCE'):
+            mfi_bullish_signal = self.detect_mfi_bullish_divergence(df)
+            if mfi_bullish_signal['detected']:
+                signals['MFI_BULLISH_DIVERGENCE'] = mfi_bullish_signal
 
-        mfi_oversold_signal = self.detect_mfi_oversold(df)
-        if mfi_oversold_signal['detected']:
-            signals['MFI_OVERSOLD'] = mfi_oversold_signal
+        if self._enabled('MFI_OVERSOLD'):
+            mfi_oversold_signal = self.detect_mfi_oversold(df)
+            if mfi_oversold_signal['detected']:
+                signals['MFI_OVERSOLD'] = mfi_oversold_signal
 
         # ========== 看跌信号 (Bearish Signals) ==========
 
         # 3. OBV 看跌背离
-        obv_bearish_signal = self.detect_obv_bearish_divergence(df)
-        if obv_bearish_signal['detected']:
-            signals['OBV_BEARISH_DIVERGENCE'] = obv_bearish_signal
+        if self._enabled('OBV_BEARISH_DIVERGENCE'):
+            obv_bearish_signal = self.detect_obv_bearish_divergence(df)
+            if obv_bearish_signal['detected']:
+                signals['OBV_BEARISH_DIVERGENCE'] = obv_bearish_signal
 
         # 4. MFI 看跌背离和超买
-        mfi_bearish_signal = self.detect_mfi_bearish_divergence(df)
-        if mfi_bearish_signal['detected']:
-            signals['MFI_BEARISH_DIVERGENCE'] = mfi_bearish_signal
+        if self._enabled('MFI_BEARISH_DIVERGENCE'):
+            mfi_bearish_signal = self.detect_mfi_bearish_divergence(df)
+            if mfi_bearish_signal['detected']:
+                signals['MFI_BEARISH_DIVERGENCE'] = mfi_bearish_signal
 
-        mfi_overbought_signal = self.detect_mfi_overbought(df)
-        if mfi_overbought_signal['detected']:
-            signals['MFI_OVERBOUGHT'] = mfi_overbought_signal
+        if self._enabled('MFI_OVERBOUGHT'):
+            mfi_overbought_signal = self.detect_mfi_overbought(df)
+            if mfi_overbought_signal['detected']:
+                signals['MFI_OVERBOUGHT'] = mfi_overbought_signal
 
         # 5. RSI 看跌背离
-        rsi_signal = self.detect_rsi_bearish_divergence(df)
-        if rsi_signal['detected']:
-            signals['RSI_BEARISH_DIVERGENCE'] = rsi_signal
+        if self._enabled('RSI_BEARISH_DIVERGENCE'):
+            rsi_signal = self.detect_rsi_bearish_divergence(df)
+            if rsi_signal['detected']:
+                signals['RSI_BEARISH_DIVERGENCE'] = rsi_signal
 
         # 6. MACD 看跌背离
-        macd_signal = self.detect_macd_bearish_divergence(df)
-        if macd_signal['detected']:
-            signals['MACD_BEARISH_DIVERGENCE'] = macd_signal
+        if self._enabled('MACD_BEARISH_DIVERGENCE'):
+            macd_signal = self.detect_macd_bearish_divergence(df)
+            if macd_signal['detected']:
+                signals['MACD_BEARISH_DIVERGENCE'] = macd_signal
 
         return signals
 
+    def _enabled(self, signal_name: str) -> bool:
+        """信号是否需要检测"""
+        return self.enabled is None or signal_name in self.enabled
+
     # =========================================================================
     # 看涨信号检测 (Bullish Signal Detection)
     # =========================================================================
@@ -623,16 +637,21 @@ class IndicatorSignals:
         }
 
 
-def analyze_indicators(df: pd.DataFrame, config) -> Dict[str, Any]:
+def analyze_indicators(
+    df: pd.DataFrame,
+    config,
+    analyzer: Optional[IndicatorSignals] = None
+) -> Dict[str, Any]:
     """
     便捷函数：执行技术指标分析
 
     Args:
         df: 价格和指标数据
         config: 配置模块
+        analyzer: 复用的分析器 (如 SignalPlan.indicator_signals)，默认新建
 
     Returns:
         信号字典
     """
-    analyzer = IndicatorSignals(config)
+    analyzer = analyzer or IndicatorSignals(config)
     return analyzer.analyze(df)
@@ -15,7 +15,7 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,15 +24,17 @@ logger = logging.getLogger(__name__)
 class PriceVolumeSignals:
     """价量关系信号分析器"""
 
-    def __init__(self, config):
+    def __init__(self, config, enabled: Optional[Iterable[str]] = None):
         """
         初始化价量信号分析器
 
         Args:
             config: 配置模块
+            enabled: 需要检测的信号名 (见 SignalPlan)，默认检测全部信号
         """
         self.config = config
         self.params = config.PV_PARAMS
+        self.enabled = frozenset(enabled) if enabled is not None else None
 
     def analyze(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -53,45 +55,55 @@ class PriceVolumeSignals:
         # ========== 吸筹信号 (Accumulation Signals) ==========
 
         # 1. 放量突破横盘区
-        breakout_signal = self.detect_accumulation_breakout(df)
-        logger.debug(f"放量突破检测: {breakout_signal}")
-        if breakout_signal['detected']:
-            signals['ACCUMULATION_BREAKOUT'] = breakout_signal
+        if self._enabled('ACCUMULATION_BREAKOUT'):
+            breakout_signal = self.detect_accumulation_breakout(df)
+            logger.debug(f"放量突破检测: {breakout_signal}")
+            if breakout_signal['detected']:
+                signals['ACCUMULATION_BREAKOUT'] = breakout_signal
 
         # 2. 威科夫弹簧/震仓
-        spring_signal = self.detect_wyckoff_spring(df)
-        logger.debug(f"威科夫弹簧检测: {spring_signal}")
-        if spring_signal['detected']:
-            signals['WYCKOFF_SPRING'] = spring_signal
+        if self._enabled('WYCKOFF_SPRING'):
+            spring_signal = self.detect_wyckoff_spring(df)
+            logger.debug(f"威科夫弹簧检测: {spring_signal}")
+            if spring_signal['detected']:
+                signals['WYCKOFF_SPRING'] = spring_signal
 
         # ========== 派发信号 (Distribution Signals) ==========
 
         # 3. 高位放量滞涨
-        stagnation_signal = self.detect_high_volume_stagnation(df)
-        logger.debug(f"高位放量滞涨检测: {stagnation_signal}")
-        if stagnation_signal['detected']:
-            signals['HIGH_VOLUME_STAGNATION'] = stagnation_signal
+        if self._enabled('HIGH_VOLUME_STAGNATION'):
+            stagnation_signal = self.detect_high_volume_stagnation(df)
+            logger.debug(f"高位放量滞涨检测: {stagnation_signal}")
+            if stagnation_signal['detected']:
+                signals['HIGH_VOLUME_STAGNATION'] = stagnation_signal
 
         # 4. 放量下跌
-        decline_signal = self.detect_high_volume_decline(df)
-        logger.debug(f"放量下跌检测: {decline_signal}")
-        if decline_signal['detected']:
-            signals['HIGH_VOLUME_DECLINE'] = decline_signal
+        if self._enabled('HIGH_VOLUME_DECLINE'):
+            decline_signal = self.detect_high_volume_decline(df)
+            logger.debug(f"放量下跌检测: {decline_signal}")
+            if decline_signal['detected']:
+                signals['HIGH_VOLUME_DECLINE'] = decline_signal
 
         # 5. 放量跌破支撑
-        support_break_signal = self.detect_break_support(df)
-        logger.debug(f"放量跌破支撑检测: {support_break_signal}")
-        if support_break_signal['detected']:
-            signals['BREAK_SUPPORT_HEAVY_VOLUME'] = support_break_signal
+        if self._enabled('BREAK_SUPPORT_HEAVY_VOLUME'):
+            support_break_signal = self.detect_break_support(df)
+            logger.debug(f"放量跌破支撑检测: {support_break_signal}")
+            if support_break_signal['detected']:
+                signals['BREAK_SUPPORT_HEAVY_VOLUME'] = support_break_signal
 
         # 6. 高位缩量上涨
-        low_volume_rise = self.detect_low_volume_rise(df)
-        logger.debug(f"高位缩量上涨检测: {low_volume_rise}")
-        if low_volume_rise['detected']:
-            signals['LOW_VOLUME_RISE'] = low_volume_rise
+        if self._enabled('LOW_VOLUME_RISE'):
+            low_volume_rise = self.detect_low_volume_rise(df)
+            logger.debug(f"高位缩量上涨检测: {low_volume_rise}")
+            if low_volume_rise['detected']:
+                signals['LOW_VOLUME_RISE'] = low_volume_rise
 
         return signals
 
+    def _enabled(self, signal_name: str) -> bool:
+        """信号是否需要检测"""
+        return self.enabled is None or signal_name in self.enabled
+
     # =========================================================================
     # 吸筹信号检测 (Accumulation Signal Detection)
     # =========================================================================
@@ -549,16 +561,21 @@ class PriceVolumeSignals:
         }
 
 
-def analyze_price_volume(df: pd.DataFrame, config) -> Dict[str, Any]:
+def analyze_price_volume(
+    df: pd.DataFrame,
+    config,
+    analyzer: Optional[PriceVolumeSignals] = None
+) -> Dict[str, Any]:
     """
     便捷函数：执行价量关系分析
 
     Args:
         df: 价格数据
         config: 配置模块
+        analyzer: 复用的分析器 (如 SignalPlan.price_volume)，默认新建
 
     Returns:
         信号字典
     """
-    analyzer = PriceVolumeSignals(config)
+    analyzer = analyzer or PriceVolumeSignals(config)
     return analyzer.analyze(df)
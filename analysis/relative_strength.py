@@ -135,7 +135,8 @@ class RelativeStrengthAnalyzer:
 def analyze_relative_strength(
     stock_df: pd.DataFrame,
     benchmark_df: pd.DataFrame,
-    config
+    config,
+    analyzer: Optional[RelativeStrengthAnalyzer] = None
 ) -> Dict[str, Any]:
     """
     便捷函数：执行相对强弱分析
@@ -144,9 +145,10 @@ def analyze_relative_strength(
         stock_df: 个股数据
         benchmark_df: 基准数据
         config: 配置模块
+        analyzer: 复用的分析器 (如 SignalPlan.relative_strength)，默认新建
 
     Returns:
         信号字典
     """
-    analyzer = RelativeStrengthAnalyzer(config)
+    analyzer = analyzer or RelativeStrengthAnalyzer(config)
     return analyzer.analyze(stock_df, benchmark_df)
@@ -0,0 +1,174 @@
+"""
+信号计划模块 (Compiled Signal Plan)
+根据 SIGNAL_WEIGHTS、PV_PARAMS、INDICATOR_PARAMS、RELATIVE_STRENGTH_PARAMS
+和评级区间一次性编译分析计划，供多次扫描复用
+
+计划内容:
+- 启用的信号: 只有出现在 SIGNAL_WEIGHTS 中的信号会计入评分，其余检测器跳过
+- 指标集合: 启用的检测器实际读取的指标列，指标计算只生成这些列
+- 最少K线数: 启用的检测器所需的最长回看窗口
+- 复用的分析器: 价量、技术指标、相对强弱分析器与评分聚合器各构建一次
+"""
+
+from typing import Dict, FrozenSet, Optional, Tuple
+import hashlib
+import json
+import logging
+
+from aggregator.scorer import SignalAggregator
+from analysis.indicator_signals import IndicatorSignals
+from analysis.price_volume_signals import PriceVolumeSignals
+from analysis.relative_strength import RelativeStrengthAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# 各检测器可能产出的信号
+DETECTOR_SIGNALS: Dict[str, FrozenSet[str]] = {
+    'price_volume': frozenset({
+        'ACCUMULATION_BREAKOUT',
+        'WYCKOFF_SPRING',
+        'HIGH_VOLUME_STAGNATION',
+        'HIGH_VOLUME_DECLINE',
+        'BREAK_SUPPORT_HEAVY_VOLUME',
+        'LOW_VOLUME_RISE',
+    }),
+    'indicators': frozenset({
+        'OBV_BULLISH_DIVERGENCE',
+        'MFI_BULLISH_DIVERGENCE',
+        'MFI_OVERSOLD',
+        'OBV_BEARISH_DIVERGENCE',
+        'MFI_BEARISH_DIVERGENCE',
+        'MFI_OVERBOUGHT',
+        'RSI_BEARISH_DIVERGENCE',
+        'MACD_BEARISH_DIVERGENCE',
+    }),
+    'relative_strength': frozenset({'RELATIVE_STRENGTH_WEAK'}),
+    'structural': frozenset({
+        'NEW_INSTITUTION',
+        'INSTITUTIONAL_BUY_IN',
+        'SHAREHOLDER_COUNT_DECREASE',
+        'INSTITUTIONAL_SELL_OFF',
+        'SHAREHOLDER_COUNT_INCREASE',
+    }),
+}
+
+# 参与编译的配置项，任一变化都需要重新编译
+PLAN_SETTINGS = (
+    'SIGNAL_WEIGHTS',
+    'SCORE_TO_RATING',
+    'PV_PARAMS',
+    'INDICATOR_PARAMS',
+    'RELATIVE_STRENGTH_PARAMS',
+)
+
+# RSI/MACD 背离检测器内部固定使用 60 根K线
+_DIVERGENCE_LOOKBACK = 60
+
+
+class SignalPlan:
+    """编译后的信号分析计划"""
+
+    def __init__(self, config):
+        """
+        编译信号计划
+
+        Args:
+            config: 配置模块
+        """
+        self.config = config
+        self.fingerprint = self.config_fingerprint(config)
+        weights = getattr(config, 'SIGNAL_WEIGHTS', {})
+        self.enabled_signals: FrozenSet[str] = frozenset(
+            name
+            for signals in DETECTOR_SIGNALS.values()
+            for name in signals
+            if name in weights
+        )
+        self.detectors: FrozenSet[str] = frozenset(
+            detector
+            for detector, signals in DETECTOR_SIGNALS.items()
+            if signals & self.enabled_signals
+        )
+        self.indicators, self.min_bars = self._requirements(config)
+
+        self.price_volume = PriceVolumeSignals(config, enabled=self.enabled_signals)
+        self.indicator_signals = IndicatorSignals(config, enabled=self.enabled_signals)
+        self.relative_strength = RelativeStrengthAnalyzer(config)
+        self.aggregator = SignalAggregator(config)
+
+        logger.debug(
+            "信号计划: 启用 %d 个信号, 指标 %s, 最少 %d 根K线",
+            len(self.enabled_signals),
+            ', '.join(self.indicators) or '无',
+            self.min_bars,
+        )
+
+    def uses(self, detector: str) -> bool:
+        """检测器是否至少有一个信号计入评分"""
+        return detector in self.detectors
+
+    @staticmethod
+    def config_fingerprint(config) -> str:
+        """参与编译的配置指纹，用于判断已编译计划是否仍然有效"""
+        settings = {name: getattr(config, name, None) for name in PLAN_SETTINGS}
+        encoded = json.dumps(settings, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
+
+    def _requirements(self, config) -> Tuple[Tuple[str, ...], int]:
+        """启用的检测器需要的指标列与最少K线数"""
+        pv_params = config.PV_PARAMS
+        indicator_params = config.INDICATOR_PARAMS
+        enabled = self.enabled_signals
+        columns = []
+        windows = [0]
+
+        if self.uses('price_volume'):
+            windows.append(pv_params['lookback_period'])
+        if 'WYCKOFF_SPRING' in enabled:
+            columns.append('ma20')
+            windows.append(20)
+        if 'BREAK_SUPPORT_HEAVY_VOLUME' in enabled:
+            support_periods = list(pv_params['support_ma_periods'])
+            columns.extend(f'ma{period}' for period in support_periods)
+            windows.append(max(support_periods))
+
+        if enabled & {'OBV_BULLISH_DIVERGENCE', 'OBV_BEARISH_DIVERGENCE'}:
+            columns.append('obv')
+            windows.append(indicator_params['obv_lookback'])
+        if enabled & {'MFI_OVERSOLD', 'MFI_OVERBOUGHT'}:
+            columns.append('mfi')
+            windows.append(indicator_params['mfi_period'] + 1)
+        if enabled & {'MFI_BULLISH_DIVERGENCE', 'MFI_BEARISH_DIVERGENCE'}:
+            columns.append('mfi')
+            windows.append(indicator_params['mfi_lookback'])
+        if 'RSI_BEARISH_DIVERGENCE' in enabled:
+            columns.append('rsi')
+            windows.append(_DIVERGENCE_LOOKBACK)
+        if 'MACD_BEARISH_DIVERGENCE' in enabled:
+            columns.append('macd')
+            windows.append(_DIVERGENCE_LOOKBACK)
+
+        if self.uses('relative_strength'):
+            rs_params = config.RELATIVE_STRENGTH_PARAMS
+            windows.append(rs_params['lookback_period'] + rs_params['rsp_ma_period'])
+
+        return tuple(dict.fromkeys(columns)), max(windows)
+
+
+def compile_signal_plan(
+    config,
+    current: Optional[SignalPlan] = None
+) -> SignalPlan:
+    """
+    便捷函数：返回与当前配置一致的信号计划
+
+    Args:
+        config: 配置模块
+        current: 已编译的计划，配置未变化时直接复用
+
+    Returns:
+        信号计划
+    """
+    if current is not None and current.fingerprint == SignalPlan.config_fingerprint(config):
+        return current
+    return SignalPlan(config)
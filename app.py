@@ -3,15 +3,19 @@ SmartMoneyTracker Web Application
 Flask-based web interface for stock analysis
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from flask_cors import CORS
 import logging
+import threading
 from datetime import datetime
 import json
 import numpy as np
+import pandas as pd
 
 from main import SmartMoneyScanner
 from backtesting import SignalBacktestConfig, SignalBacktester
+from backtesting.serialization import LAYOUTS, RECORDS, frame_to_columns, json_column
+from jobs import JobQueue, JobQueueFull
 import config
 
 # 配置日志
@@ -28,6 +32,75 @@ CORS(app)
 # 初始化扫描器
 scanner = SmartMoneyScanner()
 backtester = SignalBacktester(config, scanner.data_fetcher)
+job_queue = JobQueue.from_config(config)
+
+# 启动预热状态，供 /api/ready 判断进程是否可以接收流量
+_warmup_lock = threading.Lock()
+warmup_state = {
+    'status': 'pending',
+    'started_at': None,
+    'finished_at': None,
+    'summary': None,
+}
+
+
+def warm_up():
+    """
+    预热扫描器：基准行情缓存、指标引擎、证券名称表及回测依赖
+
+    gunicorn preload_app 模式下在 master 进程中执行一次，
+    fork 出的 worker 直接继承已导入的模块和内存缓存。
+    重复调用时只执行一次。
+
+    Returns:
+        当前预热状态字典
+    """
+    with _warmup_lock:
+        if warmup_state['status'] != 'pending':
+            return warmup_state
+        warmup_state['status'] = 'warming'
+        warmup_state['started_at'] = datetime.now().isoformat()
+
+        logger.info("开始预热 Web 服务...")
+        try:
+            summary = scanner.warm_up(period=getattr(config, 'WEB_WARMUP_PERIOD', 250))
+        except Exception as e:
+            logger.error(f"预热失败: {e}", exc_info=True)
+            summary = {'errors': [str(e)]}
+        try:
+            # 回测引擎在首次请求时才导入，预热阶段提前加载
+            import akquant.backtest  # noqa: F401
+        except Exception as e:
+            logger.warning(f"预加载回测引擎失败: {e}")
+            summary.setdefault('errors', []).append(f"akquant.backtest: {e}")
+
+        warmup_state['summary'] = summary
+        warmup_state['finished_at'] = datetime.now().isoformat()
+        warmup_state['status'] = 'ready'
+        return warmup_state
+
+
+def create_app(warm=None):
+    """
+    WSGI 应用工厂 (gunicorn: ``gunicorn -c gunicorn.conf.py``)
+
+    Args:
+        warm: 是否同步执行预热，默认读取 config.WEB_WARMUP_ENABLED。
+            关闭预热时服务直接标记为就绪。
+
+    Returns:
+        Flask 应用实例
+    """
+    if warm is None:
+        warm = getattr(config, 'WEB_WARMUP_ENABLED', True)
+    if warm:
+        warm_up()
+    else:
+        with _warmup_lock:
+            if warmup_state['status'] == 'pending':
+                warmup_state['status'] = 'ready'
+                warmup_state['finished_at'] = datetime.now().isoformat()
+    return app
 
 @app.route('/')
 def index():
@@ -67,7 +140,8 @@ def analyze_stock():
         result = scanner.scan_stock(
             ticker=ticker,
             period=period,
-            analyze_structure=analyze_structure
+            analyze_structure=analyze_structure,
+            use_cache=True
         )
         
         if not result['success']:
@@ -86,7 +160,7 @@ def analyze_stock():
             'inflow_signals': format_signals(result.get('inflow_signals', {})),
             'outflow_signals': format_signals(result.get('outflow_signals', {})),
             'recommendation': result['recommendation'],
-            'report': result['report'],
+            'report': str(result['report']),
             'timestamp': datetime.now().isoformat()
         }
         
@@ -141,31 +215,12 @@ def analyze_batch():
         response = {
             'success': True,
             'count': len(results),
-            'results': []
+            'results': [
+                format_batch_result(ticker, result)
+                for ticker, result in results.items()
+            ]
         }
         
-        for ticker, result in results.items():
-            # 获取股票名称
-            stock_name = scanner.data_fetcher.get_stock_name(ticker)
-            
-            if result['success']:
-                response['results'].append({
-                    'ticker': ticker,
-                    'stock_name': stock_name,
-                    'score': result['score'],
-                    'rating': result['rating'],
-                    'signal_count': result['signal_count'],
-                    'inflow_count': result.get('inflow_count', 0),
-                    'outflow_count': result.get('outflow_count', 0),
-                    'recommendation': result['recommendation']
-                })
-            else:
-                response['results'].append({
-                    'ticker': ticker,
-                    'stock_name': stock_name,
-                    'error': result.get('error', '未知错误')
-                })
-        
         logger.info(f"Web API: 批量分析完成")
         
         return jsonify(response)
@@ -178,6 +233,60 @@ def analyze_batch():
         }), 500
 
 
+@app.route('/api/batch/stream', methods=['POST'])
+def stream_batch():
+    """
+    批量分析多只股票，以 Server-Sent Events 逐个推送完成的结果
+
+    Request JSON 与 /api/batch 相同。事件依次为:
+    - start:  {"total": N}
+    - result: {"completed": k, "total": N, "result": {...}}  每完成一只股票推送一次
+    - done:   {"count": k}
+    - error:  {"error": "..."}  流中途失败时推送
+    """
+    data = request.get_json(silent=True) or {}
+    tickers = scanner.normalize_tickers([str(t) for t in data.get('tickers', [])])
+    if not tickers:
+        return jsonify({
+            'success': False,
+            'error': '请输入至少一个股票代码'
+        }), 400
+    period = data.get('period', 250)
+    analyze_structure = data.get('analyze_structure', False)
+    logger.info(f"Web API: 开始流式批量分析 {len(tickers)} 只股票")
+
+    def generate():
+        total = len(tickers)
+        completed = 0
+        yield format_sse('start', {'total': total})
+        try:
+            for ticker, result in scanner.iter_batch(
+                tickers,
+                period=period,
+                analyze_structure=analyze_structure,
+            ):
+                completed += 1
+                yield format_sse('result', {
+                    'completed': completed,
+                    'total': total,
+                    'result': format_batch_result(ticker, result),
+                })
+        except Exception as e:
+            logger.error(f"Web API 流式批量分析错误: {e}", exc_info=True)
+            yield format_sse('error', {'error': str(e)})
+            return
+        yield format_sse('done', {'count': completed})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        },
+    )
+
+
 @app.route('/api/backtest', methods=['POST'])
 def run_signal_backtest():
     """Run the point-in-time signal strategy and return chart-ready data."""
@@ -189,33 +298,7 @@ def run_signal_backtest():
                 'success': False,
                 'error': '请输入股票代码'
             }), 400
-
-        period = max(200, min(int(data.get('period', 1000)), 3000))
-        warmup = max(60, min(int(data.get('warmup', 120)), 250))
-        rebalance = max(1, min(int(data.get('rebalance', 5)), 20))
-        settings = SignalBacktestConfig(
-            initial_cash=1_000_000.0,
-            warmup_period=warmup,
-            rebalance_every=rebalance,
-        )
-        logger.info("Web API: 开始回测 %s", ticker)
-        run = backtester.run(
-            ticker=ticker,
-            period=period,
-            settings=settings,
-        )
-        payload = run.to_dict(include_series=True)
-        payload.update({
-            'success': True,
-            'stock_name': scanner.data_fetcher.get_stock_name(ticker),
-            'timestamp': datetime.now().isoformat(),
-        })
-        logger.info(
-            "Web API: %s 回测完成 - 收益率 %.2f%%",
-            ticker,
-            payload['summary']['total_return'] * 100,
-        )
-        return jsonify(convert_to_json_serializable(payload))
+        return jsonify(build_backtest_payload(ticker, data))
     except (TypeError, ValueError) as e:
         logger.warning("Web API 回测参数或数据错误: %s", e)
         return jsonify({'success': False, 'error': str(e)}), 400
@@ -223,6 +306,179 @@ def run_signal_backtest():
         logger.error("Web API 回测错误: %s", e, exc_info=True)
         return jsonify({'success': False, 'error': str(e)}), 500
 
+
+@app.route('/api/jobs/batch', methods=['POST'])
+def submit_batch_job():
+    """
+    提交后台批量分析任务，立即返回任务ID
+
+    Request JSON 与 /api/batch 相同。通过 /api/jobs/<job_id>/results
+    轮询进度和已完成的部分结果。
+    """
+    data = request.get_json(silent=True) or {}
+    tickers = list(dict.fromkeys(
+        str(t).strip().upper() for t in data.get('tickers', []) if str(t).strip()
+    ))
+    if not tickers:
+        return jsonify({
+            'success': False,
+            'error': '请输入至少一个股票代码'
+        }), 400
+    period = data.get('period', 250)
+    analyze_structure = data.get('analyze_structure', False)
+
+    def run(job):
+        def on_result(ticker, result, completed, total):
+            job.report(format_batch_result(ticker, result), completed, total)
+
+        results = scanner.scan_batch(
+            tickers=tickers,
+            period=period,
+            analyze_structure=analyze_structure,
+            on_result=on_result,
+            cancel_event=job.cancel_event,
+        )
+        return {'count': len(results)}
+
+    return _submit_job('batch', run, total=len(tickers))
+
+
+@app.route('/api/jobs/backtest', methods=['POST'])
+def submit_backtest_job():
+    """提交后台回测任务，Request JSON 与 /api/backtest 相同"""
+    data = request.get_json(silent=True) or {}
+    ticker = str(data.get('ticker', '')).strip().upper()
+    if not ticker:
+        return jsonify({
+            'success': False,
+            'error': '请输入股票代码'
+        }), 400
+    try:
+        parse_backtest_settings(data)
+        parse_backtest_layout(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    def run(job):
+        payload = build_backtest_payload(ticker, data)
+        job.report(None, 1, 1)
+        return payload
+
+    return _submit_job('backtest', run, total=1)
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """查询后台任务状态和进度"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': '任务不存在或已过期'}), 404
+    return jsonify({'success': True, **job.to_dict()})
+
+
+@app.route('/api/jobs/<job_id>/results', methods=['GET'])
+def get_job_results(job_id):
+    """
+    获取后台任务的部分结果
+
+    Query: offset - 跳过已读取的结果条数，便于增量轮询
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': '任务不存在或已过期'}), 404
+    offset = max(0, request.args.get('offset', 0, type=int))
+    items = job.partial_results(offset)
+    response = {
+        'success': True,
+        **job.to_dict(),
+        'offset': offset,
+        'next_offset': offset + len(items),
+        'results': items,
+    }
+    if job.done:
+        response['result'] = job.result
+    return jsonify(convert_to_json_serializable(response))
+
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """取消后台任务；排队中的任务立即取消，运行中的批量任务完成当前股票后停止"""
+    job = job_queue.cancel(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': '任务不存在或已过期'}), 404
+    return jsonify({'success': True, **job.to_dict()})
+
+
+def _submit_job(kind, target, total):
+    try:
+        job = job_queue.submit(kind, target, total=total)
+    except JobQueueFull as e:
+        logger.warning("Web API 任务队列已满: %s", e)
+        return jsonify({'success': False, 'error': str(e)}), 429
+    logger.info("Web API: 已提交 %s 任务 %s", kind, job.id)
+    return jsonify({'success': True, **job.to_dict()}), 202
+
+
+def parse_backtest_settings(data):
+    """解析回测参数并限制在界面允许的范围内"""
+    period = max(200, min(int(data.get('period', 1000)), 3000))
+    warmup = max(60, min(int(data.get('warmup', 120)), 250))
+    rebalance = max(1, min(int(data.get('rebalance', 5)), 20))
+    settings = SignalBacktestConfig(
+        initial_cash=1_000_000.0,
+        warmup_period=warmup,
+        rebalance_every=rebalance,
+    )
+    return period, settings
+
+
+def parse_backtest_layout(data):
+    """回测序列格式：records (逐行对象，默认) 或 columns (每个序列一个数组)"""
+    layout = str(data.get('layout', RECORDS)).strip().lower()
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout 仅支持: {', '.join(LAYOUTS)}")
+    return layout
+
+
+def build_backtest_payload(ticker, data):
+    """运行回测并构造可直接序列化的响应数据"""
+    period, settings = parse_backtest_settings(data)
+    logger.info("Web API: 开始回测 %s", ticker)
+    run = backtester.run(
+        ticker=ticker,
+        period=period,
+        settings=settings,
+    )
+    payload = run.to_dict(include_series=True, layout=parse_backtest_layout(data))
+    payload.update({
+        'success': True,
+        'stock_name': scanner.data_fetcher.get_stock_name(ticker),
+        'timestamp': datetime.now().isoformat(),
+    })
+    logger.info(
+        "Web API: %s 回测完成 - 收益率 %.2f%%",
+        ticker,
+        payload['summary']['total_return'] * 100,
+    )
+    return convert_to_json_serializable(payload)
+
+@app.route('/api/health', methods=['GET'])
+def health():
+    """存活检查：进程能响应即返回 200"""
+    return jsonify({'success': True, 'status': 'alive'})
+
+@app.route('/api/ready', methods=['GET'])
+def ready():
+    """就绪检查：预热完成前返回 503，负载均衡器据此暂不转发流量"""
+    is_ready = warmup_state['status'] == 'ready'
+    return jsonify({
+        'success': is_ready,
+        'status': warmup_state['status'],
+        'started_at': warmup_state['started_at'],
+        'finished_at': warmup_state['finished_at'],
+        'warmup': warmup_state['summary'],
+    }), 200 if is_ready else 503
+
 @app.route('/api/config', methods=['GET'])
 def get_config():
     """获取配置信息"""
@@ -243,21 +499,32 @@ def get_config():
             'error': str(e)
         }), 500
 
+_JSON_SCALARS = (str, int, float, bool, type(None))
+_JSON_SCALAR_TYPES = frozenset(_JSON_SCALARS)
+
+
 def convert_to_json_serializable(obj):
     """
     将对象转换为 JSON 可序列化的类型
     处理 numpy 类型、pandas 类型等
+
+    numpy 数组、Series 和 DataFrame 按列整体转换；元素已全是原生类型的列表
+    (如列式回测序列) 直接复用，不再逐元素递归。
     """
-    if obj is None:
-        return None
-    elif isinstance(obj, (bool, int, float, str)):
+    if isinstance(obj, _JSON_SCALARS):
         return obj
-    elif isinstance(obj, (list, tuple)):
-        return [convert_to_json_serializable(item) for item in obj]
     elif isinstance(obj, dict):
         return {key: convert_to_json_serializable(value) for key, value in obj.items()}
-    # 处理 numpy 类型 - 先检查 tolist (array) 再检查 item (scalar)
-    elif hasattr(obj, 'tolist'):  # numpy array
+    elif isinstance(obj, (list, tuple)):
+        if _JSON_SCALAR_TYPES.issuperset(map(type, obj)):
+            return list(obj)
+        return [convert_to_json_serializable(item) for item in obj]
+    elif isinstance(obj, pd.DataFrame):
+        return frame_to_columns(obj)
+    elif isinstance(obj, (np.ndarray, pd.Series, pd.Index)):
+        return json_column(obj)
+    # 其他 numpy 类型 - 先检查 tolist (array) 再检查 item (scalar)
+    elif hasattr(obj, 'tolist'):
         return obj.tolist()
     elif hasattr(obj, 'item'):  # numpy scalar (包括 bool, int, float)
         return obj.item()
@@ -265,6 +532,35 @@ def convert_to_json_serializable(obj):
         # 对于其他类型，转换为字符串
         return str(obj)
 
+def format_sse(event, payload):
+    """编码一条 Server-Sent Events 消息"""
+    data = json.dumps(
+        convert_to_json_serializable(payload),
+        ensure_ascii=False,
+        separators=(',', ':'),
+    )
+    return f"event: {event}\ndata: {data}\n\n"
+
+def format_batch_result(ticker, result):
+    """格式化批量分析中单只股票的结果摘要"""
+    stock_name = scanner.data_fetcher.get_stock_name(ticker)
+    if result['success']:
+        return {
+            'ticker': ticker,
+            'stock_name': stock_name,
+            'score': result['score'],
+            'rating': result['rating'],
+            'signal_count': result['signal_count'],
+            'inflow_count': result.get('inflow_count', 0),
+            'outflow_count': result.get('outflow_count', 0),
+            'recommendation': result['recommendation']
+        }
+    return {
+        'ticker': ticker,
+        'stock_name': stock_name,
+        'error': result.get('error', '未知错误')
+    }
+
 def format_signals(signals):
     """格式化信号数据以便前端显示"""
     formatted = []
@@ -304,4 +600,10 @@ def internal_error(error):
 if __name__ == '__main__':
     logger.info("启动 SmartMoneyTracker Web 服务...")
     logger.info("访问 http://localhost:8001 使用 Web 界面")
+    logger.info("生产环境请使用: gunicorn -c gunicorn.conf.py")
+    if getattr(config, 'WEB_WARMUP_ENABLED', True):
+        # 开发服务器后台预热，启动期间 /api/ready 返回 503
+        threading.Thread(target=warm_up, name='smartmoney-warmup', daemon=True).start()
+    else:
+        create_app(warm=False)
     app.run(host='0.0.0.0', port=8001, debug=True)
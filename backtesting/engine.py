@@ -13,9 +13,9 @@ from typing import Any, Callable, Dict, Optional
 import numpy as np
 import pandas as pd
 
-from aggregator.scorer import SignalAggregator
-from analysis.indicator_signals import IndicatorSignals
-from analysis.price_volume_signals import PriceVolumeSignals
+from analysis.signal_plan import SignalPlan
+
+from .serialization import COLUMNS, LAYOUTS, RECORDS, frame_to_columns, frame_to_records
 
 SignalEvaluator = Callable[[pd.DataFrame], Dict[str, Any]]
 
@@ -61,59 +61,41 @@ class BacktestRun:
     trades: pd.DataFrame
     raw_result: Any
 
-    def to_dict(self, include_series: bool = False) -> Dict[str, Any]:
+    def to_dict(
+        self,
+        include_series: bool = False,
+        layout: str = RECORDS,
+    ) -> Dict[str, Any]:
+        """Serialize the run; ``layout="columns"`` emits one array per series."""
+        if layout not in LAYOUTS:
+            raise ValueError(f"layout must be one of {', '.join(LAYOUTS)}")
+        encode = frame_to_columns if layout == COLUMNS else frame_to_records
         result: Dict[str, Any] = {
             "ticker": self.ticker,
             "config": asdict(self.config),
             "summary": self.summary,
-            "signals": self.signals.to_dict(orient="records"),
+            "layout": layout,
+            "signals": encode(self.signals),
         }
         if include_series:
-            result["series"] = self._chart_records()
-            result["orders"] = self._records(self.orders)
-            result["trades"] = self._records(self.trades)
+            result["series"] = encode(self._chart_frame())
+            result["orders"] = encode(self.orders)
+            result["trades"] = encode(self.trades)
         return result
 
-    def _chart_records(self) -> list[Dict[str, Any]]:
+    def _chart_frame(self) -> pd.DataFrame:
         if self.equity_curve.empty:
-            return []
+            return pd.DataFrame(columns=["date", "strategy", "benchmark", "drawdown"])
         start = min(self.config.warmup_period, len(self.equity_curve) - 1)
         equity = self.equity_curve.iloc[start:].astype(float)
-        strategy_index = equity / float(self.config.initial_cash) * 100.0
-        benchmark = self.benchmark_curve.reindex(equity.index).ffill().fillna(100.0)
-        drawdown = self.drawdown_curve.reindex(equity.index).fillna(0.0) * 100.0
-        return [
-            {
-                "date": index.isoformat(),
-                "strategy": float(strategy_index.loc[index]),
-                "benchmark": float(benchmark.loc[index]),
-                "drawdown": float(drawdown.loc[index]),
-            }
-            for index in equity.index
-        ]
-
-    @staticmethod
-    def _records(frame: pd.DataFrame) -> list[Dict[str, Any]]:
-        if frame.empty:
-            return []
-        return [
-            {key: BacktestRun._json_value(value) for key, value in record.items()}
-            for record in frame.to_dict(orient="records")
-        ]
-
-    @staticmethod
-    def _json_value(value: Any) -> Any:
-        if value is None or isinstance(value, (bool, int, float, str)):
-            if isinstance(value, float) and np.isnan(value):
-                return None
-            return value
-        if isinstance(value, (pd.Timestamp,)):
-            return value.isoformat()
-        if isinstance(value, (pd.Timedelta,)):
-            return str(value)
-        if isinstance(value, np.generic):
-            return value.item()
-        return str(value)
+        return pd.DataFrame({
+            "date": equity.index,
+            "strategy": equity.to_numpy() / float(self.config.initial_cash) * 100.0,
+            "benchmark": self.benchmark_curve.reindex(equity.index)
+            .ffill().fillna(100.0).astype(float).to_numpy(),
+            "drawdown": self.drawdown_curve.reindex(equity.index)
+            .fillna(0.0).astype(float).to_numpy() * 100.0,
+        })
 
 
 class SignalBacktester:
@@ -130,9 +112,10 @@ class SignalBacktester:
     ) -> None:
         self.app_config = app_config
         self.data_fetcher = data_fetcher
-        self.price_volume = PriceVolumeSignals(app_config)
-        self.indicators = IndicatorSignals(app_config)
-        self.aggregator = SignalAggregator(app_config)
+        self.plan = SignalPlan(app_config)
+        self.price_volume = self.plan.price_volume
+        self.indicators = self.plan.indicator_signals
+        self.aggregator = self.plan.aggregator
         self.evaluator = evaluator or self._evaluate_signals
         self._custom_evaluator = evaluator is not None
         self.disclosure_store = disclosure_store
@@ -261,7 +244,10 @@ class SignalBacktester:
         as_of: Optional[Any] = None,
         include_structural: bool = False,
     ) -> Dict[str, Any]:
-        enriched = self.data_fetcher.calculate_technical_indicators(history)
+        # Only the indicators read by the enabled detectors are computed per bar.
+        enriched = self.data_fetcher.calculate_technical_indicators(
+            history, indicators=self.plan.indicators
+        )
         signals = self.price_volume.analyze(enriched)
         signals.update(self.indicators.analyze(enriched))
         if include_structural:
@@ -0,0 +1,111 @@
+"""Vectorized JSON encoding for NumPy arrays and pandas frames.
+
+Values are converted one column at a time: datetimes become ISO-8601 strings,
+numeric columns go through ``ndarray.tolist`` and missing values become
+``None``. No per-element Python dispatch is needed for the common dtypes.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+RECORDS = "records"
+COLUMNS = "columns"
+LAYOUTS = (RECORDS, COLUMNS)
+
+_NANOS_PER_SECOND = 1_000_000_000
+
+
+def json_column(values: Any) -> list:
+    """Convert an array-like column into a list of JSON-native values."""
+    if isinstance(values, (pd.Series, pd.Index)):
+        dtype = values.dtype
+        if isinstance(dtype, pd.DatetimeTZDtype) or pd.api.types.is_datetime64_dtype(dtype):
+            return isoformat_column(values)
+        array = values.to_numpy(dtype=object) if dtype.kind == "m" else values.to_numpy()
+    else:
+        array = np.asarray(values)
+        if array.dtype.kind == "M":
+            return isoformat_column(pd.DatetimeIndex(array.ravel()))
+
+    if array.dtype.kind in "biu":
+        return array.tolist()
+    if array.dtype.kind == "f":
+        missing = np.isnan(array)
+        if missing.any():
+            return _with_missing(array.astype(object), missing)
+        return array.tolist()
+    if array.dtype.kind in "US":
+        return array.astype(str).tolist()
+    # Object columns: scalars from mixed sources still need a per-value check.
+    return [_json_scalar(value) for value in array.tolist()]
+
+
+def isoformat_column(values: Any) -> list:
+    """ISO-8601 strings for a datetime column, matching ``Timestamp.isoformat``."""
+    index = pd.DatetimeIndex(values)
+    missing = index.isna()
+    nanos = index.asi8
+    if (nanos[~missing] % _NANOS_PER_SECOND).any():
+        # Sub-second precision is rare in daily data; keep exact isoformat output.
+        return [None if pd.isna(value) else value.isoformat() for value in index]
+
+    wall = index.tz_localize(None) if index.tz is not None else index
+    strings = np.datetime_as_string(wall.to_numpy(dtype="datetime64[s]"), unit="s")
+    if index.tz is not None:
+        offsets = (wall.asi8 - nanos) // _NANOS_PER_SECOND
+        suffixes = {offset: _utc_offset(offset) for offset in np.unique(offsets[~missing])}
+        strings = np.char.add(
+            strings,
+            np.array([suffixes.get(offset, "") for offset in offsets], dtype=str)
+            if len(suffixes) > 1
+            else next(iter(suffixes.values()), ""),
+        )
+    return _with_missing(strings.astype(object), missing)
+
+
+def frame_to_columns(frame: pd.DataFrame) -> Dict[str, list]:
+    """Columnar JSON layout: ``{column: [values...]}``."""
+    return {str(column): json_column(frame[column]) for column in frame.columns}
+
+
+def frame_to_records(frame: pd.DataFrame) -> list[Dict[str, Any]]:
+    """Row-records JSON layout built from the columnar conversion."""
+    if frame.empty:
+        return []
+    columns = frame_to_columns(frame)
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+def _with_missing(values: np.ndarray, missing: Any) -> list:
+    missing = np.asarray(missing, dtype=bool)
+    if missing.any():
+        values = values.copy()
+        values[missing] = None
+    return values.tolist()
+
+
+def _utc_offset(seconds: int) -> str:
+    sign = "+" if seconds >= 0 else "-"
+    hours, remainder = divmod(abs(int(seconds)), 3600)
+    return f"{sign}{hours:02d}:{remainder // 60:02d}"
+
+
+def _json_scalar(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        return None if np.isnan(value) else value
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, pd.Timedelta):
+        return str(value)
+    if isinstance(value, np.generic):
+        return _json_scalar(value.item())
+    return str(value)
@@ -27,14 +27,58 @@ AKSHARE_HISTORY_SOURCE = os.getenv('AKSHARE_HISTORY_SOURCE', 'tencent')
 # 外部数据请求超时（秒）
 DATA_REQUEST_TIMEOUT = float(os.getenv('DATA_REQUEST_TIMEOUT', '15'))
 
+# 进程内共享的 HTTP 连接池 (data_fetcher.transport)，告警 Webhook 等自有请求经由它发送。
+# HTTP_POOL_SIZE 为每个主机保持的长连接数，应不小于 BATCH_FETCH_BUDGET；
+# 连接错误与 429/5xx (幂等请求) 按指数退避加随机抖动重试。
+HTTP_POOL_HOSTS = max(1, int(os.getenv('HTTP_POOL_HOSTS', '32')))
+HTTP_POOL_SIZE = max(1, int(os.getenv('HTTP_POOL_SIZE', '8')))
+HTTP_RETRIES = max(0, int(os.getenv('HTTP_RETRIES', '2')))
+HTTP_BACKOFF_SECONDS = max(0.0, float(os.getenv('HTTP_BACKOFF_SECONDS', '0.5')))
+HTTP_BACKOFF_JITTER = max(0.0, float(os.getenv('HTTP_BACKOFF_JITTER', '0.5')))
+
+# 对冲请求 (data_fetcher.hedging)：日线主数据源超过其最近 HEDGE_LATENCY_WINDOW 次成功请求的
+# P{HEDGE_LATENCY_PERCENTILE} 延迟仍未返回时，并行请求下一个数据源 (如腾讯→东方财富→Tushare、
+# AkShare 新浪→yfinance)，先返回有效日线者胜出。可降低 /api/analyze 的尾延迟，但会增加
+# 数据源请求量，默认关闭。样本不足 HEDGE_MIN_SAMPLES 次时使用 HEDGE_DEFAULT_DELAY_SECONDS，
+# 延迟下限为 HEDGE_MIN_DELAY_SECONDS，上限为 DATA_REQUEST_TIMEOUT。
+HEDGED_REQUESTS_ENABLED = os.getenv(
+    'HEDGED_REQUESTS_ENABLED', 'false'
+).strip().lower() in {'1', 'true', 'yes', 'on'}
+HEDGE_LATENCY_PERCENTILE = min(100.0, max(50.0, float(os.getenv('HEDGE_LATENCY_PERCENTILE', '95'))))
+HEDGE_LATENCY_WINDOW = max(1, int(os.getenv('HEDGE_LATENCY_WINDOW', '50')))
+HEDGE_MIN_SAMPLES = max(1, int(os.getenv('HEDGE_MIN_SAMPLES', '10')))
+HEDGE_DEFAULT_DELAY_SECONDS = max(0.0, float(os.getenv('HEDGE_DEFAULT_DELAY_SECONDS', '2.0')))
+HEDGE_MIN_DELAY_SECONDS = max(0.0, float(os.getenv('HEDGE_MIN_DELAY_SECONDS', '0.25')))
+# 对冲线程池大小；落败的请求仍会运行到超时，应不小于 BATCH_FETCH_BUDGET 的两倍
+HEDGE_MAX_WORKERS = max(1, int(os.getenv('HEDGE_MAX_WORKERS', '12')))
+
 # 批量扫描并发与请求节流。不同市场使用不同数据接口，分别限速。
 BATCH_MAX_WORKERS = max(1, int(os.getenv('BATCH_MAX_WORKERS', '3')))
+# 进程内抓取调度 (data_fetcher.scheduler)：所有实际访问数据源的请求共享并发上限
+# BATCH_FETCH_BUDGET，同一市场的请求之间至少间隔 BATCH_RATE_LIMIT_SECONDS。
+# 交互式分析 (/api/analyze) 优先于批量扫描，批量扫描优先于定时监控；同一优先级内
+# 多个批量扫描轮流获得额度。交互式请求另有 FETCH_INTERACTIVE_RESERVE 个专用额度。
+BATCH_FETCH_BUDGET = max(1, int(os.getenv('BATCH_FETCH_BUDGET', '6')))
+FETCH_INTERACTIVE_RESERVE = max(0, int(os.getenv('FETCH_INTERACTIVE_RESERVE', '2')))
 BATCH_RATE_LIMIT_SECONDS = {
     'A_STOCK': max(0.0, float(os.getenv('BATCH_RATE_LIMIT_A_STOCK', '0.35'))),
     'US_STOCK': max(0.0, float(os.getenv('BATCH_RATE_LIMIT_US_STOCK', '0.50'))),
     'HK_STOCK': max(0.0, float(os.getenv('BATCH_RATE_LIMIT_HK_STOCK', '0.50'))),
 }
 
+# Web 后台任务 (/api/jobs/*)。批量任务内部仍按 BATCH_MAX_WORKERS 并发扫描，
+# 因此任务池保持较小；排队已满时接口返回 429。
+JOB_MAX_WORKERS = max(1, int(os.getenv('JOB_MAX_WORKERS', '2')))
+JOB_QUEUE_LIMIT = max(0, int(os.getenv('JOB_QUEUE_LIMIT', '8')))
+JOB_HISTORY_LIMIT = max(1, int(os.getenv('JOB_HISTORY_LIMIT', '100')))
+
+# Web 服务启动预热 (见 app.create_app / gunicorn.conf.py)。
+# 预热基准行情、指标引擎和 STOCK_POOL 股票名称；WEB_WARMUP_PERIOD 应与前端默认周期一致。
+WEB_WARMUP_ENABLED = os.getenv(
+    'WEB_WARMUP_ENABLED', 'true'
+).strip().lower() in {'1', 'true', 'yes', 'on'}
+WEB_WARMUP_PERIOD = max(1, int(os.getenv('WEB_WARMUP_PERIOD', '250')))
+
 # yfinance 配置 (美股/港股数据)
 YFINANCE_ENABLED = True
 
@@ -202,6 +246,81 @@ CACHE_EXPIRY_DAYS = 1  # 缓存过期天数
 PERSISTENT_CACHE_ENABLED = os.getenv(
     'PERSISTENT_CACHE_ENABLED', 'true'
 ).strip().lower() in {'1', 'true', 'yes', 'on'}
+# 持久化缓存的磁盘上限 (MB)。CACHE_DIR/manifest.sqlite3 记录每个条目的大小与最近访问时间，
+# 写入后总量超过上限时按最近最少使用淘汰；0 表示不限制。
+CACHE_MAX_MB = max(0.0, float(os.getenv('CACHE_MAX_MB', '1024')))
+
+# 无数据代码缓存 (退市、代码错误或各数据源均不支持)。按默认周期获取日线时，
+# 各数据源都没有返回数据的代码在 TTL 内直接跳过，并记录原因；连续失败时 TTL 翻倍，
+# 最长 UNAVAILABLE_CACHE_MAX_TTL_SECONDS。
+UNAVAILABLE_CACHE_ENABLED = os.getenv(
+    'UNAVAILABLE_CACHE_ENABLED', 'true'
+).strip().lower() in {'1', 'true', 'yes', 'on'}
+UNAVAILABLE_CACHE_TTL_SECONDS = float(os.getenv('UNAVAILABLE_CACHE_TTL_SECONDS', '1800'))
+UNAVAILABLE_CACHE_MAX_TTL_SECONDS = float(
+    os.getenv('UNAVAILABLE_CACHE_MAX_TTL_SECONDS', '86400')
+)
+
+# 单股分析结果缓存 (/api/analyze)。键包含最新K线日期和评分参数指纹，
+# 新K线到达或信号权重变化时自动失效；TTL 覆盖盘中当日K线仍在变化的情况。
+RESULT_CACHE_ENABLED = os.getenv(
+    'RESULT_CACHE_ENABLED', 'true'
+).strip().lower() in {'1', 'true', 'yes', 'on'}
+RESULT_CACHE_TTL_SECONDS = float(os.getenv('RESULT_CACHE_TTL_SECONDS', '300'))
+RESULT_CACHE_MAX_ENTRIES = max(1, int(os.getenv('RESULT_CACHE_MAX_ENTRIES', '256')))
+
+# 交易日历。日线请求按交易日数量确定起始日期，缓存键对齐到最近一个已收盘交易日；
+# 周末、节假日及收盘前的重复请求复用同一份数据。A股休市日来自数据源的交易日列表
+# (Tushare trade_cal / AkShare 新浪交易日历，按 TRADING_CALENDAR_REFRESH_DAYS 刷新)，
+# 港股农历假期与临时休市可用逗号分隔的日期补充，如 TRADING_HOLIDAYS_HK_STOCK=2027-02-08,2027-02-09
+TRADING_HOLIDAYS = {
+    market: [
+        day.strip()
+        for day in os.getenv(f'TRADING_HOLIDAYS_{market}', '').split(',')
+        if day.strip()
+    ]
+    for market in ('A_STOCK', 'HK_STOCK', 'US_STOCK')
+}
+TRADING_CALENDAR_REFRESH_DAYS = float(os.getenv('TRADING_CALENDAR_REFRESH_DAYS', '7'))
+
+# 披露数据缓存 (机构持股 / 股东户数 / 北向持股)，键为股票代码和最新报告期。
+# 已包含最新报告期的数据在下一个报告期之前不过期；尚未更新到最新报告期时
+# 按数据集 TTL (小时) 重新验证，以便及时获取新公告。
+DISCLOSURE_CACHE_ENABLED = os.getenv(
+    'DISCLOSURE_CACHE_ENABLED', 'true'
+).strip().lower() in {'1', 'true', 'yes', 'on'}
+DISCLOSURE_CACHE_TTL_HOURS = {
+    'institutional_holdings': float(os.getenv('DISCLOSURE_CACHE_HOLDINGS_TTL_HOURS', '168')),
+    'shareholder_count': float(os.getenv('DISCLOSURE_CACHE_SHAREHOLDER_TTL_HOURS', '72')),
+    'northbound_holdings': float(os.getenv('DISCLOSURE_CACHE_NORTHBOUND_TTL_HOURS', '24')),
+}
+
+# 本地A股日线库。由 ingest_bars.py 每个交易日追加一次全市场截面
+# (Tushare daily(trade_date=...) 或收盘后的 AkShare 快照)，
+# 新股票首次入库时单独回填历史。启用后 A 股日线优先从本地库读取。
+BAR_STORE_ENABLED = os.getenv(
+    'BAR_STORE_ENABLED', 'false'
+).strip().lower() in {'1', 'true', 'yes', 'on'}
+BAR_STORE_PATH = os.getenv('BAR_STORE_PATH', './cache/daily_bars.sqlite3')
+BAR_STORE_BACKFILL_DAYS = max(1, int(os.getenv('BAR_STORE_BACKFILL_DAYS', '2000')))
+
+# 主机级共享日线库 (data_fetcher.shared_bars)。gunicorn 多 worker 或多进程扫描时，
+# 各进程不再各自缓存日线：每份日线以固定布局的 .npy 文件内存映射读取，SQLite 索引记录窗口与写入时间，
+# 同一键由文件锁保证只有一个进程请求数据源，其余进程等待后直接读取。需要 CACHE_ENABLED；
+# 超过 SHARED_BAR_STORE_RETENTION_DAYS 的文件在写入时清理。
+SHARED_BAR_STORE_ENABLED = os.getenv(
+    'SHARED_BAR_STORE_ENABLED', 'false'
+).strip().lower() in {'1', 'true', 'yes', 'on'}
+SHARED_BAR_STORE_DIR = os.getenv('SHARED_BAR_STORE_DIR', './cache/shared_bars')
+SHARED_BAR_STORE_RETENTION_DAYS = max(0.0, float(os.getenv('SHARED_BAR_STORE_RETENTION_DAYS', '7')))
+
+# 紧凑日线 (data_fetcher.compact)。启用后各数据源、本地日线库与缓存返回的日线统一为
+# float32 开高低收与成交额、整数成交量 (int32 放不下时为 int64)，日期仍为 datetime64；
+# 共享日线库以 int32 日序号存储日期，每根K线 32 字节 (默认 56 字节)。float32 的相对误差
+# 约为 6e-8，与完整精度比较时使用 data_fetcher.compact.PRICE_RTOL；指标计算仍按 float64 进行。默认关闭。
+COMPACT_BARS_ENABLED = os.getenv(
+    'COMPACT_BARS_ENABLED', 'false'
+).strip().lower() in {'1', 'true', 'yes', 'on'}
 
 # =============================================================================
 # 日志配置
@@ -233,7 +352,35 @@ MONITOR_ANALYZE_STRUCTURE = os.getenv(
     'MONITOR_ANALYZE_STRUCTURE', 'false'
 ).strip().lower() in {'1', 'true', 'yes', 'on'}
 MONITOR_POLL_SECONDS = float(os.getenv('MONITOR_POLL_SECONDS', '60'))
-MONITOR_STATE_PATH = os.getenv('MONITOR_STATE_PATH', './cache/monitor_state.json')
+# 扫描前预取：在各市场 MONITOR_SCHEDULES 时间之前 MONITOR_PREFETCH_LEAD_MINUTES 分钟，
+# 以后台优先级把股票池的日线、基准行情和 (MONITOR_ANALYZE_STRUCTURE 时) 披露数据写入
+# 持久化缓存，定时扫描从热缓存开始。扫描所用交易日届时尚未收盘时只预取披露数据。
+# 也可用 warm_cache.py 手动预热。
+MONITOR_PREFETCH_ENABLED = os.getenv(
+    'MONITOR_PREFETCH_ENABLED', 'false'
+).strip().lower() in {'1', 'true', 'yes', 'on'}
+MONITOR_PREFETCH_LEAD_MINUTES = max(0.0, float(os.getenv('MONITOR_PREFETCH_LEAD_MINUTES', '30')))
+# 盘中监控 (monitor.py --intraday)：每次轮询每个市场只请求一次全市场实时快照，
+# 用最新报价合成当日临时K线并重新评分，评级转入 ALERT_RATINGS 时告警。
+# 报价未变化的股票沿用上次评分 (MONITOR_DELTA_RESCAN)，其余按 BATCH_MAX_WORKERS 并发重新评分。
+# 交易时段使用 MONITOR_TIMEZONE；结束早于开始表示跨越午夜 (如美股)。
+MONITOR_INTRADAY_SESSIONS = {
+    'A_STOCK': os.getenv('MONITOR_INTRADAY_A_STOCK', '09:30-11:30,13:00-15:00'),
+    'HK_STOCK': os.getenv('MONITOR_INTRADAY_HK_STOCK', '09:30-12:00,13:00-16:00'),
+    # 覆盖夏令时与冬令时的美股常规交易时段 (上海时间)
+    'US_STOCK': os.getenv('MONITOR_INTRADAY_US_STOCK', '21:30-05:00'),
+}
+MONITOR_INTRADAY_POLL_SECONDS = float(os.getenv('MONITOR_INTRADAY_POLL_SECONDS', '60'))
+# 增量扫描：最新K线 (日期+OHLCV 指纹) 未变化的股票复用上次评分，不重新分析也不重复告警
+MONITOR_DELTA_RESCAN = os.getenv(
+    'MONITOR_DELTA_RESCAN', 'true'
+).strip().lower() in {'1', 'true', 'yes', 'on'}
+# 到期市场并发运行；超过收盘后窗口 (分钟) 仍未完成时记录告警日志
+MONITOR_WINDOW_MINUTES = float(os.getenv('MONITOR_WINDOW_MINUTES', '120'))
+# 运行/告警去重状态 (SQLite)。旧版 monitor_state.json 会在首次启动时自动迁移。
+MONITOR_STATE_PATH = os.getenv('MONITOR_STATE_PATH', './cache/monitor_state.sqlite3')
+# 告警去重键按时间保留，超过天数后清理
+MONITOR_ALERT_RETENTION_DAYS = float(os.getenv('MONITOR_ALERT_RETENTION_DAYS', '30'))
 ALERT_RATINGS = tuple(
     value.strip().upper()
     for value in os.getenv('ALERT_RATINGS', 'STRONG_BUY,STRONG_SELL').split(',')
@@ -241,6 +388,20 @@ ALERT_RATINGS = tuple(
 )
 ALERT_LOG_PATH = os.getenv('ALERT_LOG_PATH', './reports/alerts.jsonl')
 ALERT_WEBHOOK_URL = os.getenv('ALERT_WEBHOOK_URL', '')
+# 告警异步发送：扫描线程只写入有界缓冲区，后台线程按批投递。
+# 缓冲区满时丢弃新告警并记录错误日志，不阻塞扫描。
+ALERT_ASYNC_ENABLED = os.getenv(
+    'ALERT_ASYNC_ENABLED', 'true'
+).strip().lower() in {'1', 'true', 'yes', 'on'}
+ALERT_QUEUE_SIZE = max(1, int(os.getenv('ALERT_QUEUE_SIZE', '1000')))
+ALERT_BATCH_SIZE = max(1, int(os.getenv('ALERT_BATCH_SIZE', '20')))
+ALERT_BATCH_WINDOW_SECONDS = float(os.getenv('ALERT_BATCH_WINDOW_SECONDS', '1.0'))
+# Webhook 重试 (429、5xx、读超时) 采用指数退避；连接错误只由共享连接池按 HTTP_RETRIES 重试。
+# ALERT_WEBHOOK_BATCH_SIZE > 1 时多条告警合并为一个
+# {"event": "smart_money_signals", "count": n, "alerts": [...]} 请求。
+ALERT_WEBHOOK_RETRIES = max(0, int(os.getenv('ALERT_WEBHOOK_RETRIES', '3')))
+ALERT_WEBHOOK_BACKOFF_SECONDS = float(os.getenv('ALERT_WEBHOOK_BACKOFF_SECONDS', '1.0'))
+ALERT_WEBHOOK_BATCH_SIZE = max(1, int(os.getenv('ALERT_WEBHOOK_BATCH_SIZE', '1')))
 
 # 时点披露数据库。只有 published_at 不晚于回测决策时间的数据才可见。
 DISCLOSURE_DB_PATH = os.getenv(
@@ -0,0 +1,242 @@
+"""SQLite-backed local store of daily bars, maintained by trade date."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+BAR_COLUMNS = ("open", "high", "low", "close", "volume", "amount")
+
+
+class DailyBarStore:
+    """Daily OHLCV bars keyed by ticker and trade date.
+
+    History enters the store in two ways. ``backfill`` writes one ticker's full
+    history, fetched per ticker the first time. ``append_cross_section`` writes
+    one market-wide trade date. A ticker's bars are complete only after its
+    backfill, so ``load`` serves a ticker only once it is marked backfilled and
+    its market has been ingested through the requested end date.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path).expanduser().resolve()
+        self._lock = threading.Lock()
+        self._initialize()
+
+    @classmethod
+    def from_config(cls, app_config: Any) -> "DailyBarStore":
+        return cls(getattr(app_config, "BAR_STORE_PATH", "./cache/daily_bars.sqlite3"))
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA busy_timeout=30000")
+        return connection
+
+    def _initialize(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS daily_bars (
+                    ticker TEXT NOT NULL,
+                    trade_date TEXT NOT NULL,
+                    open REAL,
+                    high REAL,
+                    low REAL,
+                    close REAL,
+                    volume REAL,
+                    amount REAL,
+                    PRIMARY KEY (ticker, trade_date)
+                ) WITHOUT ROWID
+            """)
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS daily_bars_trade_date ON daily_bars (trade_date)"
+            )
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS bar_backfills (
+                    ticker TEXT PRIMARY KEY,
+                    requested_from TEXT NOT NULL,
+                    backfilled_at REAL NOT NULL
+                )
+            """)
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS bar_ingests (
+                    market TEXT NOT NULL,
+                    trade_date TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    row_count INTEGER NOT NULL,
+                    ingested_at REAL NOT NULL,
+                    PRIMARY KEY (market, trade_date)
+                )
+            """)
+
+    def backfill(self, ticker: str, frame: pd.DataFrame, requested_from: Any) -> int:
+        """Store one ticker's history and mark it complete from ``requested_from``.
+
+        The requested start, not the first bar, is recorded so a ticker listed
+        after that date still counts as complete.
+        """
+        rows = list(self._rows(frame.assign(ticker=ticker)))
+        if not rows:
+            return 0
+        with self._lock, self._connect() as connection:
+            self._upsert(connection, rows)
+            connection.execute(
+                "INSERT OR REPLACE INTO bar_backfills (ticker, requested_from, backfilled_at) "
+                "VALUES (?, ?, ?)",
+                (ticker, self._day(requested_from), time.time()),
+            )
+        return len(rows)
+
+    def append_cross_section(
+        self,
+        market: str,
+        trade_date: Any,
+        frame: pd.DataFrame,
+        source: str,
+    ) -> int:
+        """Store every ticker's bar for one trade date and record the ingest.
+
+        An empty frame (for example a market holiday) is still recorded, so
+        the date is not requested again.
+        """
+        day = self._day(trade_date)
+        rows = list(self._rows(frame.assign(date=day))) if not frame.empty else []
+        with self._lock, self._connect() as connection:
+            self._upsert(connection, rows)
+            connection.execute(
+                "INSERT OR REPLACE INTO bar_ingests "
+                "(market, trade_date, source, row_count, ingested_at) VALUES (?, ?, ?, ?, ?)",
+                (market, day, source, len(rows), time.time()),
+            )
+        return len(rows)
+
+    def load(
+        self,
+        ticker: str,
+        start_date: Any,
+        end_date: Any,
+        market: str,
+        required_through: Any,
+    ) -> Optional[pd.DataFrame]:
+        """Bars for ``[start_date, end_date]``, or None when the store cannot answer.
+
+        ``required_through`` is the latest trade date the caller expects to
+        see. The store answers only when the ticker was backfilled from
+        ``start_date`` or earlier and the market was ingested through that date.
+        """
+        start, end = self._day(start_date), self._day(end_date)
+        required = self._day(required_through)
+        with self._connect() as connection:
+            backfill = connection.execute(
+                "SELECT requested_from FROM bar_backfills WHERE ticker = ?",
+                (ticker,),
+            ).fetchone()
+            if backfill is None or backfill[0] > start:
+                return None
+            latest = self._latest_ingest(connection, market)
+            if latest is None or latest < required:
+                return None
+            rows = connection.execute(
+                "SELECT trade_date, open, high, low, close, volume, amount FROM daily_bars "
+                "WHERE ticker = ? AND trade_date BETWEEN ? AND ? ORDER BY trade_date",
+                (ticker, start, end),
+            ).fetchall()
+        if not rows:
+            return None
+        frame = pd.DataFrame(rows, columns=("date", *BAR_COLUMNS))
+        frame["date"] = pd.to_datetime(frame["date"])
+        return frame
+
+    def reset_backfills(self) -> int:
+        """Mark every ticker as not backfilled, e.g. after a date was skipped.
+
+        Stored bars are kept, but ``load`` stops serving a ticker until its
+        history is backfilled again.
+        """
+        with self._lock, self._connect() as connection:
+            return connection.execute("DELETE FROM bar_backfills").rowcount
+
+    def backfilled_tickers(self, tickers: Iterable[str]) -> set[str]:
+        wanted = list(dict.fromkeys(tickers))
+        if not wanted:
+            return set()
+        with self._connect() as connection:
+            known = {row[0] for row in connection.execute("SELECT ticker FROM bar_backfills")}
+        return known.intersection(wanted)
+
+    def tickers_on(self, trade_date: Any) -> list[str]:
+        with self._connect() as connection:
+            return [
+                row[0] for row in connection.execute(
+                    "SELECT ticker FROM daily_bars WHERE trade_date = ? ORDER BY ticker",
+                    (self._day(trade_date),),
+                )
+            ]
+
+    def ingested_dates(self, market: str) -> set[str]:
+        with self._connect() as connection:
+            return {
+                row[0] for row in connection.execute(
+                    "SELECT trade_date FROM bar_ingests WHERE market = ?",
+                    (market,),
+                )
+            }
+
+    def latest_ingest(self, market: str, with_rows: bool = False) -> Optional[str]:
+        """Latest ingested trade date; with ``with_rows``, the latest that had bars."""
+        with self._connect() as connection:
+            if with_rows:
+                return connection.execute(
+                    "SELECT MAX(trade_date) FROM bar_ingests WHERE market = ? AND row_count > 0",
+                    (market,),
+                ).fetchone()[0]
+            return self._latest_ingest(connection, market)
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as connection:
+            bars, tickers = connection.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT ticker) FROM daily_bars"
+            ).fetchone()
+            backfilled = connection.execute("SELECT COUNT(*) FROM bar_backfills").fetchone()[0]
+        return {"bars": bars, "tickers": tickers, "backfilled": backfilled}
+
+    @staticmethod
+    def _latest_ingest(connection: sqlite3.Connection, market: str) -> Optional[str]:
+        return connection.execute(
+            "SELECT MAX(trade_date) FROM bar_ingests WHERE market = ?",
+            (market,),
+        ).fetchone()[0]
+
+    @staticmethod
+    def _upsert(connection: sqlite3.Connection, rows: list[Tuple[Any, ...]]) -> None:
+        connection.executemany(
+            "INSERT OR REPLACE INTO daily_bars "
+            "(ticker, trade_date, open, high, low, close, volume, amount) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    @classmethod
+    def _rows(cls, frame: pd.DataFrame) -> Iterable[Tuple[Any, ...]]:
+        if frame.empty:
+            return []
+        data = frame.dropna(subset=["ticker", "date", "close"])
+        dates = pd.to_datetime(data["date"]).dt.strftime("%Y-%m-%d")
+        values = []
+        for column in BAR_COLUMNS:
+            if column not in data.columns:
+                values.append([None] * len(data))
+                continue
+            numeric = pd.to_numeric(data[column], errors="coerce")
+            values.append(numeric.astype(object).where(numeric.notna(), None).tolist())
+        return zip(data["ticker"].astype(str), dates, *values)
+
+    @staticmethod
+    def _day(value: Any) -> str:
+        return pd.Timestamp(str(value)).strftime("%Y-%m-%d")
@@ -1,4 +1,4 @@
-"""Small, dependency-free persistent cache for market DataFrames."""
+"""Small, dependency-free caches for market DataFrames and derived results."""
 
 from __future__ import annotations
 
@@ -6,41 +6,82 @@ import gzip
 import hashlib
 import json
 import os
+import sqlite3
 import tempfile
+import threading
 import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from io import StringIO
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Any, Callable, Hashable, Iterator, Optional, Sequence
 
 import pandas as pd
 
 
 class DataFrameTTLCache:
-    """Store pandas frames as compressed JSON with atomic replacement."""
+    """Store pandas frames as compressed JSON with atomic replacement.
+
+    A SQLite manifest next to the files records each entry's key, size,
+    creation time and last access. Expiry is judged from the manifest without
+    opening the file. ``clear_expired`` and ``stats`` are single queries. When
+    ``max_bytes`` is positive, the least recently used entries are evicted
+    after each write until the total fits. The total is a one-row ``totals``
+    table kept current by triggers on ``entries``, so a write under quota
+    never sums the manifest. Files written before the manifest existed are
+    indexed the first time it is opened.
+    """
 
     SCHEMA_VERSION = 1
+    MANIFEST_NAME = "manifest.sqlite3"
+    # Last-access times are only rewritten once they are this stale (seconds),
+    # so cache hits do not turn into a manifest write each.
+    ACCESS_RESOLUTION = 60.0
 
-    def __init__(self, directory: str) -> None:
+    def __init__(self, directory: str, max_bytes: int = 0) -> None:
         self.directory = Path(directory).expanduser().resolve()
+        self.max_bytes = max(0, int(max_bytes))
+        self.manifest_path = self.directory / self.MANIFEST_NAME
+        self._manifest_ready = False
+        self._lock = threading.Lock()
 
     def get(
         self,
         namespace: str,
         key: Sequence[str],
         ttl_seconds: float,
+        complete: Optional[Callable[[pd.DataFrame], bool]] = None,
     ) -> Optional[pd.DataFrame]:
+        """Return the stored frame, or None when missing or expired.
+
+        An expired frame for which ``complete`` returns True is still served,
+        e.g. history that already ends on the latest closed session.
+        """
+        if not self.directory.exists():
+            return None
         path = self._path(namespace, key)
-        if not path.exists():
+        entry = self._relative(path)
+        now = time.time()
+        try:
+            with self._manifest() as connection:
+                row = connection.execute(
+                    "SELECT created_at, accessed_at FROM entries WHERE path = ?",
+                    (entry,),
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        created_at, accessed_at = row
+        expired = ttl_seconds >= 0 and now - created_at > ttl_seconds
+        if expired and complete is None:
+            self._remove(path)
             return None
         try:
             with gzip.open(path, "rt", encoding="utf-8") as handle:
                 envelope = json.load(handle)
-            created_at = float(envelope["created_at"])
-            if ttl_seconds >= 0 and time.time() - created_at > ttl_seconds:
-                path.unlink(missing_ok=True)
-                return None
             if envelope.get("schema_version") != self.SCHEMA_VERSION:
-                path.unlink(missing_ok=True)
+                self._remove(path)
                 return None
             frame = pd.read_json(
                 StringIO(envelope["frame"]),
@@ -49,17 +90,30 @@ class DataFrameTTLCache:
             for column, dtype in envelope.get("dtypes", {}).items():
                 if column in frame.columns:
                     frame[column] = frame[column].astype(dtype)
-            return frame
         except (OSError, ValueError, KeyError, TypeError):
-            path.unlink(missing_ok=True)
+            self._remove(path)
             return None
+        if expired and not complete(frame):
+            self._remove(path)
+            return None
+        if now - accessed_at > self.ACCESS_RESOLUTION:
+            try:
+                with self._manifest() as connection:
+                    connection.execute(
+                        "UPDATE entries SET accessed_at = ? WHERE path = ?",
+                        (now, entry),
+                    )
+            except sqlite3.Error:
+                pass
+        return frame
 
     def set(self, namespace: str, key: Sequence[str], frame: pd.DataFrame) -> None:
         target = self._path(namespace, key)
         target.parent.mkdir(parents=True, exist_ok=True)
+        created_at = time.time()
         envelope = {
             "schema_version": self.SCHEMA_VERSION,
-            "created_at": time.time(),
+            "created_at": created_at,
             "dtypes": {column: str(dtype) for column, dtype in frame.dtypes.items()},
             "frame": frame.to_json(orient="table", date_format="iso"),
         }
@@ -72,24 +126,193 @@ class DataFrameTTLCache:
             with os.fdopen(descriptor, "wb") as raw:
                 with gzip.GzipFile(fileobj=raw, mode="wb") as compressed:
                     compressed.write(json.dumps(envelope).encode("utf-8"))
+            size = os.path.getsize(temporary_name)
             os.replace(temporary_name, target)
         finally:
             if os.path.exists(temporary_name):
                 os.unlink(temporary_name)
+        entry = self._relative(target)
+        try:
+            with self._manifest() as connection:
+                # An upsert, not INSERT OR REPLACE: REPLACE deletes the old
+                # row without firing the delete trigger that keeps the total.
+                connection.execute(
+                    "INSERT INTO entries "
+                    "(path, namespace, key, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (path) DO UPDATE SET namespace = excluded.namespace, "
+                    "key = excluded.key, size = excluded.size, "
+                    "created_at = excluded.created_at, accessed_at = excluded.accessed_at",
+                    (entry, namespace, self._key_text(key), size, created_at, created_at),
+                )
+                if self.max_bytes:
+                    self._evict(connection, keep=entry)
+        except sqlite3.Error as error:
+            raise OSError(f"cache manifest update failed: {error}") from error
+
+    def delete(self, namespace: str, key: Sequence[str]) -> None:
+        if self.directory.exists():
+            self._remove(self._path(namespace, key))
 
     def clear_expired(self, ttl_seconds: float) -> int:
         if not self.directory.exists():
             return 0
-        removed = 0
-        now = time.time()
-        for path in self.directory.glob("*/*.json.gz"):
+        with self._manifest() as connection:
+            expired = [
+                row[0] for row in connection.execute(
+                    "SELECT path FROM entries WHERE created_at < ?",
+                    (time.time() - ttl_seconds,),
+                )
+            ]
+            self._drop(connection, expired)
+        return len(expired)
+
+    def stats(self) -> dict[str, Any]:
+        """Entry count and bytes, in total and per namespace."""
+        namespaces: dict[str, dict[str, int]] = {}
+        if self.directory.exists():
+            with self._manifest() as connection:
+                for namespace, entries, size in connection.execute(
+                    "SELECT namespace, COUNT(*), COALESCE(SUM(size), 0) "
+                    "FROM entries GROUP BY namespace ORDER BY namespace"
+                ):
+                    namespaces[namespace] = {"entries": entries, "bytes": size}
+        return {
+            "entries": sum(value["entries"] for value in namespaces.values()),
+            "bytes": sum(value["bytes"] for value in namespaces.values()),
+            "max_bytes": self.max_bytes,
+            "namespaces": namespaces,
+        }
+
+    def _evict(self, connection: sqlite3.Connection, keep: str) -> None:
+        """Drop least recently used entries until the total fits ``max_bytes``."""
+        total = connection.execute("SELECT bytes FROM totals").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for path, size in connection.execute(
+            "SELECT path, size FROM entries WHERE path != ? ORDER BY accessed_at",
+            (keep,),
+        ):
+            if total <= self.max_bytes:
+                break
+            victims.append(path)
+            total -= size
+        self._drop(connection, victims)
+
+    def _drop(self, connection: sqlite3.Connection, entries: list[str]) -> None:
+        for entry in entries:
             try:
-                if now - path.stat().st_mtime > ttl_seconds:
-                    path.unlink()
-                    removed += 1
+                (self.directory / entry).unlink(missing_ok=True)
             except OSError:
                 continue
-        return removed
+        connection.executemany(
+            "DELETE FROM entries WHERE path = ?",
+            [(entry,) for entry in entries],
+        )
+
+    def _remove(self, path: Path) -> None:
+        path.unlink(missing_ok=True)
+        try:
+            with self._manifest() as connection:
+                connection.execute("DELETE FROM entries WHERE path = ?", (self._relative(path),))
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def _manifest(self) -> Iterator[sqlite3.Connection]:
+        if not self._manifest_ready:
+            with self._lock:
+                if not self._manifest_ready:
+                    self._initialize_manifest()
+                    self._manifest_ready = True
+        connection = self._connect()
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.manifest_path, timeout=30)
+        connection.execute("PRAGMA busy_timeout=30000")
+        return connection
+
+    def _initialize_manifest(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                connection.execute("""
+                    CREATE TABLE IF NOT EXISTS entries (
+                        path TEXT PRIMARY KEY,
+                        namespace TEXT NOT NULL,
+                        key TEXT,
+                        size INTEGER NOT NULL,
+                        created_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL
+                    ) WITHOUT ROWID
+                """)
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)"
+                )
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS entries_created_at ON entries (created_at)"
+                )
+                if connection.execute("PRAGMA user_version").fetchone()[0] == 0:
+                    # Index files written before the manifest; the write time
+                    # stands in for both creation and last access.
+                    rows = []
+                    for path in self.directory.glob("*/*.json.gz"):
+                        try:
+                            stat = path.stat()
+                        except OSError:
+                            continue
+                        rows.append((
+                            self._relative(path),
+                            path.parent.name,
+                            None,
+                            stat.st_size,
+                            stat.st_mtime,
+                            stat.st_mtime,
+                        ))
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO entries "
+                        "(path, namespace, key, size, created_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                if connection.execute("PRAGMA user_version").fetchone()[0] < 2:
+                    connection.execute(
+                        "CREATE TABLE IF NOT EXISTS totals (bytes INTEGER NOT NULL)"
+                    )
+                    connection.execute("DELETE FROM totals")
+                    connection.execute(
+                        "INSERT INTO totals SELECT COALESCE(SUM(size), 0) FROM entries"
+                    )
+                    for trigger in (
+                        "CREATE TRIGGER IF NOT EXISTS entries_total_insert "
+                        "AFTER INSERT ON entries BEGIN "
+                        "UPDATE totals SET bytes = bytes + NEW.size; END",
+                        "CREATE TRIGGER IF NOT EXISTS entries_total_delete "
+                        "AFTER DELETE ON entries BEGIN "
+                        "UPDATE totals SET bytes = bytes - OLD.size; END",
+                        "CREATE TRIGGER IF NOT EXISTS entries_total_update "
+                        "AFTER UPDATE OF size ON entries BEGIN "
+                        "UPDATE totals SET bytes = bytes - OLD.size + NEW.size; END",
+                    ):
+                        connection.execute(trigger)
+                    connection.execute("PRAGMA user_version = 2")
+        finally:
+            connection.close()
+
+    def _relative(self, path: Path) -> str:
+        return path.relative_to(self.directory).as_posix()
+
+    @staticmethod
+    def _key_text(key: Sequence[str]) -> str:
+        return json.dumps([str(value) for value in key], ensure_ascii=False)
 
     def _path(self, namespace: str, key: Sequence[str]) -> Path:
         safe_namespace = "".join(
@@ -102,3 +325,117 @@ class DataFrameTTLCache:
         )
         digest = hashlib.sha256(digest_input.encode("utf-8")).hexdigest()
         return self.directory / safe_namespace / f"{digest}.json.gz"
+
+
+class NegativeResultCache:
+    """Remember lookups that found nothing, so repeated misses skip the providers.
+
+    Each consecutive miss doubles the expiry, from ``ttl_seconds`` up to
+    ``max_ttl_seconds``. A symbol that failed once is retried soon; a delisted
+    or unsupported one settles at the maximum. A miss more than
+    ``max_ttl_seconds`` after the previous entry expired starts over. With
+    ``store`` set, entries are shared with other processes. The store is then
+    read on every lookup, so a ``discard`` in one process takes effect in the
+    others at once.
+    """
+
+    NAMESPACE = "unavailable"
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600.0,
+        max_ttl_seconds: float = 86400.0,
+        store: Optional[DataFrameTTLCache] = None,
+    ) -> None:
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self.max_ttl_seconds = max(self.ttl_seconds, float(max_ttl_seconds))
+        self.store = store
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """The active entry for ``key`` (reason, failures, until), if any."""
+        entry = self._entry(key)
+        if entry is None or entry["until"] <= time.time():
+            return None
+        return entry
+
+    def add(self, key: str, reason: str) -> dict[str, Any]:
+        now = time.time()
+        previous = self._entry(key)
+        failures = 1
+        if previous is not None and now - previous["until"] <= self.max_ttl_seconds:
+            failures = int(previous["failures"]) + 1
+        ttl = min(self.ttl_seconds * 2 ** (failures - 1), self.max_ttl_seconds)
+        entry = {"reason": str(reason), "failures": failures, "until": now + ttl}
+        with self._lock:
+            self._entries[key] = entry
+        if self.store is not None:
+            try:
+                self.store.set(self.NAMESPACE, (key,), pd.DataFrame([entry]))
+            except OSError:
+                pass
+        return entry
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.store is not None:
+            self.store.delete(self.NAMESPACE, (key,))
+
+    def _entry(self, key: str) -> Optional[dict[str, Any]]:
+        if self.store is None:
+            with self._lock:
+                return self._entries.get(key)
+        # Misses cost one manifest query; only skipped symbols open a file.
+        frame = self.store.get(self.NAMESPACE, (key,), -1)
+        if frame is None or frame.empty:
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+        row = frame.iloc[0]
+        entry = {
+            "reason": str(row["reason"]),
+            "failures": int(row["failures"]),
+            "until": float(row["until"]),
+        }
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+
+class MemoryTTLCache:
+    """Thread-safe in-process LRU cache whose entries also expire after a TTL."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl_seconds >= 0 and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
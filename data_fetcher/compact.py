@@ -0,0 +1,60 @@
+"""Compact in-memory representation of daily bar frames for large universes."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ("open", "high", "low", "close", "amount")
+
+# float32 keeps 24 significant bits, so a compacted price or amount is within
+# 2**-24 (about 6e-8) of the original, relative. Callers comparing compacted
+# frames with full-precision ones should allow PRICE_RTOL.
+PRICE_RTOL = 1e-7
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+_INT32 = np.iinfo(np.int32)
+
+
+def compact_bars(frame: pd.DataFrame) -> pd.DataFrame:
+    """Return ``frame`` with float32 prices and amount and integer volume.
+
+    Volume becomes int32 when every value is a whole number in int32 range,
+    int64 when it is whole but larger. Volume with NaN or fractional values
+    becomes float32. Dates and any other columns are left as they are, since
+    signal code reads dates as Timestamps. Frames that are already compact are
+    returned unchanged.
+    """
+    if frame.empty:
+        return frame
+    updates = {
+        column: frame[column].astype("float32")
+        for column in PRICE_COLUMNS
+        if column in frame.columns and frame[column].dtype == np.float64
+    }
+    if "volume" in frame.columns and frame["volume"].dtype.kind == "f":
+        volume = frame["volume"].to_numpy()
+        if np.isfinite(volume).all() and (volume == np.round(volume)).all():
+            fits = volume.size == 0 or (volume.min() >= _INT32.min and volume.max() <= _INT32.max)
+            updates["volume"] = frame["volume"].astype("int32" if fits else "int64")
+        elif frame["volume"].dtype == np.float64:
+            updates["volume"] = frame["volume"].astype("float32")
+    if not updates:
+        return frame
+    return frame.assign(**updates)
+
+
+def is_compact(frame: pd.DataFrame) -> bool:
+    """Whether ``frame`` uses the compact price and volume dtypes."""
+    return all(
+        frame[column].dtype == np.float32 for column in PRICE_COLUMNS if column in frame.columns
+    ) and ("volume" not in frame.columns or frame["volume"].dtype.kind in "iu")
+
+
+def day_ordinals(dates: pd.Series) -> np.ndarray:
+    """Days since 1970-01-01 as int32, for tz-naive dates at midnight."""
+    return (dates.to_numpy(dtype="datetime64[D]") - _EPOCH).astype(np.int32)
+
+
+def from_day_ordinals(ordinals: np.ndarray) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex((_EPOCH + ordinals.astype("timedelta64[D]")).astype("datetime64[ns]"))
@@ -0,0 +1,167 @@
+"""Hedged requests across redundant daily-bar providers."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+Provider = Tuple[str, Callable[[], pd.DataFrame]]
+
+
+class LatencyTracker:
+    """Recent successful latencies per provider and the hedge delay they imply.
+
+    The delay for a provider is the configured percentile of its last
+    ``window`` successful calls, clamped to ``[min_delay, max_delay]``. Until
+    ``min_samples`` calls have been seen, ``default_delay`` is used.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        window: int = 50,
+        min_samples: int = 10,
+        default_delay: float = 2.0,
+        min_delay: float = 0.25,
+        max_delay: float = 15.0,
+    ) -> None:
+        self.percentile = min(100.0, max(0.0, float(percentile)))
+        self.window = max(1, int(window))
+        self.min_samples = max(1, int(min_samples))
+        self.min_delay = max(0.0, float(min_delay))
+        self.max_delay = max(self.min_delay, float(max_delay))
+        self.default_delay = self._clamp(float(default_delay))
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(provider, deque(maxlen=self.window))
+            samples.append(max(0.0, float(seconds)))
+
+    def delay(self, provider: str) -> float:
+        with self._lock:
+            samples = list(self._samples.get(provider, ()))
+        if len(samples) < self.min_samples:
+            return self.default_delay
+        return self._clamp(float(np.percentile(samples, self.percentile)))
+
+    def _clamp(self, seconds: float) -> float:
+        return min(self.max_delay, max(self.min_delay, seconds))
+
+
+class ProviderHedger:
+    """Run an ordered provider chain, hedging slow providers with the next one.
+
+    The first provider starts at once. If it has not answered within its hedge
+    delay, the next provider is started alongside it, and so on down the
+    chain. A provider that fails or returns an empty frame hands over to the
+    next one immediately, as the sequential chain does. The first non-empty
+    frame wins. Calls that lose keep running on the pool until their own
+    request timeout, and their latency is still recorded.
+
+    The pool is created on first use and again in a forked child, whose copy
+    of the parent's pool has no threads behind it (gunicorn ``preload_app``
+    warms up in the master).
+    """
+
+    def __init__(self, tracker: LatencyTracker, max_workers: int = 12) -> None:
+        self.tracker = tracker
+        self.max_workers = max(1, int(max_workers))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, app_config: Any) -> "ProviderHedger":
+        tracker = LatencyTracker(
+            percentile=getattr(app_config, "HEDGE_LATENCY_PERCENTILE", 95),
+            window=getattr(app_config, "HEDGE_LATENCY_WINDOW", 50),
+            min_samples=getattr(app_config, "HEDGE_MIN_SAMPLES", 10),
+            default_delay=getattr(app_config, "HEDGE_DEFAULT_DELAY_SECONDS", 2.0),
+            min_delay=getattr(app_config, "HEDGE_MIN_DELAY_SECONDS", 0.25),
+            max_delay=float(getattr(app_config, "DATA_REQUEST_TIMEOUT", 15)),
+        )
+        return cls(tracker, getattr(app_config, "HEDGE_MAX_WORKERS", 12))
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="provider-hedge",
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def fetch(self, providers: Sequence[Provider]) -> Tuple[pd.DataFrame, Optional[str]]:
+        """The first non-empty frame and the provider that returned it.
+
+        Returns an empty frame and None when every provider comes back empty.
+        If none returned data and at least one raised, the last error is
+        re-raised.
+        """
+        remaining: List[Provider] = list(providers)
+        pending: Dict[Future, str] = {}
+        error: Optional[BaseException] = None
+        latest, delay = "", 0.0
+
+        def launch() -> Tuple[str, float]:
+            name, call = remaining.pop(0)
+            pending[self.executor.submit(self._timed, name, call)] = name
+            return name, self.tracker.delay(name)
+
+        if remaining:
+            latest, delay = launch()
+        hedge_at = time.monotonic() + delay
+        while pending:
+            timeout = max(0.0, hedge_at - time.monotonic()) if remaining else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                logger.info(
+                    "%s 超过 %.2f 秒未返回，并行请求 %s", latest, delay, remaining[0][0]
+                )
+                latest, delay = launch()
+                hedge_at = time.monotonic() + delay
+                continue
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    frame = future.result()
+                except Exception as e:
+                    logger.warning("%s 获取日线失败: %s", name, e)
+                    error = e
+                    continue
+                if frame is not None and not frame.empty:
+                    return frame, name
+            if remaining and not pending:
+                latest, delay = launch()
+                hedge_at = time.monotonic() + delay
+
+        if error is not None:
+            raise error
+        return pd.DataFrame(), None
+
+    def _timed(self, name: str, call: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        started = time.monotonic()
+        frame = call()
+        if frame is not None and not frame.empty:
+            self.tracker.record(name, time.monotonic() - started)
+        return frame
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,131 @@
+"""Daily market-wide ingest into the local bar store."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, List
+
+import pandas as pd
+
+from .bar_store import DailyBarStore
+
+logger = logging.getLogger(__name__)
+
+MARKET = "A_STOCK"
+
+
+class DailyBarIngestor:
+    """Keep the A-share bar store current with one request per trade date.
+
+    Tickers missing from the store are backfilled once, one request each.
+    After that the store grows by one market-wide cross-section per trade
+    date. Dates are ingested in order, and the run stops at the first
+    failure, so the latest ingested date always means every earlier date
+    is present.
+
+    A date whose cross-section can no longer be fetched (the AkShare
+    snapshot only covers today's close) is recorded as a gap instead of
+    stalling every later run. Every backfill is reset at the same time, so a
+    ticker is served again only after a fresh per-ticker backfill that
+    includes the missed date.
+    """
+
+    def __init__(self, data_fetcher: Any, store: DailyBarStore) -> None:
+        self.data_fetcher = data_fetcher
+        self.store = store
+
+    def backfill(
+        self,
+        tickers: Iterable[str],
+        start_date: Any,
+        end_date: Any,
+    ) -> Dict[str, int]:
+        """Fetch full history for tickers not yet in the store."""
+        wanted = list(dict.fromkeys(tickers))
+        known = self.store.backfilled_tickers(wanted)
+        missing = [ticker for ticker in wanted if ticker not in known]
+        start, end = self._day(start_date), self._day(end_date)
+        counts: Dict[str, int] = {}
+        for ticker in missing:
+            try:
+                frame = self.data_fetcher.get_a_share_history(ticker, start, end)
+            except Exception as error:
+                logger.error("Backfill of %s failed: %s", ticker, error)
+                continue
+            if frame is None or frame.empty:
+                logger.warning("Backfill of %s returned no bars", ticker)
+                continue
+            counts[ticker] = self.store.backfill(ticker, frame, start)
+        return counts
+
+    def pending_dates(self, end_date: Any) -> List[str]:
+        """Completed sessions after the latest ingest through ``end_date``.
+
+        An empty store starts at the last session on or before ``end_date``;
+        earlier history comes from the per-ticker backfill.
+        """
+        calendar = self.data_fetcher.trading_calendar(MARKET)
+        end = min(calendar.session_on_or_before(end_date), calendar.last_completed_session())
+        latest = self.store.latest_ingest(MARKET)
+        start = end if latest is None else pd.Timestamp(latest) + pd.Timedelta(days=1)
+        return [day.strftime("%Y%m%d") for day in calendar.sessions(start, end)]
+
+    def ingest(self, end_date: Any) -> Dict[str, int]:
+        """Append each pending cross-section; stop at the first failed date.
+
+        Dates that can no longer be fetched are skipped as gaps.
+        """
+        counts: Dict[str, int] = {}
+        for day in self.pending_dates(end_date):
+            frame, source = self.data_fetcher.get_a_share_cross_section(day)
+            if frame is None and source == "expired":
+                reset = self.store.reset_backfills()
+                self.store.append_cross_section(MARKET, day, pd.DataFrame(), "gap")
+                logger.error(
+                    "Cross-section for %s can no longer be fetched; recorded a gap "
+                    "and reset %d backfills, which the next backfill refetches",
+                    day,
+                    reset,
+                )
+                continue
+            if frame is None:
+                logger.error(
+                    "Cross-section for %s unavailable from %s; bar store stalled at %s "
+                    "until that date is ingested",
+                    day,
+                    source,
+                    self.store.latest_ingest(MARKET),
+                )
+                break
+            counts[day] = self.store.append_cross_section(MARKET, day, frame, source)
+            logger.info("Ingested %d bars for %s from %s", counts[day], day, source)
+        return counts
+
+    def run(
+        self,
+        tickers: Iterable[str],
+        end_date: Any,
+        backfill_days: int,
+        all_tickers: bool = False,
+    ) -> Dict[str, Any]:
+        """Ingest pending dates, then backfill tickers the store does not know.
+
+        With ``all_tickers`` every ticker quoted on the latest ingested date
+        is backfilled as well.
+        """
+        ingested = self.ingest(end_date)
+        tickers = list(tickers)
+        if all_tickers:
+            tickers = list(dict.fromkeys(tickers + self.market_tickers()))
+        start = pd.Timestamp(self._day(end_date)) - pd.Timedelta(days=backfill_days)
+        backfilled = self.backfill(tickers, start, end_date)
+        return {"ingested": ingested, "backfilled": backfilled}
+
+    def market_tickers(self) -> List[str]:
+        """Tickers quoted on the latest ingested trade date that had bars."""
+        latest = self.store.latest_ingest(MARKET, with_rows=True)
+        return [] if latest is None else self.store.tickers_on(latest)
+
+    @staticmethod
+    def _day(value: Any) -> str:
+        return pd.Timestamp(str(value)).strftime("%Y-%m-%d")
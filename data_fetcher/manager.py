@@ -6,11 +6,19 @@
 
 import pandas as pd
 import numpy as np
-from typing import Optional, Dict, Any, Tuple
-from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Callable, Iterable, List, Tuple
+from datetime import datetime
 import logging
+import threading
+import time
 
-from data_fetcher.cache import DataFrameTTLCache
+from data_fetcher.bar_store import DailyBarStore
+from data_fetcher.cache import DataFrameTTLCache, NegativeResultCache
+from data_fetcher.compact import compact_bars
+from data_fetcher.hedging import ProviderHedger
+from data_fetcher.scheduler import FetchScheduler
+from data_fetcher.shared_bars import SharedBarStore
+from data_fetcher.trading_calendar import MARKET_SESSIONS, TradingCalendar
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
@@ -20,6 +28,9 @@ logger = logging.getLogger(__name__)
 class DataFetcher:
     """统一的数据获取管理器"""
 
+    # A股日线统一以股计成交量、以元计成交额；以手 (100股) 计的数据源在获取时换算
+    A_SHARE_LOT_SIZE = 100.0
+
     def __init__(self, config):
         """
         初始化数据获取器
@@ -50,11 +61,71 @@ class DataFetcher:
             getattr(config, 'CACHE_EXPIRY_DAYS', 1)
         ) * 86400.0
         self.persistent_cache = (
-            DataFrameTTLCache(getattr(config, 'CACHE_DIR', './cache'))
+            DataFrameTTLCache(
+                getattr(config, 'CACHE_DIR', './cache'),
+                max_bytes=int(float(getattr(config, 'CACHE_MAX_MB', 0)) * 1024 * 1024),
+            )
             if self.cache_enabled and self.persistent_cache_enabled
             else None
         )
         self._daily_data_cache: Dict[Tuple[str, str, str], pd.DataFrame] = {}
+        # 紧凑日线：价格与成交额为 float32、成交量为整数 (见 COMPACT_BARS_ENABLED)
+        self.compact_bars_enabled = getattr(config, 'COMPACT_BARS_ENABLED', False)
+        # 无数据代码：各数据源均未返回日线的代码在 TTL 内不再请求
+        self.unavailable_cache = (
+            NegativeResultCache(
+                getattr(config, 'UNAVAILABLE_CACHE_TTL_SECONDS', 1800),
+                getattr(config, 'UNAVAILABLE_CACHE_MAX_TTL_SECONDS', 86400),
+                store=self.persistent_cache,
+            )
+            if self.cache_enabled and getattr(config, 'UNAVAILABLE_CACHE_ENABLED', True)
+            else None
+        )
+        # 抓取调度：进程内所有数据源请求按优先级、调用方公平排队，并按市场限速
+        self.scheduler = FetchScheduler.from_config(config)
+        # 对冲请求：主数据源超过其近期延迟分位仍未返回时，并行请求下一个数据源
+        self.hedger = (
+            ProviderHedger.from_config(config)
+            if getattr(config, 'HEDGED_REQUESTS_ENABLED', False)
+            else None
+        )
+        # 本地日线库：按交易日维护的A股全市场日线 (见 ingest_bars.py)
+        self.bar_store = (
+            DailyBarStore.from_config(config)
+            if getattr(config, 'BAR_STORE_ENABLED', False)
+            else None
+        )
+        # 共享日线库：同一主机上的所有进程共用一份内存映射日线，取代各进程的内存缓存
+        self.shared_bars = (
+            SharedBarStore.from_config(config)
+            if self.cache_enabled and getattr(config, 'SHARED_BAR_STORE_ENABLED', False)
+            else None
+        )
+        # 交易日历：A股首次使用时加载数据源的交易日列表
+        holidays = getattr(config, 'TRADING_HOLIDAYS', {})
+        self.trading_calendars: Dict[str, TradingCalendar] = {
+            market: TradingCalendar.for_market(market, holidays.get(market, ()))
+            for market in MARKET_SESSIONS
+        }
+        self.calendar_refresh_seconds = float(
+            getattr(config, 'TRADING_CALENDAR_REFRESH_DAYS', 7)
+        ) * 86400.0
+        self._a_share_sessions_loaded = False
+        self._calendar_lock = threading.Lock()
+        # 披露数据缓存：季度更新的数据按数据集设置重新验证间隔
+        self.disclosure_cache = (
+            self.persistent_cache
+            if getattr(config, 'DISCLOSURE_CACHE_ENABLED', True)
+            else None
+        )
+        self.disclosure_ttl_seconds = {
+            dataset: float(hours) * 3600.0
+            for dataset, hours in getattr(
+                config, 'DISCLOSURE_CACHE_TTL_HOURS', self.DISCLOSURE_TTL_HOURS
+            ).items()
+        }
+        # 证券名称表：名称极少变化，成功解析后在进程内常驻
+        self._stock_name_cache: Dict[str, str] = {}
         self.tushare_token = config.TUSHARE_TOKEN
         self.ts_api = None
         self.akshare_available = False
@@ -106,7 +177,7 @@ class DataFetcher:
             try:
                 import tushare as ts
                 ts.set_token(self.tushare_token)
-                self.ts_api = ts.pro_api()
+                self.ts_api = ts.pro_api(timeout=self.request_timeout)
                 logger.info("Tushare 初始化成功")
             except Exception as e:
                 logger.warning(f"Tushare 初始化失败: {e}")
@@ -139,22 +210,31 @@ class DataFetcher:
         Returns:
             股票中文名称，如果获取失败返回股票代码本身
         """
+        cached = self._stock_name_cache.get(ticker)
+        if cached is not None:
+            return cached
+
         market = self._detect_market(ticker)
         
         try:
             if market == 'A_STOCK':
                 # A股：使用 AkShare 或 Tushare
-                return self._get_a_stock_name(ticker)
+                name = self._get_a_stock_name(ticker)
             elif market == 'HK_STOCK':
                 # 港股：使用 yfinance 或 AkShare
-                return self._get_hk_stock_name(ticker)
+                name = self._get_hk_stock_name(ticker)
             else:
                 # 美股：使用 yfinance
-                return self._get_us_stock_name(ticker)
+                name = self._get_us_stock_name(ticker)
         except Exception as e:
             logger.warning(f"获取 {ticker} 名称失败: {e}")
             return ticker
 
+        # 解析失败时返回代码本身，不缓存以便下次重试
+        if name and name != ticker:
+            self._stock_name_cache[ticker] = name
+        return name
+
     def _get_a_stock_name(self, ticker: str) -> str:
         """获取A股名称"""
         try:
@@ -285,45 +365,139 @@ class DataFetcher:
             end_date: 结束日期 (格式: 'YYYYMMDD' 或 'YYYY-MM-DD')
             period: 如果未指定日期，回看的交易日天数
 
+        结束日期对齐到不晚于它的最近一个已收盘交易日，未指定开始日期时按交易日历
+        向前取 period 个交易日。周末、节假日或收盘前的请求因此与上一交易日收盘后的
+        请求共用缓存；已包含该交易日K线的持久化缓存不受过期时间限制。
+
         Returns:
             DataFrame: 包含 open, high, low, close, volume 等字段
         """
         market = self._detect_market(ticker)
-
-        # 如果未指定日期，使用默认周期
-        if not end_date:
-            end_date = datetime.now().strftime('%Y%m%d')
+        calendar = self.trading_calendar(market)
+
+        # 只有按默认周期的请求参与无数据缓存，指定历史区间 (如回测) 总是请求数据源
+        default_window = not start_date
+        latest_session = calendar.last_completed_session()
+        end_session = (
+            min(calendar.session_on_or_before(end_date.replace('-', '')), latest_session)
+            if end_date
+            else latest_session
+        )
+        end_date = end_session.strftime('%Y%m%d')
         if not start_date:
-            start_date = (datetime.now() - timedelta(days=period * 2)).strftime('%Y%m%d')
+            start_date = calendar.window_start(end_session, period).strftime('%Y%m%d')
 
         logger.info(f"获取 {ticker} 日线数据: {start_date} 至 {end_date}")
 
         cache_key = (ticker, start_date, end_date)
-        if self.cache_enabled and cache_key in self._daily_data_cache:
-            logger.info("使用内存缓存获取 %s 日线数据", ticker)
-            return self._daily_data_cache[cache_key].copy(deep=True)
+        if self.shared_bars is None:
+            if self.cache_enabled and cache_key in self._daily_data_cache:
+                logger.info("使用内存缓存获取 %s 日线数据", ticker)
+                return self._daily_data_cache[cache_key].copy(deep=True)
+            return self._load_daily_data(
+                ticker, market, start_date, end_date, end_session, default_window
+            )
+
+        # 同一键只由一个线程/进程加载，等待者直接读取其写入的结果
+        with self.shared_bars.fetch_lock(cache_key):
+            shared = self.shared_bars.get(
+                cache_key,
+                self.cache_expiry_seconds,
+                complete=lambda frame: self._covers_session(frame, end_session),
+            )
+            if shared is not None and not shared.empty:
+                logger.info("使用共享日线库获取 %s 日线数据", ticker)
+                return shared
+            df = self._load_daily_data(
+                ticker, market, start_date, end_date, end_session, default_window
+            )
+            if not df.empty:
+                try:
+                    self.shared_bars.set(cache_key, df)
+                except OSError as e:
+                    logger.warning("写入 %s 共享日线库失败: %s", ticker, e)
+            return df
+
+    def _load_daily_data(
+        self,
+        ticker: str,
+        market: str,
+        start_date: str,
+        end_date: str,
+        end_session: pd.Timestamp,
+        default_window: bool,
+    ) -> pd.DataFrame:
+        """依次从本地日线库、持久化缓存和数据源加载日线 (不含进程内与共享缓存)"""
+        cache_key = (ticker, start_date, end_date)
+        remember = self.cache_enabled and self.shared_bars is None
+
+        if market == 'A_STOCK' and self.bar_store is not None:
+            stored = self.bar_store.load(
+                ticker,
+                start_date,
+                end_date,
+                market,
+                end_date,
+            )
+            if stored is not None:
+                logger.info("使用本地日线库获取 %s 日线数据", ticker)
+                if self.compact_bars_enabled:
+                    stored = compact_bars(stored)
+                if remember:
+                    self._daily_data_cache[cache_key] = stored.copy(deep=True)
+                return stored
 
         if self.persistent_cache is not None:
             cached = self.persistent_cache.get(
                 "daily",
                 cache_key,
                 self.cache_expiry_seconds,
+                complete=lambda frame: self._covers_session(frame, end_session),
             )
             if cached is not None and not cached.empty:
                 logger.info("使用持久化缓存获取 %s 日线数据", ticker)
-                self._daily_data_cache[cache_key] = cached.copy(deep=True)
+                if self.compact_bars_enabled:
+                    cached = compact_bars(cached)
+                if remember:
+                    self._daily_data_cache[cache_key] = cached.copy(deep=True)
                 return cached.copy(deep=True)
 
+        negative_cache = self.unavailable_cache if default_window else None
+        if negative_cache is not None:
+            unavailable = negative_cache.get(ticker)
+            if unavailable is not None:
+                logger.info(
+                    "跳过 %s：%s (连续 %d 次无数据)",
+                    ticker,
+                    unavailable['reason'],
+                    unavailable['failures'],
+                )
+                return pd.DataFrame()
+
         try:
-            if market == 'A_STOCK':
-                df = self._get_a_stock_daily(ticker, start_date, end_date)
-            elif market == 'HK_STOCK':
-                df = self._get_hk_stock_daily(ticker, start_date, end_date)
-            else:  # US_STOCK
-                df = self._get_us_stock_daily(ticker, start_date, end_date)
+            with self.scheduler.slot(market):
+                if self.hedger is not None:
+                    df = self._get_daily_hedged(ticker, market, start_date, end_date)
+                elif market == 'A_STOCK':
+                    df = self._get_a_stock_daily(ticker, start_date, end_date)
+                elif market == 'HK_STOCK':
+                    df = self._get_hk_stock_daily(ticker, start_date, end_date)
+                else:  # US_STOCK
+                    df = self._get_us_stock_daily(ticker, start_date, end_date)
+            if self.compact_bars_enabled:
+                df = compact_bars(df)
+
+            if negative_cache is not None:
+                if df.empty:
+                    self._mark_unavailable(
+                        ticker, f"{market} 数据源均未返回 {start_date} 至 {end_date} 的日线"
+                    )
+                else:
+                    negative_cache.discard(ticker)
 
             if self.cache_enabled and not df.empty:
-                self._daily_data_cache[cache_key] = df.copy(deep=True)
+                if remember:
+                    self._daily_data_cache[cache_key] = df.copy(deep=True)
                 if self.persistent_cache is not None:
                     try:
                         self.persistent_cache.set("daily", cache_key, df)
@@ -332,8 +506,80 @@ class DataFetcher:
             return df
         except Exception as e:
             logger.error(f"获取 {ticker} 数据失败: {e}")
+            if negative_cache is not None:
+                self._mark_unavailable(ticker, f"获取失败: {e}")
             return pd.DataFrame()
 
+    def unavailable_reason(self, ticker: str) -> Optional[str]:
+        """
+        代码当前是否因无数据被跳过
+
+        Args:
+            ticker: 股票代码
+
+        Returns:
+            记录的原因；未被跳过时为 None
+        """
+        if self.unavailable_cache is None:
+            return None
+        entry = self.unavailable_cache.get(ticker)
+        return None if entry is None else entry['reason']
+
+    def _mark_unavailable(self, ticker: str, reason: str) -> None:
+        """记录无数据代码，连续失败时延长跳过时间"""
+        entry = self.unavailable_cache.add(ticker, reason)
+        logger.warning(
+            "%s 暂时标记为无数据 (%s)，%.0f 秒内跳过 (第 %d 次)",
+            ticker,
+            reason,
+            entry['until'] - time.time(),
+            entry['failures'],
+        )
+
+    def _daily_providers(self, market: str) -> List[Tuple[str, Callable[..., pd.DataFrame]]]:
+        """与顺序回退相同优先级的日线数据源列表 (名称, 获取函数)"""
+        if market == 'A_STOCK':
+            providers = []
+            if self.data_source == 'akshare' and self.akshare_available:
+                fetchers = {
+                    'tencent': self._get_a_stock_daily_akshare_tencent,
+                    'eastmoney': self._get_a_stock_daily_akshare_eastmoney,
+                }
+                primary = self.akshare_history_source
+                providers = [(f'akshare_{primary}', fetchers.pop(primary))]
+                providers.extend(
+                    (f'akshare_{name}', fetcher) for name, fetcher in fetchers.items()
+                )
+            if self.ts_api:
+                providers.append(('tushare', self._get_a_stock_daily_tushare))
+            return providers
+        if market == 'HK_STOCK':
+            akshare = ('akshare_sina_hk', self._get_hk_stock_daily_akshare)
+        else:
+            akshare = ('akshare_sina_us', self._get_us_stock_daily_akshare)
+        return [akshare, ('yfinance', self._get_stock_daily_yfinance)]
+
+    def _get_daily_hedged(
+        self,
+        ticker: str,
+        market: str,
+        start_date: str,
+        end_date: str
+    ) -> pd.DataFrame:
+        """
+        以对冲方式获取日线数据
+
+        主数据源在其近期延迟分位 (HEDGE_LATENCY_PERCENTILE) 内未返回时并行请求下一个数据源，
+        先返回非空日线的数据源胜出；数据源失败或返回空表时立即尝试下一个。
+        """
+        df, provider = self.hedger.fetch([
+            (name, lambda fetcher=fetcher: fetcher(ticker, start_date, end_date))
+            for name, fetcher in self._daily_providers(market)
+        ])
+        if provider is not None:
+            logger.info("通过 %s 获取到 %s 日线数据", provider, ticker)
+        return df
+
     def _get_a_stock_daily(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
         """获取A股日线数据"""
         # 优先使用配置的数据源
@@ -473,6 +719,8 @@ class DataFetcher:
             for col in numeric_cols:
                 if col in df.columns:
                     df[col] = pd.to_numeric(df[col], errors='coerce')
+            # 东方财富成交量以手计
+            df['volume'] = df['volume'] * self.A_SHARE_LOT_SIZE
 
             return df[['date', 'open', 'high', 'low', 'close', 'volume', 'amount']]
 
@@ -480,6 +728,133 @@ class DataFetcher:
             logger.error(f"AkShare 获取数据失败: {e}")
             return pd.DataFrame()
 
+    def get_a_share_cross_section(self, trade_date: str) -> Tuple[Optional[pd.DataFrame], str]:
+        """
+        获取某个交易日全部A股的日线 (一次请求覆盖全市场)
+
+        优先使用 Tushare daily(trade_date=...)；未配置 Tushare 时，
+        当日收盘后使用 AkShare 全市场快照作为当日日线。
+
+        Args:
+            trade_date: 交易日 (格式: 'YYYYMMDD' 或 'YYYY-MM-DD')
+
+        Returns:
+            (DataFrame, 数据源)。DataFrame 含 ticker, open, high, low, close, volume, amount
+            (成交量以股、成交额以元计，与 get_a_share_history 一致)，休市日为空表；
+            请求失败时为 None。未配置 Tushare 时过去的交易日已无法获取，返回 (None, 'expired')
+        """
+        day = trade_date.replace('-', '')
+        if self.ts_api:
+            try:
+                raw = self.ts_api.daily(trade_date=day)
+            except Exception as e:
+                logger.error("Tushare 获取 %s 全市场日线失败: %s", day, e)
+                return None, 'tushare'
+            if raw is None or raw.empty:
+                return pd.DataFrame(), 'tushare'
+            df = raw.rename(columns={'ts_code': 'ticker', 'vol': 'volume'})
+            return self._tushare_units(
+                df[['ticker', 'open', 'high', 'low', 'close', 'volume', 'amount']]
+            ), 'tushare'
+
+        calendar = self.trading_calendar('A_STOCK')
+        if not calendar.is_session(day):
+            return pd.DataFrame(), 'calendar'
+        today = datetime.now(calendar.timezone).strftime('%Y%m%d')
+        if day < today:
+            logger.warning("未配置 Tushare，AkShare 快照无法补取历史交易日 %s 的全市场日线", day)
+            return None, 'expired'
+        if calendar.last_completed_session().strftime('%Y%m%d') != day:
+            logger.warning("未配置 Tushare，AkShare 快照只能在收盘后生成当日日线: %s", day)
+            return None, 'akshare'
+        snapshot = self.get_spot_snapshot('A_STOCK')
+        if snapshot.empty:
+            return None, 'akshare'
+        return snapshot.drop(columns=['name']), 'akshare'
+
+    def get_a_share_history(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        按与 get_a_share_cross_section 相同的数据源获取单只A股历史日线
+
+        回填本地日线库时使用。各数据源的成交量统一换算为股、成交额为元，
+        与每日截面的单位一致。
+        """
+        if self.ts_api:
+            return self._get_a_stock_daily_tushare(ticker, start_date, end_date)
+        return self._get_a_stock_daily_akshare(ticker, start_date, end_date)
+
+    def trading_calendar(self, market: str) -> TradingCalendar:
+        """
+        获取市场交易日历
+
+        A股日历首次使用时用数据源的交易日列表替换内置规则 (春节等农历假期及调休)，
+        加载失败时保留内置规则，不在本进程内重试。
+
+        Args:
+            market: 'A_STOCK', 'HK_STOCK' 或 'US_STOCK'
+
+        Returns:
+            TradingCalendar
+        """
+        if market == 'A_STOCK' and not self._a_share_sessions_loaded:
+            with self._calendar_lock:
+                if not self._a_share_sessions_loaded:
+                    sessions = self._load_a_share_sessions()
+                    if sessions:
+                        self.trading_calendars[market] = (
+                            self.trading_calendars[market].with_sessions(sessions)
+                        )
+                    self._a_share_sessions_loaded = True
+        return self.trading_calendars[market]
+
+    def _load_a_share_sessions(self) -> List[str]:
+        """从持久化缓存、Tushare 或 AkShare 获取A股交易日列表"""
+        cache_key = ('A_STOCK',)
+        if self.persistent_cache is not None:
+            cached = self.persistent_cache.get(
+                "calendar", cache_key, self.calendar_refresh_seconds
+            )
+            if cached is not None and not cached.empty:
+                return cached['date'].astype(str).tolist()
+
+        sessions = pd.Series(dtype=str)
+        try:
+            if self.ts_api:
+                raw = self.ts_api.trade_cal(
+                    exchange='SSE',
+                    start_date='19901219',
+                    end_date=f"{datetime.now().year}1231",
+                    is_open='1',
+                )
+                sessions = raw['cal_date']
+            elif self.akshare_available:
+                sessions = self.ak.tool_trade_date_hist_sina()['trade_date']
+        except Exception as e:
+            logger.warning("获取A股交易日历失败，使用内置节假日规则: %s", e)
+            return []
+
+        sessions = pd.to_datetime(sessions.astype(str)).dt.strftime('%Y-%m-%d')
+        if sessions.empty:
+            return []
+        if self.persistent_cache is not None:
+            try:
+                self.persistent_cache.set(
+                    "calendar", cache_key, pd.DataFrame({'date': sessions.tolist()})
+                )
+            except OSError as e:
+                logger.warning("写入A股交易日历缓存失败: %s", e)
+        return sessions.tolist()
+
+    @staticmethod
+    def _covers_session(df: pd.DataFrame, session: pd.Timestamp) -> bool:
+        """数据是否已包含指定交易日的K线 (此后直到下一交易日收盘都不会变化)"""
+        if df.empty or 'date' not in df.columns:
+            return False
+        last = pd.Timestamp(df['date'].iloc[-1])
+        if last.tzinfo is not None:
+            last = last.tz_localize(None)
+        return last.normalize() >= session
+
     def _get_a_stock_daily_tushare(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
         """使用 Tushare 获取A股日线数据"""
         if not self.ts_api:
@@ -516,7 +891,15 @@ class DataFetcher:
             if col in df.columns:
                 df[col] = pd.to_numeric(df[col], errors='coerce')
 
-        return df[['date', 'open', 'high', 'low', 'close', 'volume', 'amount']]
+        return self._tushare_units(df[['date', 'open', 'high', 'low', 'close', 'volume', 'amount']])
+
+    @classmethod
+    def _tushare_units(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """Tushare 成交量以手、成交额以千元计，换算为股和元"""
+        return df.assign(
+            volume=pd.to_numeric(df['volume'], errors='coerce') * cls.A_SHARE_LOT_SIZE,
+            amount=pd.to_numeric(df['amount'], errors='coerce') * 1000.0,
+        )
 
     def _normalize_akshare_history(
         self,
@@ -630,11 +1013,13 @@ class DataFetcher:
         # 格式化日期为 YYYY-MM-DD
         if len(start_date) == 8:
             start_date = f"{start_date[:4]}-{start_date[4:6]}-{start_date[6:]}"
-        if len(end_date) == 8:
-            end_date = f"{end_date[:4]}-{end_date[4:6]}-{end_date[6:]}"
+        # yfinance 的 end 不含当日，向后顺延一天以包含结束交易日的K线
+        end_exclusive = (
+            pd.Timestamp(end_date.replace('-', '')) + pd.Timedelta(days=1)
+        ).strftime('%Y-%m-%d')
 
         stock = yf.Ticker(ticker)
-        df = stock.history(start=start_date, end=end_date)
+        df = stock.history(start=start_date, end=end_exclusive, timeout=self.request_timeout)
 
         if df.empty:
             return df
@@ -665,6 +1050,87 @@ class DataFetcher:
         logger.warning("AkShare 未获取到 %s 数据，尝试使用 yfinance", ticker)
         return self._get_stock_daily_yfinance(ticker, start_date, end_date)
 
+    # 全市场实时行情快照列名 (东方财富 A股/港股/美股接口命名略有差异)
+    SPOT_COLUMNS = {
+        '代码': 'code',
+        '名称': 'name',
+        '最新价': 'close',
+        '今开': 'open',
+        '开盘价': 'open',
+        '最高': 'high',
+        '最高价': 'high',
+        '最低': 'low',
+        '最低价': 'low',
+        '成交量': 'volume',
+        '成交额': 'amount',
+    }
+
+    # 快照成交量换算为股：A股快照以手 (100股) 计，港股、美股快照已是股数，与日线历史一致
+    SPOT_VOLUME_MULTIPLIERS = {'A_STOCK': A_SHARE_LOT_SIZE}
+
+    def get_spot_snapshot(self, market: str) -> pd.DataFrame:
+        """
+        获取全市场实时行情快照 (一次请求覆盖整个市场)
+
+        Args:
+            market: 'A_STOCK', 'HK_STOCK' 或 'US_STOCK'
+
+        Returns:
+            DataFrame: ticker, name, open, high, low, close, volume, amount；
+            ticker 与股票池格式一致 (600519.SH / 0700.HK / AAPL)，成交量单位为股，
+            停牌无报价的股票不包含在内
+        """
+        if not self.akshare_available:
+            logger.warning("AkShare 未初始化，无法获取 %s 实时快照", market)
+            return pd.DataFrame()
+
+        loaders = {
+            'A_STOCK': self.ak.stock_zh_a_spot_em,
+            'HK_STOCK': self.ak.stock_hk_spot_em,
+            'US_STOCK': self.ak.stock_us_spot_em,
+        }
+        try:
+            raw = loaders[market]()
+        except KeyError:
+            raise ValueError(f"不支持的市场: {market}")
+        except Exception as e:
+            logger.error("获取 %s 实时快照失败: %s", market, e)
+            return pd.DataFrame()
+        return self._normalize_spot_snapshot(raw, market)
+
+    @classmethod
+    def _normalize_spot_snapshot(cls, raw: pd.DataFrame, market: str) -> pd.DataFrame:
+        """将东方财富快照转换为股票池代码格式和标准价量字段"""
+        columns = ['ticker', 'name', 'open', 'high', 'low', 'close', 'volume', 'amount']
+        if raw is None or raw.empty:
+            return pd.DataFrame(columns=columns)
+
+        df = raw.rename(columns=cls.SPOT_COLUMNS)
+        df = df.loc[:, ~df.columns.duplicated()]
+        code = df['code'].astype(str).str.strip()
+        if market == 'A_STOCK':
+            suffix = code.str[0].map({'6': '.SH', '9': '.SH', '0': '.SZ', '2': '.SZ', '3': '.SZ'})
+            df['ticker'] = code + suffix
+        elif market == 'HK_STOCK':
+            df['ticker'] = code.str.lstrip('0').str.zfill(4) + '.HK'
+        else:
+            # 美股代码形如 105.AAPL (交易所前缀.代码)
+            df['ticker'] = code.str.split('.', n=1).str[-1].str.upper()
+
+        for col in ('open', 'high', 'low', 'close', 'volume', 'amount'):
+            if col not in df.columns:
+                df[col] = float('nan')
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        if 'name' not in df.columns:
+            df['name'] = df['ticker']
+
+        df['volume'] = df['volume'] * cls.SPOT_VOLUME_MULTIPLIERS.get(market, 1.0)
+
+        # 停牌或尚未开盘的股票没有最新价
+        df = df.dropna(subset=['ticker', 'close'])
+        df = df[df['close'] > 0]
+        return df[columns].drop_duplicates('ticker').reset_index(drop=True)
+
     def get_institutional_holdings(
         self,
         ticker: str,
@@ -682,13 +1148,16 @@ class DataFetcher:
         """
         market = self._detect_market(ticker)
 
-        try:
+        def load() -> pd.DataFrame:
             if market == 'A_STOCK':
                 return self._get_a_stock_holders(ticker, report_date)
             elif market == 'US_STOCK':
                 return self._get_us_stock_holders(ticker)
             else:  # HK_STOCK
                 return self._get_hk_stock_holders(ticker)
+
+        try:
+            return self._cached_disclosure('institutional_holdings', ticker, load, report_date)
         except Exception as e:
             logger.error(f"获取 {ticker} 机构持股数据失败: {e}")
             return pd.DataFrame()
@@ -870,15 +1339,18 @@ class DataFetcher:
             logger.warning(f"{ticker} 不是A股，暂不支持股东户数查询")
             return pd.DataFrame()
 
-        # 优先使用配置的数据源
-        if self.data_source == 'akshare' and self.akshare_available:
-            df = self._get_shareholder_count_akshare(ticker)
-            if not df.empty:
-                return df
-            logger.warning("AkShare 获取股东户数失败，尝试使用 Tushare")
-        
-        # 使用 Tushare
-        return self._get_shareholder_count_tushare(ticker)
+        def load() -> pd.DataFrame:
+            # 优先使用配置的数据源
+            if self.data_source == 'akshare' and self.akshare_available:
+                df = self._get_shareholder_count_akshare(ticker)
+                if not df.empty:
+                    return df
+                logger.warning("AkShare 获取股东户数失败，尝试使用 Tushare")
+
+            # 使用 Tushare
+            return self._get_shareholder_count_tushare(ticker)
+
+        return self._cached_disclosure('shareholder_count', ticker, load)
 
     def _get_shareholder_count_akshare(self, ticker: str) -> pd.DataFrame:
         """使用 AkShare 获取股东户数"""
@@ -933,15 +1405,18 @@ class DataFetcher:
             logger.warning(f"{ticker} 不是A股，无北向资金数据")
             return pd.DataFrame()
 
-        # 优先使用配置的数据源
-        if self.data_source == 'akshare' and self.akshare_available:
-            df = self._get_northbound_holdings_akshare(ticker)
-            if not df.empty:
-                return df
-            logger.warning("AkShare 获取北向资金数据失败，尝试使用 Tushare")
-        
-        # 使用 Tushare
-        return self._get_northbound_holdings_tushare(ticker)
+        def load() -> pd.DataFrame:
+            # 优先使用配置的数据源
+            if self.data_source == 'akshare' and self.akshare_available:
+                df = self._get_northbound_holdings_akshare(ticker)
+                if not df.empty:
+                    return df
+                logger.warning("AkShare 获取北向资金数据失败，尝试使用 Tushare")
+
+            # 使用 Tushare
+            return self._get_northbound_holdings_tushare(ticker)
+
+        return self._cached_disclosure('northbound_holdings', ticker, load)
 
     def _get_northbound_holdings_akshare(self, ticker: str) -> pd.DataFrame:
         """使用 AkShare 获取北向资金持股数据"""
@@ -978,12 +1453,125 @@ class DataFetcher:
             logger.error(f"获取 {ticker} 北向资金数据失败: {e}")
             return pd.DataFrame()
 
-    def calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    # 披露数据集默认的重新验证间隔 (小时) 及可识别的报告期列
+    DISCLOSURE_TTL_HOURS = {
+        'institutional_holdings': 168.0,
+        'shareholder_count': 72.0,
+        'northbound_holdings': 24.0,
+    }
+    DISCLOSURE_PERIOD_COLUMNS = {
+        'institutional_holdings': ('end_date', 'report_date', '截止日期', '报告期'),
+        'shareholder_count': ('end_date', '股东户数统计截止日', '截止日期', '报告期'),
+        # 北向持股按日更新，没有报告期，只按 TTL 重新验证
+        'northbound_holdings': (),
+    }
+
+    def _cached_disclosure(
+        self,
+        dataset: str,
+        ticker: str,
+        loader: Callable[[], pd.DataFrame],
+        report_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        通过持久化缓存获取披露数据
+
+        缓存键为 (股票代码, 报告期)，未指定报告期时使用最近一个已结束的季度。
+        数据已包含该报告期时直到下一季度结束前都直接复用；否则超过数据集 TTL 后
+        重新请求。空结果不缓存。
+
+        Args:
+            dataset: 数据集名称
+            ticker: 股票代码
+            loader: 实际请求数据源的函数
+            report_date: 报告期 (格式: 'YYYYMMDD')
+
+        Returns:
+            DataFrame 副本，调用方可以直接修改
+        """
+        if self.disclosure_cache is None:
+            with self.scheduler.slot(self._detect_market(ticker)):
+                return loader()
+
+        period = self._report_period(report_date)
+        cache_key = (ticker, period.strftime('%Y%m%d'))
+        cached = self.disclosure_cache.get(
+            dataset,
+            cache_key,
+            self.disclosure_ttl_seconds.get(dataset, 86400.0),
+            complete=lambda frame: self._covers_report_period(dataset, frame, period),
+        )
+        if cached is not None and not cached.empty:
+            logger.info("使用披露数据缓存获取 %s %s", ticker, dataset)
+            return cached
+
+        with self.scheduler.slot(self._detect_market(ticker)):
+            df = loader()
+        if df is not None and not df.empty:
+            try:
+                self.disclosure_cache.set(dataset, cache_key, df)
+            except (OSError, ValueError) as e:
+                logger.warning("写入 %s %s 披露数据缓存失败: %s", ticker, dataset, e)
+        return df
+
+    def revalidate_disclosures(
+        self,
+        ticker: str,
+        datasets: Optional[Iterable[str]] = None
+    ) -> None:
+        """
+        丢弃缓存的披露数据，下次读取时重新请求数据源
+
+        时点披露采集 (snapshot_disclosures.py) 在采集前调用，确保记录的是当前公告。
+
+        Args:
+            ticker: 股票代码
+            datasets: 数据集名称，默认全部
+        """
+        if self.disclosure_cache is None:
+            return
+        cache_key = (ticker, self._report_period().strftime('%Y%m%d'))
+        for dataset in datasets or self.DISCLOSURE_PERIOD_COLUMNS:
+            self.disclosure_cache.delete(dataset, cache_key)
+
+    @staticmethod
+    def _report_period(report_date: Optional[str] = None) -> pd.Timestamp:
+        """指定报告期，或今天之前最近一个已结束的季度末"""
+        if report_date:
+            return pd.Timestamp(report_date.replace('-', ''))
+        today = pd.Timestamp(datetime.now().date())
+        return (today - pd.offsets.QuarterEnd(1)).normalize()
+
+    def _covers_report_period(
+        self,
+        dataset: str,
+        df: pd.DataFrame,
+        period: pd.Timestamp
+    ) -> bool:
+        """数据是否已包含指定报告期 (此后直到下一季度结束都不会再有新一期)"""
+        for column in self.DISCLOSURE_PERIOD_COLUMNS.get(dataset, ()):
+            if column in df.columns:
+                periods = pd.to_datetime(df[column].astype(str), errors='coerce')
+                if periods.dt.tz is not None:
+                    periods = periods.dt.tz_localize(None)
+                return bool((periods.dropna() >= period).any())
+        return False
+
+    # 全部指标列；MACD 的信号线与柱状图随 'macd' 一起计算
+    INDICATOR_COLUMNS = ('ma5', 'ma10', 'ma20', 'ma60', 'ma120', 'ma250', 'obv', 'rsi', 'macd', 'mfi')
+
+    def calculate_technical_indicators(
+        self,
+        df: pd.DataFrame,
+        indicators: Optional[Iterable[str]] = None
+    ) -> pd.DataFrame:
         """
         计算常用技术指标
 
         Args:
             df: 包含 OHLCV 数据的 DataFrame
+            indicators: 只计算这些指标列 (如 SignalPlan.indicators，均线写作 'ma20')，
+                默认计算 INDICATOR_COLUMNS 全部指标
 
         Returns:
             DataFrame: 添加了技术指标的 DataFrame
@@ -992,10 +1580,13 @@ class DataFetcher:
             return df
 
         df = df.copy()
+        wanted = set(self.INDICATOR_COLUMNS if indicators is None else indicators)
 
         if self.indicator_engine is not None:
             try:
-                return self.indicator_engine.enrich(df)
+                if indicators is None:
+                    return self.indicator_engine.enrich(df)
+                return self.indicator_engine.enrich(df, indicators=wanted)
             except Exception as e:
                 logger.warning(
                     "AkQuant 指标计算失败，回退到原生实现: %s",
@@ -1003,26 +1594,39 @@ class DataFetcher:
                 )
 
         # 计算移动平均线
-        for period in [5, 10, 20, 60, 120, 250]:
+        for period in self._ma_periods(wanted):
             df[f'ma{period}'] = df['close'].rolling(window=period).mean()
 
         # 计算 OBV (能量潮)
-        df['obv'] = self._calculate_obv(df)
+        if 'obv' in wanted:
+            df['obv'] = self._calculate_obv(df)
 
         # 计算 RSI
-        df['rsi'] = self._calculate_rsi(df['close'], period=14)
+        if 'rsi' in wanted:
+            df['rsi'] = self._calculate_rsi(df['close'], period=14)
 
         # 计算 MACD
-        macd_data = self._calculate_macd(df['close'])
-        df['macd'] = macd_data['macd']
-        df['macd_signal'] = macd_data['signal']
-        df['macd_hist'] = macd_data['histogram']
+        if 'macd' in wanted:
+            macd_data = self._calculate_macd(df['close'])
+            df['macd'] = macd_data['macd']
+            df['macd_signal'] = macd_data['signal']
+            df['macd_hist'] = macd_data['histogram']
 
         # 计算 MFI (资金流量指标)
-        df['mfi'] = self._calculate_mfi(df, period=14)
+        if 'mfi' in wanted:
+            df['mfi'] = self._calculate_mfi(df, period=14)
 
         return df
 
+    @staticmethod
+    def _ma_periods(indicators: Iterable[str]) -> List[int]:
+        """从指标列名 (ma20 等) 中解析均线周期"""
+        return sorted(
+            int(name[2:])
+            for name in indicators
+            if name.startswith('ma') and name[2:].isdigit()
+        )
+
     @staticmethod
     def _calculate_obv(df: pd.DataFrame) -> pd.Series:
         """计算 OBV 指标"""
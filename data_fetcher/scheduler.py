@@ -0,0 +1,148 @@
+"""Process-wide, priority-aware scheduling of provider fetches."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+# Lower rank is served first.
+PRIORITIES: Dict[str, int] = {"interactive": 0, "batch": 1, "background": 2}
+
+
+@dataclass
+class _Ticket:
+    rank: int
+    start_tag: float
+    seq: int
+    market: str
+    caller: str
+
+
+class FetchScheduler:
+    """Admit provider fetches by priority class, caller fairness and market budget.
+
+    Every fetch that reaches a data provider takes a slot. A slot is granted
+    when three conditions hold:
+
+    * fewer than ``budget`` fetches are running. Interactive fetches may use
+      ``interactive_reserve`` more slots, so a lookup never queues behind a
+      full batch.
+    * at least ``rate_limits[market]`` seconds have passed since the last
+      fetch started against that market's providers.
+    * no waiting ticket ranks ahead of it.
+
+    Tickets are ordered by priority class. Within a class they are ordered by
+    start-time fair queuing tags per caller, so two concurrent batches
+    alternate instead of the earlier one draining first.
+
+    Priority and caller are usually set once per thread with ``context``.
+    Fetches made outside any context count as interactive.
+    """
+
+    def __init__(
+        self,
+        budget: int = 6,
+        rate_limits: Optional[Mapping[str, float]] = None,
+        interactive_reserve: int = 2,
+    ) -> None:
+        self.budget = max(1, int(budget))
+        self.interactive_reserve = max(0, int(interactive_reserve))
+        self.rate_limits: Dict[str, float] = {
+            market: max(0.0, float(seconds)) for market, seconds in (rate_limits or {}).items()
+        }
+        self._condition = threading.Condition()
+        self._waiting: List[_Ticket] = []
+        self._active = 0
+        self._next_start: Dict[str, float] = {}
+        self._virtual_time = [0.0] * len(PRIORITIES)
+        self._finish_tags: Dict[tuple[int, str], float] = {}
+        self._sequence = itertools.count()
+        self._local = threading.local()
+
+    @classmethod
+    def from_config(cls, app_config: Any) -> "FetchScheduler":
+        return cls(
+            budget=getattr(app_config, "BATCH_FETCH_BUDGET", 6),
+            rate_limits=getattr(app_config, "BATCH_RATE_LIMIT_SECONDS", {}),
+            interactive_reserve=getattr(app_config, "FETCH_INTERACTIVE_RESERVE", 2),
+        )
+
+    @contextmanager
+    def context(self, priority: str, caller: Optional[str] = None) -> Iterator[None]:
+        """Run this thread's fetches at ``priority`` on behalf of ``caller``."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"unknown fetch priority: {priority!r}")
+        previous = getattr(self._local, "context", None)
+        self._local.context = (priority, caller)
+        try:
+            yield
+        finally:
+            self._local.context = previous
+
+    @contextmanager
+    def slot(self, market: str) -> Iterator[None]:
+        """Hold one fetch slot for ``market`` for the duration of the block."""
+        self._acquire(market)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            waiting = {name: 0 for name in PRIORITIES}
+            names = {rank: name for name, rank in PRIORITIES.items()}
+            for ticket in self._waiting:
+                waiting[names[ticket.rank]] += 1
+            return {"active": self._active, "budget": self.budget, "waiting": waiting}
+
+    def _acquire(self, market: str) -> None:
+        priority, caller = getattr(self._local, "context", None) or ("interactive", None)
+        rank = PRIORITIES[priority]
+        caller = caller or f"thread-{threading.get_ident()}"
+        with self._condition:
+            key = (rank, caller)
+            start_tag = max(self._virtual_time[rank], self._finish_tags.get(key, 0.0))
+            self._finish_tags[key] = start_tag + 1.0
+            ticket = _Ticket(rank, start_tag, next(self._sequence), market, caller)
+            self._waiting.append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    chosen, wake_at = self._next_grant(now)
+                    if chosen is ticket:
+                        break
+                    timeout = None if wake_at is None else max(0.0, wake_at - now)
+                    self._condition.wait(timeout)
+            except BaseException:
+                self._waiting.remove(ticket)
+                self._condition.notify_all()
+                raise
+            self._waiting.remove(ticket)
+            self._active += 1
+            self._virtual_time[rank] = max(self._virtual_time[rank], start_tag)
+            interval = self.rate_limits.get(market, 0.0)
+            self._next_start[market] = now + interval
+            if not self._waiting:
+                self._finish_tags.clear()
+            self._condition.notify_all()
+
+    def _next_grant(self, now: float) -> tuple[Optional[_Ticket], Optional[float]]:
+        """The ticket to admit now, else the earliest time one may become admissible."""
+        wake_at: Optional[float] = None
+        for ticket in sorted(self._waiting, key=lambda t: (t.rank, t.start_tag, t.seq)):
+            limit = self.budget + (self.interactive_reserve if ticket.rank == 0 else 0)
+            if self._active >= limit:
+                continue
+            ready_at = self._next_start.get(ticket.market, 0.0)
+            if ready_at > now:
+                wake_at = ready_at if wake_at is None else min(wake_at, ready_at)
+                continue
+            return ticket, None
+        return None, wake_at
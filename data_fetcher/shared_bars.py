@@ -0,0 +1,289 @@
+"""Host-wide store of daily bar frames shared by every process on the machine."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:  # POSIX only; elsewhere fetches are single-flight per process
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from data_fetcher.bar_store import BAR_COLUMNS
+from data_fetcher.compact import day_ordinals, from_day_ordinals, is_compact
+
+FRAME_COLUMNS = ("date", *BAR_COLUMNS)
+RECORD_DTYPE = np.dtype([("date", "<i8"), *[(column, "<f8") for column in BAR_COLUMNS]])
+# Compact frames (see data_fetcher.compact) with midnight dates: int32 day
+# ordinals, float32 prices and amount, int64 volume. 32 bytes a bar, not 56.
+COMPACT_RECORD_DTYPE = np.dtype([
+    ("date", "<i4"),
+    *[(column, "<i8" if column == "volume" else "<f4") for column in BAR_COLUMNS],
+])
+
+
+class SharedBarStore:
+    """Daily bar frames as fixed-layout ``.npy`` records behind a SQLite index.
+
+    Each frame is one file of ``RECORD_DTYPE`` records (date as int64
+    nanoseconds, then float64 OHLCV and amount), or of
+    ``COMPACT_RECORD_DTYPE`` records for compact daily frames. Files are read with
+    ``np.load(mmap_mode="r")``, so every process on the host maps the same
+    page-cache copy instead of parsing its own. Each caller still gets its own
+    writable frame. Files are replaced atomically. The index records each
+    frame's window, original dtypes, time zone and creation time.
+
+    ``fetch_lock`` serialises fetches of one key across threads and processes
+    (``fcntl.flock`` on ``locks/<digest>.lock``), so a slow fetch never
+    blocks a different key. A process that waited on the lock finds the frame
+    the holder stored and does not fetch it again. Entries older than
+    ``retention_seconds`` are dropped on write, along with their lock files.
+    """
+
+    INDEX_NAME = "index.sqlite3"
+
+    def __init__(self, directory: str, retention_seconds: float = 7 * 86400.0) -> None:
+        self.directory = Path(directory).expanduser().resolve()
+        self.retention_seconds = max(0.0, float(retention_seconds))
+        self.index_path = self.directory / self.INDEX_NAME
+        self._locks: Dict[str, list] = {}  # digest -> [lock, holders and waiters]
+        self._locks_guard = threading.Lock()
+        self._initialize()
+
+    @classmethod
+    def from_config(cls, app_config: Any) -> "SharedBarStore":
+        return cls(
+            getattr(app_config, "SHARED_BAR_STORE_DIR", "./cache/shared_bars"),
+            float(getattr(app_config, "SHARED_BAR_STORE_RETENTION_DAYS", 7)) * 86400.0,
+        )
+
+    @staticmethod
+    def supports(frame: pd.DataFrame) -> bool:
+        """Whether ``frame`` has the fixed bar layout this store can hold."""
+        if tuple(frame.columns) != FRAME_COLUMNS:
+            return False
+        return pd.api.types.is_datetime64_any_dtype(frame["date"]) and all(
+            pd.api.types.is_numeric_dtype(frame[column]) for column in BAR_COLUMNS
+        )
+
+    @contextmanager
+    def fetch_lock(self, key: Sequence[str]) -> Iterator[None]:
+        """Hold the host-wide lock for ``key`` for the duration of the block."""
+        digest = self._digest(key)
+        with self._locks_guard:
+            entry = self._locks.setdefault(digest, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                if fcntl is None:
+                    yield
+                    return
+                with open(self._lock_path(digest), "a+b") as handle:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                    try:
+                        yield
+                    finally:
+                        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            with self._locks_guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[digest]
+
+    def get(
+        self,
+        key: Sequence[str],
+        ttl_seconds: float,
+        complete: Optional[Callable[[pd.DataFrame], bool]] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Return the stored frame, or None when missing or expired.
+
+        An expired frame for which ``complete`` returns True is still served,
+        as in ``DataFrameTTLCache.get``.
+        """
+        digest = self._digest(key)
+        try:
+            with self._index() as connection:
+                row = connection.execute(
+                    "SELECT dtypes, timezone, created_at FROM frames WHERE digest = ?",
+                    (digest,),
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        dtypes, timezone, created_at = row
+        expired = ttl_seconds >= 0 and time.time() - created_at > ttl_seconds
+        if expired and complete is None:
+            self._drop([digest])
+            return None
+        try:
+            records = np.load(self._path(digest), mmap_mode="r", allow_pickle=False)
+            if records.dtype not in (RECORD_DTYPE, COMPACT_RECORD_DTYPE):
+                raise ValueError(f"unexpected record layout: {records.dtype}")
+            frame = self._to_frame(records, json.loads(dtypes), timezone)
+        except (OSError, ValueError, TypeError):
+            self._drop([digest])
+            return None
+        if expired and not complete(frame):
+            self._drop([digest])
+            return None
+        return frame
+
+    def set(self, key: Sequence[str], frame: pd.DataFrame) -> bool:
+        """Store ``frame`` under ``key``; False when its layout is not supported."""
+        if not self.supports(frame):
+            return False
+        dates = pd.DatetimeIndex(frame["date"]).as_unit("ns")
+        timezone = None if dates.tz is None else str(dates.tz)
+        if timezone:
+            dates = dates.tz_localize(None)
+        if is_compact(frame) and (dates == dates.normalize()).all():
+            records = np.empty(len(frame), dtype=COMPACT_RECORD_DTYPE)
+            records["date"] = day_ordinals(dates)
+        else:
+            records = np.empty(len(frame), dtype=RECORD_DTYPE)
+            records["date"] = dates.asi8
+        for column in BAR_COLUMNS:
+            records[column] = frame[column].to_numpy(
+                dtype=records.dtype[column], na_value=np.nan
+            )
+
+        digest = self._digest(key)
+        target = self._path(digest)
+        descriptor, temporary_name = tempfile.mkstemp(
+            prefix=f".{digest}-", suffix=".tmp", dir=target.parent
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as handle:
+                np.save(handle, records, allow_pickle=False)
+            os.replace(temporary_name, target)
+        finally:
+            if os.path.exists(temporary_name):
+                os.unlink(temporary_name)
+
+        created_at = time.time()
+        ticker, start, end = (str(value) for value in key)
+        try:
+            with self._index() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO frames "
+                    "(digest, ticker, start_date, end_date, rows, dtypes, timezone, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        digest, ticker, start, end, len(records),
+                        json.dumps({column: str(dtype) for column, dtype in frame.dtypes.items()}),
+                        timezone, created_at,
+                    ),
+                )
+                stale = [
+                    row[0] for row in connection.execute(
+                        "SELECT digest FROM frames WHERE created_at < ?",
+                        (created_at - self.retention_seconds,),
+                    )
+                ] if self.retention_seconds else []
+        except sqlite3.Error as error:
+            raise OSError(f"shared bar index update failed: {error}") from error
+        if stale:
+            self._drop(stale)
+            # A fetch racing this unlink can at worst fetch the key twice.
+            for digest in stale:
+                try:
+                    self._lock_path(digest).unlink(missing_ok=True)
+                except OSError:
+                    continue
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        with self._index() as connection:
+            frames, rows = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(rows), 0) FROM frames"
+            ).fetchone()
+        return {"frames": frames, "rows": rows}
+
+    @staticmethod
+    def _to_frame(
+        records: np.ndarray, dtypes: Dict[str, str], timezone: Optional[str]
+    ) -> pd.DataFrame:
+        if records.dtype == COMPACT_RECORD_DTYPE:
+            dates = from_day_ordinals(records["date"])
+        else:
+            dates = pd.DatetimeIndex(records["date"].astype("datetime64[ns]"))
+        if timezone:
+            dates = dates.tz_localize(timezone)
+        frame = pd.DataFrame({"date": dates, **{
+            column: np.array(records[column]) for column in BAR_COLUMNS
+        }})
+        for column, dtype in dtypes.items():
+            if str(frame[column].dtype) != dtype:
+                frame[column] = frame[column].astype(dtype)
+        return frame
+
+    def _drop(self, digests: Sequence[str]) -> None:
+        # Processes that already mapped a file keep reading it after unlink
+        # on POSIX; elsewhere the unlink fails and the next write replaces it.
+        for digest in digests:
+            try:
+                self._path(digest).unlink(missing_ok=True)
+            except OSError:
+                continue
+        try:
+            with self._index() as connection:
+                connection.executemany(
+                    "DELETE FROM frames WHERE digest = ?", [(digest,) for digest in digests]
+                )
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def _index(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.index_path, timeout=30)
+        connection.execute("PRAGMA busy_timeout=30000")
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _initialize(self) -> None:
+        (self.directory / "locks").mkdir(parents=True, exist_ok=True)
+        with self._index() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS frames (
+                    digest TEXT PRIMARY KEY,
+                    ticker TEXT,
+                    start_date TEXT,
+                    end_date TEXT,
+                    rows INTEGER NOT NULL,
+                    dtypes TEXT NOT NULL,
+                    timezone TEXT,
+                    created_at REAL NOT NULL
+                ) WITHOUT ROWID
+            """)
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS frames_created_at ON frames (created_at)"
+            )
+
+    def _path(self, digest: str) -> Path:
+        return self.directory / f"{digest}.npy"
+
+    def _lock_path(self, digest: str) -> Path:
+        return self.directory / "locks" / f"{digest}.lock"
+
+    @staticmethod
+    def _digest(key: Sequence[str]) -> str:
+        text = json.dumps([str(value) for value in key], ensure_ascii=True, separators=(",", ":"))
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
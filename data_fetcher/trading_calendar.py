@@ -0,0 +1,186 @@
+"""Per-market trading calendars for sizing and keying daily-bar requests."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time as clock, timedelta
+from typing import Any, Dict, Iterable, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar,
+    EasterMonday,
+    GoodFriday,
+    Holiday,
+    USLaborDay,
+    USMartinLutherKingJr,
+    USMemorialDay,
+    USPresidentsDay,
+    USThanksgivingDay,
+    nearest_workday,
+    sunday_to_monday,
+)
+
+# Market time zone and the local time after which the day's bar is final at
+# the data providers (exchange close plus a settlement margin).
+MARKET_SESSIONS: Dict[str, tuple[str, clock]] = {
+    "A_STOCK": ("Asia/Shanghai", clock(15, 30)),
+    "HK_STOCK": ("Asia/Hong_Kong", clock(16, 30)),
+    "US_STOCK": ("America/New_York", clock(16, 30)),
+}
+
+# Rule-based holidays are generated for this span; dates outside it fall
+# back to weekdays only.
+_RULE_YEARS = (1990, date.today().year + 2)
+
+
+def _after_christmas(day: datetime) -> datetime:
+    """HKEX: the first weekday after Christmas, shifted when Christmas is a Sunday."""
+    return day + timedelta(days=1) if day.weekday() in (6, 0) else day
+
+
+class _NYSEHolidays(AbstractHolidayCalendar):
+    rules = [
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-01-01", observance=nearest_workday),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+class _HKEXHolidays(AbstractHolidayCalendar):
+    # Lunar-calendar holidays (Lunar New Year, Ching Ming, Buddha's Birthday,
+    # Tuen Ng, Mid-Autumn, Chung Yeung) are supplied through configuration.
+    rules = [
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        GoodFriday,
+        EasterMonday,
+        Holiday("Labour Day", month=5, day=1, observance=sunday_to_monday),
+        Holiday("HKSAR Establishment Day", month=7, day=1, observance=sunday_to_monday),
+        Holiday("National Day", month=10, day=1, observance=sunday_to_monday),
+        Holiday("Christmas Day", month=12, day=25, observance=sunday_to_monday),
+        Holiday("Day after Christmas", month=12, day=26, observance=_after_christmas),
+    ]
+
+
+class _SSEHolidays(AbstractHolidayCalendar):
+    # Only the fixed-date closures. Spring Festival and the State Council's
+    # yearly adjustments come from the provider's trade-date list.
+    rules = [
+        Holiday("New Year's Day", month=1, day=1),
+        Holiday("Labour Day", month=5, day=1),
+        *(Holiday(f"National Day {day}", month=10, day=day) for day in range(1, 8)),
+    ]
+
+
+_HOLIDAY_RULES: Dict[str, type[AbstractHolidayCalendar]] = {
+    "A_STOCK": _SSEHolidays,
+    "HK_STOCK": _HKEXHolidays,
+    "US_STOCK": _NYSEHolidays,
+}
+
+
+class TradingCalendar:
+    """Weekday sessions minus a market's holidays.
+
+    A session is complete once the market-local time passes the configured
+    close. Daily-bar requests are sized in sessions and keyed by the last
+    completed session. A weekend, a holiday, or a retry later the same
+    evening then maps to the same request.
+    """
+
+    def __init__(
+        self,
+        market: str,
+        timezone: str,
+        close: clock,
+        holidays: Iterable[Any] = (),
+    ) -> None:
+        self.market = market
+        self.timezone = ZoneInfo(timezone)
+        self.close = close
+        self.holidays = frozenset(self._day(value) for value in holidays)
+        self._busdays = np.busdaycalendar(
+            weekmask="1111100",
+            holidays=np.array(sorted(self.holidays), dtype="datetime64[D]"),
+        )
+
+    @classmethod
+    def for_market(cls, market: str, holidays: Iterable[Any] = ()) -> "TradingCalendar":
+        """Calendar from the built-in rules plus extra ``holidays``."""
+        timezone, close = MARKET_SESSIONS[market]
+        start, end = _RULE_YEARS
+        rules = _HOLIDAY_RULES[market]().holidays(f"{start}-01-01", f"{end}-12-31")
+        return cls(market, timezone, close, [*rules, *holidays])
+
+    def with_sessions(self, sessions: Iterable[Any]) -> "TradingCalendar":
+        """Replace rule holidays with an authoritative trade-date list.
+
+        Inside the list's span, every weekday missing from it is a holiday.
+        Outside the span, the existing holidays still apply.
+        """
+        known = np.unique(np.array([self._day(value) for value in sessions], dtype="datetime64[D]"))
+        if not len(known):
+            return self
+        first, last = known[0].item(), known[-1].item()
+        weekdays = np.arange(first, last + timedelta(days=1), dtype="datetime64[D]")
+        weekdays = weekdays[np.is_busday(weekdays, weekmask="1111100")]
+        closed = np.setdiff1d(weekdays, known).astype(object)
+        outside = [day for day in self.holidays if not first <= day <= last]
+        return type(self)(
+            self.market,
+            self.timezone.key,
+            self.close,
+            [*outside, *closed],
+        )
+
+    def is_session(self, day: Any) -> bool:
+        return bool(np.is_busday(self._day(day), busdaycal=self._busdays))
+
+    def sessions(self, start: Any, end: Any) -> pd.DatetimeIndex:
+        """Sessions in ``[start, end]``."""
+        days = np.arange(self._day(start), self._day(end) + timedelta(days=1), dtype="datetime64[D]")
+        return pd.DatetimeIndex(days[np.is_busday(days, busdaycal=self._busdays)])
+
+    def session_on_or_before(self, day: Any) -> pd.Timestamp:
+        return self._offset(day, 0)
+
+    def last_completed_session(self, now: Optional[datetime] = None) -> pd.Timestamp:
+        """Latest session whose close has passed at ``now`` (default: now)."""
+        local = (now or datetime.now(self.timezone)).astimezone(self.timezone)
+        today = local.date()
+        if self.is_session(today) and local.time() >= self.close:
+            return pd.Timestamp(today)
+        return self._offset(today - timedelta(days=1), 0)
+
+    def window_start(self, end: Any, count: int) -> pd.Timestamp:
+        """First session of the ``count`` sessions ending on or before ``end``."""
+        return self._offset(end, -(max(1, int(count)) - 1))
+
+    def has_traded_since(self, last_bar: Any, now: Optional[datetime] = None) -> bool:
+        """Whether a session completed after the ``last_bar`` date."""
+        return self.last_completed_session(now).date() > self._day(last_bar)
+
+    def _offset(self, day: Any, sessions: int) -> pd.Timestamp:
+        moved = np.busday_offset(
+            self._day(day),
+            sessions,
+            roll="backward",
+            busdaycal=self._busdays,
+        )
+        return pd.Timestamp(moved)
+
+    @staticmethod
+    def _day(value: Any) -> date:
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return pd.Timestamp(str(value)).date()
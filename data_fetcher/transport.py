@@ -0,0 +1,138 @@
+"""Process-wide pooled HTTP transport shared by providers and notifiers."""
+
+from __future__ import annotations
+
+import random
+import threading
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class _JitteredRetry(Retry):
+    """Retry that adds up to ``jitter`` random seconds to each backoff.
+
+    urllib3 only accepts ``backoff_jitter`` from 2.0, so the jitter is
+    applied here to work with 1.26 as well.
+    """
+
+    def __init__(self, *args: Any, jitter: float = 0.0, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.jitter = max(0.0, float(jitter))
+
+    def new(self, **kwargs: Any) -> "_JitteredRetry":
+        retry = super().new(**kwargs)
+        retry.jitter = self.jitter
+        return retry
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return backoff + random.uniform(0.0, self.jitter) if backoff > 0 else backoff
+
+
+class _TimeoutAdapter(HTTPAdapter):
+    """Connection-pooling adapter that applies a default timeout."""
+
+    def __init__(self, timeout: float, **kwargs: Any) -> None:
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request: Any, timeout: Any = None, **kwargs: Any) -> requests.Response:
+        return super().send(request, timeout=self.timeout if timeout is None else timeout, **kwargs)
+
+
+class HTTPTransport:
+    """One keep-alive ``requests.Session`` with per-host pools and retries.
+
+    ``pool_hosts`` bounds how many host pools stay open. ``pool_size`` bounds
+    the connections kept alive per host, which should be at least the number
+    of concurrent fetch workers. Connection errors, and 429/5xx responses to
+    idempotent requests, are retried with exponential backoff plus random
+    jitter. Any request sent without an explicit timeout gets ``timeout``.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        timeout: float = 15.0,
+        pool_hosts: int = 32,
+        pool_size: int = 8,
+        max_retries: int = 2,
+        backoff_seconds: float = 0.5,
+        backoff_jitter: float = 0.5,
+    ) -> None:
+        self.timeout = float(timeout)
+        self.pool_hosts = max(1, int(pool_hosts))
+        self.pool_size = max(1, int(pool_size))
+        self.retry = _JitteredRetry(
+            total=max(0, int(max_retries)),
+            backoff_factor=max(0.0, float(backoff_seconds)),
+            jitter=backoff_jitter,
+            status_forcelist=self.RETRY_STATUSES,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        self._session: Optional[requests.Session] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, app_config: Any) -> "HTTPTransport":
+        return cls(
+            timeout=float(getattr(app_config, "DATA_REQUEST_TIMEOUT", 15)),
+            pool_hosts=getattr(app_config, "HTTP_POOL_HOSTS", 32),
+            pool_size=getattr(app_config, "HTTP_POOL_SIZE", 8),
+            max_retries=getattr(app_config, "HTTP_RETRIES", 2),
+            backoff_seconds=getattr(app_config, "HTTP_BACKOFF_SECONDS", 0.5),
+            backoff_jitter=getattr(app_config, "HTTP_BACKOFF_JITTER", 0.5),
+        )
+
+    @property
+    def session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = _TimeoutAdapter(
+                    self.timeout,
+                    pool_connections=self.pool_hosts,
+                    pool_maxsize=self.pool_size,
+                    max_retries=self.retry,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_shared: Optional[HTTPTransport] = None
+_shared_lock = threading.Lock()
+
+
+def shared_transport(app_config: Any = None) -> HTTPTransport:
+    """The process-wide transport, built from ``app_config`` on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = (
+                HTTPTransport.from_config(app_config)
+                if app_config is not None
+                else HTTPTransport()
+            )
+        return _shared
@@ -17,6 +17,8 @@ class DisclosureSnapshotCollector:
 
     def collect(self, ticker: str, observed_at: Optional[Any] = None) -> Dict[str, int]:
         observed = observed_at or datetime.now(timezone.utc)
+        # A snapshot must record what providers publish now, not a cached copy.
+        self.data_fetcher.revalidate_disclosures(ticker)
         holdings = self._normalize_holdings(
             self.data_fetcher.get_institutional_holdings(ticker)
         )
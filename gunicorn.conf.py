@@ -0,0 +1,35 @@
+"""
+SmartMoneyTracker gunicorn 生产配置
+
+用法:
+    gunicorn -c gunicorn.conf.py
+
+preload_app 模式下 master 进程导入 app、构建扫描器并完成预热
+(基准行情缓存、指标引擎、证券名称表、回测依赖)，worker 通过 fork
+共享这些已导入的模块和内存缓存，不会以冷启动状态接收请求。
+
+注意：后台任务 (/api/jobs/*) 保存在各 worker 进程内存中。
+WEB_WORKERS > 1 时需在负载均衡层启用会话保持；
+SSE 流式批量扫描 (/api/batch/stream) 与同步接口不受影响。
+"""
+
+import os
+
+wsgi_app = 'app:create_app()'
+bind = os.getenv('WEB_BIND', '0.0.0.0:8001')
+
+# gthread: 每个 worker 多线程处理请求，SSE 长连接不会独占 worker
+worker_class = 'gthread'
+workers = max(1, int(os.getenv('WEB_WORKERS', '1')))
+threads = max(1, int(os.getenv('WEB_THREADS', '8')))
+
+preload_app = os.getenv('WEB_PRELOAD', 'true').strip().lower() in {'1', 'true', 'yes', 'on'}
+
+# 批量扫描/回测可能持续较长时间
+timeout = int(os.getenv('WEB_TIMEOUT', '120'))
+graceful_timeout = int(os.getenv('WEB_GRACEFUL_TIMEOUT', '30'))
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('WEB_LOG_LEVEL', 'info')
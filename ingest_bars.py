@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Append the day's A-share cross-section to the local bar store."""
+
+import argparse
+from datetime import datetime
+
+import config
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingest daily A-share bars by trade date")
+    parser.add_argument(
+        "tickers",
+        nargs="*",
+        help="Tickers to backfill; defaults to the A-shares in STOCK_POOL",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Backfill every ticker quoted on the latest ingested date",
+    )
+    parser.add_argument(
+        "--date",
+        default=datetime.now().strftime("%Y%m%d"),
+        help="Last trade date to ingest (YYYYMMDD)",
+    )
+    parser.add_argument(
+        "--backfill-days",
+        type=int,
+        default=config.BAR_STORE_BACKFILL_DAYS,
+        help="Calendar days of history fetched for a ticker new to the store",
+    )
+    args = parser.parse_args()
+
+    from data_fetcher.bar_store import DailyBarStore
+    from data_fetcher.ingest import DailyBarIngestor
+    from data_fetcher.manager import DataFetcher
+
+    fetcher = DataFetcher(config)
+    store = DailyBarStore.from_config(config)
+    ingestor = DailyBarIngestor(fetcher, store)
+
+    tickers = [ticker.upper() for ticker in args.tickers] or [
+        ticker for ticker in config.STOCK_POOL
+        if fetcher._detect_market(ticker) == "A_STOCK"
+    ]
+    result = ingestor.run(tickers, args.date, max(1, args.backfill_days), all_tickers=args.all)
+    for day, count in result["ingested"].items():
+        print(f"{day}: {count} bars")
+    for ticker, count in result["backfilled"].items():
+        print(f"{ticker}: backfilled {count} bars")
+
+    stats = store.stats()
+    latest = store.latest_ingest("A_STOCK")
+    print(
+        f"store: {stats['bars']} bars, {stats['tickers']} tickers, "
+        f"{stats['backfilled']} backfilled, latest {latest or '-'}"
+    )
+    if latest is None:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
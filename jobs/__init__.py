@@ -0,0 +1,9 @@
+"""Background jobs for long-running web requests."""
+
+from .queue import Job, JobQueue, JobQueueFull
+
+__all__ = [
+    "Job",
+    "JobQueue",
+    "JobQueueFull",
+]
@@ -0,0 +1,181 @@
+"""Bounded background job queue for long-running web requests."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TERMINAL_STATUSES = frozenset({SUCCEEDED, FAILED, CANCELLED})
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when every worker is busy and the pending queue is at capacity."""
+
+
+@dataclass
+class Job:
+    """Progress, partial results and final outcome of one background task."""
+
+    id: str
+    kind: str
+    total: int = 0
+    status: str = QUEUED
+    completed: int = 0
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    items: list = field(default_factory=list)
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def report(self, item: Any, completed: int, total: Optional[int] = None) -> None:
+        """Append one partial result and advance the progress counter."""
+        with self._lock:
+            if item is not None:
+                self.items.append(item)
+            self.completed = completed
+            if total is not None:
+                self.total = total
+
+    def partial_results(self, offset: int = 0) -> list:
+        with self._lock:
+            return list(self.items[max(offset, 0):])
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            completed, total, available = self.completed, self.total, len(self.items)
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": {
+                "completed": completed,
+                "total": total,
+                "ratio": completed / total if total else (1.0 if self.done else 0.0),
+            },
+            "available_results": available,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+    def _finish(self, status: str, error: Optional[str] = None) -> None:
+        self.status = status
+        self.error = error
+        self.finished_at = time.time()
+
+
+class JobQueue:
+    """Run jobs on a fixed worker pool and keep recent outcomes for polling."""
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 8,
+        history_limit: int = 100,
+    ) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = max(0, int(max_pending))
+        self.history_limit = max(1, int(history_limit))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="smartmoney-job",
+        )
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, app_config: Any) -> "JobQueue":
+        return cls(
+            max_workers=getattr(app_config, "JOB_MAX_WORKERS", 2),
+            max_pending=getattr(app_config, "JOB_QUEUE_LIMIT", 8),
+            history_limit=getattr(app_config, "JOB_HISTORY_LIMIT", 100),
+        )
+
+    def submit(
+        self,
+        kind: str,
+        target: Callable[[Job], Any],
+        total: int = 0,
+    ) -> Job:
+        """Queue ``target(job)``; its return value becomes ``job.result``."""
+        with self._lock:
+            active = sum(not job.done for job in self._jobs.values())
+            if active >= self.max_workers + self.max_pending:
+                raise JobQueueFull(
+                    f"Job queue is full ({active} active jobs); retry later"
+                )
+            job = Job(id=uuid.uuid4().hex, kind=kind, total=total)
+            self._jobs[job.id] = job
+            self._trim()
+            job._future = self._executor.submit(self._run, job, target)
+        logger.info("Queued %s job %s (total=%s)", kind, job.id, total)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Request cancellation; queued jobs stop at once, running ones cooperatively."""
+        job = self.get(job_id)
+        if job is None or job.done:
+            return job
+        job.cancel_event.set()
+        if job._future is not None and job._future.cancel():
+            job._finish(CANCELLED)
+        logger.info("Cancellation requested for %s job %s", job.kind, job.id)
+        return job
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel_event.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: Job, target: Callable[[Job], Any]) -> None:
+        if job.cancelled:
+            job._finish(CANCELLED)
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = target(job)
+        except Exception as error:
+            logger.error("%s job %s failed: %s", job.kind, job.id, error, exc_info=True)
+            job._finish(FAILED, str(error))
+            return
+        job._finish(CANCELLED if job.cancelled else SUCCEEDED)
+        logger.info("%s job %s finished: %s", job.kind, job.id, job.status)
+
+    def _trim(self) -> None:
+        """Drop the oldest finished jobs beyond the history limit."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(self._jobs) - self.history_limit)]:
+            del self._jobs[job_id]
@@ -8,19 +8,23 @@ SmartMoneyTracker 主程序 (Bidirectional Analysis)
 """
 
 import config
+from data_fetcher.cache import MemoryTTLCache
 from data_fetcher.manager import DataFetcher
 from analysis.price_volume_signals import analyze_price_volume
 from analysis.indicator_signals import analyze_indicators
 from analysis.disclosure_signals import analyze_structural
 from analysis.relative_strength import analyze_relative_strength
-from aggregator.scorer import SignalAggregator
+from analysis.signal_plan import SignalPlan, compile_signal_plan
 from reporting.generator import ReportGenerator
 
+import hashlib
+import itertools
+import json
 import logging
 import threading
-import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, Any, List, Optional
+from functools import partial
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
 
 # 配置日志
@@ -44,15 +48,22 @@ class SmartMoneyScanner:
         logger.info("初始化 SmartMoneyTracker (双向分析系统)...")
 
         self.data_fetcher = DataFetcher(config)
-        self.signal_aggregator = SignalAggregator(config)
+        # 信号计划只编译一次：分析器、评分聚合器与所需指标集合在扫描间复用
+        self.signal_plan = SignalPlan(config)
+        self.signal_aggregator = self.signal_plan.aggregator
         self.report_generator = ReportGenerator(config)
         self.batch_max_workers = getattr(config, 'BATCH_MAX_WORKERS', 3)
-        self.batch_rate_limits = getattr(config, 'BATCH_RATE_LIMIT_SECONDS', {})
-        self._batch_lane_locks = {
-            market: threading.Lock()
-            for market in ('A_STOCK', 'US_STOCK', 'HK_STOCK')
-        }
-        self._batch_lane_started_at = {}
+        # 数据源请求的并发上限与按市场限速由 data_fetcher.scheduler 统一调度，
+        # 每次批量扫描作为一个调用方参与公平排队
+        self._batch_ids = itertools.count(1)
+        self.result_cache = (
+            MemoryTTLCache(
+                max_entries=getattr(config, 'RESULT_CACHE_MAX_ENTRIES', 256),
+                ttl_seconds=getattr(config, 'RESULT_CACHE_TTL_SECONDS', 300),
+            )
+            if getattr(config, 'RESULT_CACHE_ENABLED', True)
+            else None
+        )
 
         logger.info("✅ SmartMoneyTracker 初始化完成 (评分范围: -10 to +10)")
 
@@ -60,7 +71,11 @@ class SmartMoneyScanner:
         self,
         ticker: str,
         period: int = 250,
-        analyze_structure: bool = True
+        analyze_structure: bool = True,
+        use_cache: bool = False,
+        result_cache: Optional[Any] = None,
+        data: Optional[Any] = None,
+        keep_data: bool = True
     ) -> Dict[str, Any]:
         """
         扫描单个股票
@@ -69,6 +84,14 @@ class SmartMoneyScanner:
             ticker: 股票代码
             period: 数据回看天数
             analyze_structure: 是否分析结构性信号（需要额外API调用）
+            use_cache: 是否复用结果缓存。缓存键包含最新K线日期、K线指纹和评分参数指纹，
+                行情更新或权重变化后自动重新计算
+            result_cache: 替代 self.result_cache 的结果缓存 (需提供 get/set)，
+                传入即启用缓存，如监控的持久化指纹表
+            data: 已准备好的日线数据 (如盘中快照合成的临时K线)，传入时不再请求行情
+            keep_data: 是否在结果中保留含全部指标的 DataFrame ('data')。
+                为 False 时结果只含评分、信号和 data_info 摘要，需要时可用
+                load_frame 重新获取
 
         Returns:
             分析结果字典
@@ -80,15 +103,14 @@ class SmartMoneyScanner:
         try:
             # 1. 获取日线数据
             logger.info("步骤 1/5: 获取日线数据...")
-            df = self.data_fetcher.get_daily_data(ticker, period=period)
+            if data is not None:
+                df = data
+            else:
+                df = self.data_fetcher.get_daily_data(ticker, period=period)
 
             if df.empty:
                 logger.error(f"无法获取 {ticker} 的数据")
-                return {
-                    'ticker': ticker,
-                    'success': False,
-                    'error': '无法获取数据'
-                }
+                return self._unavailable_result(ticker)
 
             # 打印数据概览并保存数据信息
             first_row = df.iloc[0]
@@ -111,37 +133,74 @@ class SmartMoneyScanner:
                 'last_close': float(last_row['close'])
             }
 
-            # 2. 计算技术指标
+            if result_cache is None and use_cache:
+                result_cache = self.result_cache
+            result_cache_key = None
+            if result_cache is not None:
+                result_cache_key = (
+                    ticker,
+                    period,
+                    bool(analyze_structure),
+                    data_info['last_date'],
+                    self._bar_fingerprint(last_row),
+                    self._analysis_fingerprint(),
+                )
+                cached = result_cache.get(result_cache_key)
+                if cached is not None:
+                    if not keep_data:
+                        cached = self._slim_result(cached)
+                    logger.info(
+                        "使用结果缓存: %s (最新K线 %s)",
+                        ticker,
+                        data_info['last_date'],
+                    )
+                    return cached
+
+            plan = self._current_signal_plan()
+            if len(df) < plan.min_bars:
+                logger.warning(
+                    "%s 只有 %d 条数据，部分信号需要至少 %d 条",
+                    ticker,
+                    len(df),
+                    plan.min_bars,
+                )
+
+            # 2. 计算技术指标 (不保留数据时只计算启用信号需要的指标)
             logger.info("步骤 2/5: 计算技术指标...")
-            df = self.data_fetcher.calculate_technical_indicators(df)
+            df = self.data_fetcher.calculate_technical_indicators(
+                df,
+                indicators=None if keep_data else plan.indicators
+            )
 
             # 3. 分析价量关系信号
             logger.info("步骤 3/5: 分析价量关系...")
-            pv_signals = analyze_price_volume(df, config)
+            pv_signals = analyze_price_volume(df, config, plan.price_volume)
             logger.info(f"  检测到 {len(pv_signals)} 个价量信号")
 
             # 4. 分析技术指标信号
             logger.info("步骤 4/5: 分析技术指标...")
-            indicator_signals = analyze_indicators(df, config)
+            indicator_signals = analyze_indicators(df, config, plan.indicator_signals)
             logger.info(f"  检测到 {len(indicator_signals)} 个指标信号")
 
-            # 5. 分析相对强弱（需要基准数据）
+            # 5. 分析相对强弱（需要基准数据，无计分信号时不请求基准）
             logger.info("步骤 5/5: 分析相对强弱...")
             relative_signals = {}
 
             # 获取基准指数数据
             market_code = self._get_market_code(ticker)
-            if market_code in config.MARKET_BENCHMARKS:
+            if plan.uses('relative_strength') and market_code in config.MARKET_BENCHMARKS:
                 benchmark_ticker = config.MARKET_BENCHMARKS[market_code]
                 benchmark_df = self.data_fetcher.get_daily_data(benchmark_ticker, period=period)
 
                 if not benchmark_df.empty:
-                    relative_signals = analyze_relative_strength(df, benchmark_df, config)
+                    relative_signals = analyze_relative_strength(
+                        df, benchmark_df, config, plan.relative_strength
+                    )
                     logger.info(f"  检测到 {len(relative_signals)} 个相对强弱信号")
 
             # 6. 分析结构性信号（可选）
             structural_signals = {}
-            if analyze_structure:
+            if analyze_structure and plan.uses('structural'):
                 logger.info("分析结构性信号...")
                 structural_signals = analyze_structural(ticker, config, self.data_fetcher)
                 logger.info(f"检测到 {len(structural_signals)} 个结构性信号")
@@ -155,7 +214,7 @@ class SmartMoneyScanner:
                 **structural_signals
             }
 
-            score_result = self.signal_aggregator.calculate_score(all_signals)
+            score_result = plan.aggregator.calculate_score(all_signals)
             
             # 添加数据信息到结果中
             score_result['data_info'] = data_info
@@ -163,10 +222,10 @@ class SmartMoneyScanner:
             # 8. 生成建议
             rating = score_result['rating']
             score = score_result['score']
-            recommendation = self.signal_aggregator.get_recommendation(rating, score)
+            recommendation = plan.aggregator.get_recommendation(rating, score)
 
-            # 9. 生成报告
-            report = self.report_generator.generate_report(
+            # 9. 报告延迟渲染：批量扫描与监控不读取报告，不再拼接文本
+            report = self.report_generator.lazy_report(
                 ticker,
                 score_result,
                 recommendation
@@ -181,7 +240,7 @@ class SmartMoneyScanner:
             logger.info(f"🎯 综合评级: {rating} {rating_emoji}")
             logger.info(f"📝 触发信号: {score_result['signal_count']} 个 (进场: {score_result.get('inflow_count', 0)}, 离场: {score_result.get('outflow_count', 0)})")
 
-            return {
+            result = {
                 'ticker': ticker,
                 'success': True,
                 'score': score,
@@ -194,8 +253,14 @@ class SmartMoneyScanner:
                 'triggered_signals': score_result.get('triggered_signals', {}),
                 'recommendation': recommendation,
                 'report': report,
+                'data_info': data_info,
                 'data': df
             }
+            if not keep_data:
+                result = self._slim_result(result)
+            if result_cache_key is not None:
+                result_cache.set(result_cache_key, result)
+            return result
 
         except Exception as e:
             logger.error(f"分析 {ticker} 时发生错误: {e}", exc_info=True)
@@ -205,12 +270,24 @@ class SmartMoneyScanner:
                 'error': str(e)
             }
 
+    @staticmethod
+    def normalize_tickers(tickers: List[str]) -> List[str]:
+        """去重并标准化股票代码 (去空白、转大写、丢弃空值)，保留输入顺序"""
+        return list(dict.fromkeys(
+            ticker.strip().upper() for ticker in tickers if ticker.strip()
+        ))
+
     def scan_batch(
         self,
         tickers: List[str],
         period: int = 250,
         analyze_structure: bool = False,
         max_workers: Optional[int] = None,
+        on_result: Optional[Callable[[str, Dict[str, Any], int, int], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        result_cache: Optional[Any] = None,
+        keep_data: bool = False,
+        priority: str = 'batch',
     ) -> Dict[str, Dict[str, Any]]:
         """
         批量扫描多只股票
@@ -219,11 +296,74 @@ class SmartMoneyScanner:
             tickers: 股票代码列表
             period: 数据回看天数
             analyze_structure: 是否分析结构性信号
+            on_result: 每完成一只股票时回调 (ticker, result, 已完成数, 总数)
+            cancel_event: 置位后不再启动排队中的股票，已在运行的股票执行完毕
+            result_cache: 结果缓存，K线未更新的股票直接复用上次结果 (见 scan_stock)
+            keep_data: 是否保留每只股票的指标 DataFrame。默认丢弃，
+                批量结果的内存只随信号数量增长，不随K线数×指标数增长
+            priority: 数据源请求的优先级 ('batch' 或 'background')，
+                单只股票的交互式分析始终优先
 
         Returns:
-            字典，键为股票代码，值为分析结果
+            字典，键为股票代码，值为分析结果；取消时只包含已完成的股票
         """
-        unique_tickers = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers))
+        unique_tickers = self.normalize_tickers(tickers)
+        completed = {}
+        for progress, (ticker, result) in enumerate(
+            self.iter_batch(
+                unique_tickers,
+                period=period,
+                analyze_structure=analyze_structure,
+                max_workers=max_workers,
+                cancel_event=cancel_event,
+                result_cache=result_cache,
+                keep_data=keep_data,
+                priority=priority,
+            ),
+            1,
+        ):
+            completed[ticker] = result
+            if on_result is not None:
+                on_result(ticker, result, progress, len(unique_tickers))
+
+        return {
+            ticker: completed[ticker]
+            for ticker in unique_tickers
+            if ticker in completed
+        }
+
+    def iter_batch(
+        self,
+        tickers: List[str],
+        period: int = 250,
+        analyze_structure: bool = False,
+        max_workers: Optional[int] = None,
+        cancel_event: Optional[threading.Event] = None,
+        result_cache: Optional[Any] = None,
+        keep_data: bool = False,
+        priority: str = 'batch',
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        批量扫描多只股票，按完成顺序逐个产出结果
+
+        与 scan_batch 使用相同的并发和限速策略，但不在内存中保留全部结果。
+        调用方提前停止迭代 (break/close) 或置位 cancel_event 时，排队中的
+        股票会被取消，已在运行的股票执行完毕后生成器返回。
+
+        Args:
+            tickers: 股票代码列表
+            period: 数据回看天数
+            analyze_structure: 是否分析结构性信号
+            max_workers: 最大并发数
+            cancel_event: 置位后不再启动排队中的股票
+            result_cache: 结果缓存，K线未更新的股票直接复用上次结果
+            keep_data: 是否保留每只股票的指标 DataFrame (默认丢弃)
+            priority: 数据源请求的优先级 ('batch' 或 'background')
+
+        Yields:
+            (股票代码, 分析结果)
+        """
+        unique_tickers = self.normalize_tickers(tickers)
         workers = max(1, min(max_workers or self.batch_max_workers, len(unique_tickers)))
         logger.info(
             "开始批量扫描 %s 只股票 (并发=%s)...",
@@ -231,58 +371,299 @@ class SmartMoneyScanner:
             workers,
         )
         if not unique_tickers:
-            return {}
+            return
 
-        completed = {}
-        with ThreadPoolExecutor(
+        caller = f"{priority}-{next(self._batch_ids)}"
+        executor = ThreadPoolExecutor(
             max_workers=workers,
             thread_name_prefix='smartmoney-scan',
-        ) as executor:
+        )
+        try:
             future_to_ticker = {
                 executor.submit(
                     self._scan_batch_item,
                     ticker,
                     period,
                     analyze_structure,
+                    result_cache,
+                    keep_data,
+                    priority,
+                    caller,
                 ): ticker
                 for ticker in unique_tickers
             }
             for progress, future in enumerate(as_completed(future_to_ticker), 1):
                 ticker = future_to_ticker[future]
                 try:
-                    completed[ticker] = future.result()
+                    result = future.result()
                 except Exception as e:
                     logger.error("批量分析 %s 失败: %s", ticker, e, exc_info=True)
-                    completed[ticker] = {
+                    result = {
                         'ticker': ticker,
                         'success': False,
                         'error': str(e),
                     }
                 logger.info("批量进度: %s/%s", progress, len(unique_tickers))
+                yield ticker, result
+                if cancel_event is not None and cancel_event.is_set():
+                    logger.info(
+                        "批量扫描已取消: 完成 %s/%s",
+                        progress,
+                        len(unique_tickers),
+                    )
+                    return
+            logger.info("批量扫描完成！")
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def warm_up(
+        self,
+        period: int = 250,
+        tickers: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        预热基准行情缓存、指标引擎与股票名称 (Web 服务启动时调用)
+
+        单项失败只记录日志，不影响服务启动。
+
+        Args:
+            period: 预热的基准数据周期，应与前端默认分析周期一致
+            tickers: 需要预取名称的股票列表，默认 config.STOCK_POOL
+
+        Returns:
+            预热摘要 {'benchmarks': {代码: 行数}, 'names': 已解析名称数, 'errors': [...]}
+        """
+        summary: Dict[str, Any] = {'benchmarks': {}, 'names': 0, 'errors': []}
+        indicators_ready = False
+
+        for benchmark in dict.fromkeys(config.MARKET_BENCHMARKS.values()):
+            try:
+                df = self.data_fetcher.get_daily_data(benchmark, period=period)
+                summary['benchmarks'][benchmark] = len(df)
+                if not df.empty and not indicators_ready:
+                    self.data_fetcher.calculate_technical_indicators(df)
+                    indicators_ready = True
+            except Exception as e:
+                logger.warning(f"预热基准 {benchmark} 失败: {e}")
+                summary['errors'].append(f"{benchmark}: {e}")
+
+        for ticker in self.normalize_tickers(
+            config.STOCK_POOL if tickers is None else tickers
+        ):
+            if self.data_fetcher.get_stock_name(ticker) != ticker:
+                summary['names'] += 1
+
+        logger.info(
+            "预热完成: 基准 %d 个, 股票名称 %d 个",
+            len(summary['benchmarks']),
+            summary['names'],
+        )
+        return summary
+
+    def prefetch(
+        self,
+        tickers: Optional[List[str]] = None,
+        period: int = 250,
+        bars: bool = True,
+        disclosures: bool = True,
+        names: bool = True,
+        max_workers: Optional[int] = None,
+        priority: str = 'background',
+    ) -> Dict[str, Any]:
+        """
+        预取股票池的日线、基准行情、股票名称与披露数据 (缓存预热)
+
+        数据源请求经抓取调度排队并按市场限速，以 priority 优先级运行，不影响交互式分析。
+        日线与披露数据写入持久化缓存，定时扫描与 Web 服务可直接复用；股票名称只缓存在
+        本进程内。单项失败只记录日志。
+
+        Args:
+            tickers: 股票代码列表，默认 config.STOCK_POOL
+            period: 日线回看天数，应与随后扫描使用的周期一致
+            bars: 是否预取个股及其基准的日线
+            disclosures: 是否预取结构性信号使用的机构持股与股东户数 (披露数据缓存关闭时跳过)
+            names: 是否解析股票名称
+            max_workers: 最大并发数，默认 BATCH_MAX_WORKERS
+            priority: 数据源请求的优先级
+
+        Returns:
+            预取摘要 {'benchmarks': {代码: 行数}, 'bars': 有数据的股票数,
+            'disclosures': 有数据的数据集数, 'names': 已解析名称数, 'errors': [...]}
+        """
+        unique_tickers = self.normalize_tickers(
+            config.STOCK_POOL if tickers is None else tickers
+        )
+        fetcher = self.data_fetcher
+        tasks: List[Tuple[str, str, Callable[[], Any]]] = []
+        if bars:
+            benchmarks = dict.fromkeys(
+                config.MARKET_BENCHMARKS[code]
+                for code in map(self._get_market_code, unique_tickers)
+                if code in config.MARKET_BENCHMARKS
+            )
+            tasks.extend(
+                ('benchmarks', benchmark, partial(fetcher.get_daily_data, benchmark, period=period))
+                for benchmark in benchmarks
+            )
+            tasks.extend(
+                ('bars', ticker, partial(fetcher.get_daily_data, ticker, period=period))
+                for ticker in unique_tickers
+            )
+        if disclosures and fetcher.disclosure_cache is not None:
+            for ticker in unique_tickers:
+                tasks.append(('disclosures', ticker, partial(fetcher.get_institutional_holdings, ticker)))
+                tasks.append(('disclosures', ticker, partial(fetcher.get_shareholder_count, ticker)))
+        if names:
+            tasks.extend(
+                ('names', ticker, partial(self._prefetch_name, ticker))
+                for ticker in unique_tickers
+                if ticker not in fetcher._stock_name_cache
+            )
+
+        summary: Dict[str, Any] = {
+            'benchmarks': {}, 'bars': 0, 'disclosures': 0, 'names': 0, 'errors': []
+        }
+        if not tasks:
+            return summary
+        caller = f"prefetch-{next(self._batch_ids)}"
+
+        def run(task: Tuple[str, str, Callable[[], Any]]) -> Tuple[str, str, Any]:
+            kind, ticker, fetch = task
+            with fetcher.scheduler.context(priority, caller):
+                return kind, ticker, fetch()
+
+        workers = max(1, min(max_workers or self.batch_max_workers, len(tasks)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='smartmoney-prefetch') as executor:
+            futures = {executor.submit(run, task): task for task in tasks}
+            for future in as_completed(futures):
+                kind, ticker, _ = futures[future]
+                try:
+                    _, _, value = future.result()
+                except Exception as e:
+                    logger.warning("预取 %s %s 失败: %s", ticker, kind, e)
+                    summary['errors'].append(f"{ticker} {kind}: {e}")
+                    continue
+                if kind == 'benchmarks':
+                    summary['benchmarks'][ticker] = len(value)
+                elif kind == 'names':
+                    summary['names'] += int(value != ticker)
+                elif not value.empty:
+                    summary[kind] += 1
+
+        logger.info(
+            "预取完成: %d 只股票, 日线 %d 个, 基准 %d 个, 披露数据 %d 个, 股票名称 %d 个, 失败 %d 项",
+            len(unique_tickers),
+            summary['bars'],
+            len(summary['benchmarks']),
+            summary['disclosures'],
+            summary['names'],
+            len(summary['errors']),
+        )
+        return summary
 
-        logger.info("批量扫描完成！")
-        return {ticker: completed[ticker] for ticker in unique_tickers}
+    def _prefetch_name(self, ticker: str) -> str:
+        """解析股票名称，名称接口同样占用抓取调度额度"""
+        with self.data_fetcher.scheduler.slot(self.data_fetcher._detect_market(ticker)):
+            return self.data_fetcher.get_stock_name(ticker)
 
     def _scan_batch_item(
         self,
         ticker: str,
         period: int,
         analyze_structure: bool,
+        result_cache: Optional[Any] = None,
+        keep_data: bool = False,
+        priority: str = 'batch',
+        caller: Optional[str] = None,
     ) -> Dict[str, Any]:
-        self._wait_for_batch_slot(self.data_fetcher._detect_market(ticker))
-        return self.scan_stock(ticker, period, analyze_structure)
-
-    def _wait_for_batch_slot(self, market: str) -> None:
-        """Space task starts independently for each market/provider lane."""
-        interval = float(self.batch_rate_limits.get(market, 0.0))
-        lock = self._batch_lane_locks.setdefault(market, threading.Lock())
-        with lock:
-            previous = self._batch_lane_started_at.get(market)
-            if previous is not None and interval > 0:
-                remaining = interval - (time.monotonic() - previous)
-                if remaining > 0:
-                    time.sleep(remaining)
-            self._batch_lane_started_at[market] = time.monotonic()
+        if self.data_fetcher.unavailable_reason(ticker) is not None:
+            return self._unavailable_result(ticker)
+        # 只有实际请求数据源时才占用调度额度，缓存命中不排队
+        with self.data_fetcher.scheduler.context(priority, caller):
+            result = self.scan_stock(
+                ticker,
+                period,
+                analyze_structure,
+                result_cache=result_cache,
+                keep_data=keep_data,
+            )
+        # 在工作线程内丢弃 DataFrame，已完成但未被消费的结果也不占用大块内存
+        return result if keep_data else self._slim_result(result)
+
+    def load_frame(self, ticker: str, period: int = 250) -> Any:
+        """
+        重新获取股票的日线数据与技术指标 (对应 keep_data=False 结果中省略的 'data')
+
+        行情来自数据层缓存，通常不会重新请求数据源。
+
+        Args:
+            ticker: 股票代码
+            period: 数据回看天数
+
+        Returns:
+            含全部技术指标的 DataFrame；无数据时为空 DataFrame
+        """
+        df = self.data_fetcher.get_daily_data(ticker, period=period)
+        if df.empty:
+            return df
+        return self.data_fetcher.calculate_technical_indicators(df)
+
+    @staticmethod
+    def _slim_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """去掉结果中的指标 DataFrame，保留评分、信号与 data_info 摘要"""
+        if 'data' not in result:
+            return result
+        return {key: value for key, value in result.items() if key != 'data'}
+
+    def _unavailable_result(self, ticker: str) -> Dict[str, Any]:
+        """无法获取行情时的结果，附带无数据缓存记录的原因"""
+        result = {
+            'ticker': ticker,
+            'success': False,
+            'error': '无法获取数据'
+        }
+        reason = self.data_fetcher.unavailable_reason(ticker)
+        if reason is not None:
+            result['reason'] = reason
+        return result
+
+    @staticmethod
+    def _bar_fingerprint(bar: Any) -> str:
+        """最新K线 OHLCV 的指纹，数据源修订同一日期的K线时缓存随之失效"""
+        values = '|'.join(
+            f"{float(bar[column]):.6f}" if column in bar else ''
+            for column in ('open', 'high', 'low', 'close', 'volume')
+        )
+        return hashlib.sha256(values.encode('utf-8')).hexdigest()[:16]
+
+    def _current_signal_plan(self) -> SignalPlan:
+        """返回与当前配置一致的信号计划，评分参数变化后重新编译"""
+        plan = compile_signal_plan(config, self.signal_plan)
+        if plan is not self.signal_plan:
+            logger.info("评分配置已变化，重新编译信号计划")
+            self.signal_plan = plan
+            self.signal_aggregator = plan.aggregator
+        return plan
+
+    @staticmethod
+    def _analysis_fingerprint() -> str:
+        """评分相关配置的指纹，配置变化时结果缓存自然失效"""
+        settings = {
+            name: getattr(config, name, None)
+            for name in (
+                'SIGNAL_WEIGHTS',
+                'SCORE_TO_RATING',
+                'PV_PARAMS',
+                'INDICATOR_PARAMS',
+                'STRUCTURAL_PARAMS',
+                'RELATIVE_STRENGTH_PARAMS',
+                'MARKET_BENCHMARKS',
+                'QUANT_ENGINE',
+                'AKQUANT_TALIB_BACKEND',
+            )
+        }
+        encoded = json.dumps(settings, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()[:16]
 
     @staticmethod
     def _get_market_code(ticker: str) -> str:
@@ -369,7 +750,7 @@ def main():
         )
 
         if result['success']:
-            print("\n" + result['report'])
+            print("\n" + str(result['report']))
         else:
             print(f"\n扫描失败: {result.get('error', '未知错误')}")
 
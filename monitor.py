@@ -5,7 +5,7 @@ import argparse
 
 import config
 from main import SmartMoneyScanner
-from monitoring import EndOfDayMonitor
+from monitoring import EndOfDayMonitor, IntradayMonitor
 
 
 def main() -> None:
@@ -17,12 +17,21 @@ def main() -> None:
         choices=("A_STOCK", "HK_STOCK", "US_STOCK"),
         help="Limit an immediate run to one or more markets",
     )
+    parser.add_argument(
+        "--intraday",
+        action="store_true",
+        help="Poll market-wide spot snapshots during trading sessions",
+    )
     args = parser.parse_args()
-    monitor = EndOfDayMonitor(SmartMoneyScanner(), config)
-    if args.once:
-        monitor.run_once(args.market)
-    else:
-        monitor.serve_forever()
+    monitor_class = IntradayMonitor if args.intraday else EndOfDayMonitor
+    monitor = monitor_class(SmartMoneyScanner(), config)
+    try:
+        if args.once:
+            monitor.run_once(args.market)
+        else:
+            monitor.serve_forever()
+    finally:
+        monitor.close()
 
 
 if __name__ == "__main__":
@@ -1,11 +1,14 @@
 """Scheduled scanning and alert delivery."""
 
-from .monitor import EndOfDayMonitor, MonitorState
+from .intraday import IntradayMonitor
+from .monitor import EndOfDayMonitor
 from .notifiers import ConsoleNotifier, JsonlNotifier, NotificationRouter, WebhookNotifier
+from .state import MonitorState
 
 __all__ = [
     "ConsoleNotifier",
     "EndOfDayMonitor",
+    "IntradayMonitor",
     "JsonlNotifier",
     "MonitorState",
     "NotificationRouter",
@@ -0,0 +1,292 @@
+"""Intraday polling on market-wide spot snapshots with rating-transition alerts."""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, time as clock, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from .monitor import EndOfDayMonitor
+
+logger = logging.getLogger(__name__)
+
+
+class IntradayMonitor(EndOfDayMonitor):
+    """Rescore the stock pool from one bulk spot request per market and poll.
+
+    Daily history is loaded once per ticker and session. Each poll then
+    replaces only the provisional bar for the current session with the
+    latest snapshot quote and rescores the whole frame with ``scan_stock``.
+    With ``MONITOR_DELTA_RESCAN``, a ticker whose quote has not changed since
+    the previous poll keeps its last result. The rest are rescored on
+    ``BATCH_MAX_WORKERS`` threads. The first rating seen in a session is the
+    baseline, and an alert fires when a ticker moves into one of the alert
+    ratings. Pool indexing, notifier and state are shared with
+    ``EndOfDayMonitor``.
+    """
+
+    def __init__(
+        self,
+        scanner: Any,
+        app_config: Any,
+        notifier: Optional[Any] = None,
+        state: Optional[Any] = None,
+    ) -> None:
+        super().__init__(scanner, app_config, notifier=notifier, state=state)
+        self.sessions = {
+            market: self._parse_sessions(spec)
+            for market, spec in dict(
+                getattr(app_config, "MONITOR_INTRADAY_SESSIONS", {})
+            ).items()
+        }
+        self.poll_seconds = max(
+            5.0, float(getattr(app_config, "MONITOR_INTRADAY_POLL_SECONDS", 60))
+        )
+        self.period = int(getattr(app_config, "MONITOR_PERIOD", 250))
+        self.max_workers = max(1, int(getattr(app_config, "BATCH_MAX_WORKERS", 3)))
+        self._session_dates: Dict[str, date] = {}
+        self._history: Dict[str, pd.DataFrame] = {}
+        self._ratings: Dict[str, str] = {}
+        # Last quote and result per ticker, for skipping unchanged quotes.
+        self._quotes: Dict[str, Tuple[Any, ...]] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+
+    def session_date(self, market: str, now: Optional[datetime] = None) -> Optional[date]:
+        """Trading date of the session open at ``now``, or None outside sessions."""
+        current = now or datetime.now(self.timezone)
+        moment = current.time()
+        for start, end in self.sessions.get(market, ()):
+            if start <= end:
+                if start <= moment < end and current.weekday() < 5:
+                    return current.date()
+            elif moment >= start and current.weekday() < 5:
+                return current.date()
+            elif moment < end and (current.weekday() - 1) % 7 < 5:
+                # Session opened the previous evening (US hours in Asian time zones).
+                return current.date() - timedelta(days=1)
+        return None
+
+    def poll_market(
+        self,
+        market: str,
+        now: Optional[datetime] = None,
+        session: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        current = now or datetime.now(self.timezone)
+        session = session or self.session_date(market, current) or current.date()
+        self._start_session(market, session)
+
+        tickers = self._market_tickers(market)
+        if not tickers:
+            return {}
+        started = time.monotonic()
+        snapshot = self.scanner.data_fetcher.get_spot_snapshot(market)
+        if snapshot.empty:
+            logger.warning("%s spot snapshot is empty; skipping poll", market)
+            return {}
+        quotes = snapshot.set_index("ticker")
+
+        results: Dict[str, Any] = {}
+        changed: Dict[str, pd.Series] = {}
+        for ticker in tickers:
+            if ticker not in quotes.index:
+                continue
+            quote = quotes.loc[ticker]
+            fingerprint = self._quote_fingerprint(quote)
+            previous = self._results.get(ticker)
+            if (
+                self.delta_rescan
+                and previous is not None
+                and self._quotes.get(ticker) == fingerprint
+            ):
+                results[ticker] = {**previous, "reused": True}
+                continue
+            self._quotes[ticker] = fingerprint
+            changed[ticker] = quote
+
+        workers = max(1, min(self.max_workers, len(changed)))
+        with self.state.batch(), ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="intraday-rescore"
+        ) as executor:
+            futures = {
+                executor.submit(self._rescore, ticker, quote, session): ticker
+                for ticker, quote in changed.items()
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    result = future.result()
+                except Exception as error:
+                    logger.error("Intraday rescore of %s failed: %s", ticker, error)
+                    result = None
+                if result is None or not result.get("success"):
+                    # Retry on the next poll even if the quote is unchanged.
+                    self._quotes.pop(ticker, None)
+                if result is None:
+                    continue
+                results[ticker] = result
+                if result.get("success"):
+                    self._results[ticker] = result
+                    self._check_transition(market, ticker, result, session, current)
+        reused = sum(1 for result in results.values() if result.get("reused"))
+        logger.info(
+            "%s intraday poll: %d/%d tickers rescored, %d unchanged, in %.1fs",
+            market,
+            len(results) - reused,
+            len(tickers),
+            reused,
+            time.monotonic() - started,
+        )
+        return results
+
+    def run_once(
+        self,
+        markets: Optional[Iterable[str]] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        return {
+            market: self.poll_market(market, now=now)
+            for market in (markets or self.sessions.keys())
+        }
+
+    def serve_forever(self) -> None:
+        logger.info(
+            "Intraday monitor started (%s, every %.0fs): %s",
+            self.timezone,
+            self.poll_seconds,
+            {market: len(spans) for market, spans in self.sessions.items()},
+        )
+        while True:
+            now = datetime.now(self.timezone)
+            for market in self.sessions:
+                session = self.session_date(market, now)
+                if session is None:
+                    continue
+                try:
+                    self.poll_market(market, now=now, session=session)
+                except Exception as error:
+                    logger.error("Intraday poll for %s failed: %s", market, error, exc_info=True)
+            time.sleep(self.poll_seconds)
+
+    def _start_session(self, market: str, session: date) -> None:
+        """Drop cached history and rating baselines when a new session begins."""
+        if self._session_dates.get(market) == session:
+            return
+        self._session_dates[market] = session
+        for ticker in self._market_tickers(market):
+            self._history.pop(ticker, None)
+            self._ratings.pop(ticker, None)
+            self._quotes.pop(ticker, None)
+            self._results.pop(ticker, None)
+
+    def _rescore(
+        self,
+        ticker: str,
+        quote: pd.Series,
+        session: date,
+    ) -> Optional[Dict[str, Any]]:
+        frame = self._provisional_frame(ticker, quote, session)
+        if frame is None:
+            return None
+        return self.scanner.scan_stock(
+            ticker,
+            self.period,
+            analyze_structure=False,
+            data=frame,
+            keep_data=False,
+        )
+
+    def _provisional_frame(
+        self,
+        ticker: str,
+        quote: pd.Series,
+        session: date,
+    ) -> Optional[pd.DataFrame]:
+        history = self._history.get(ticker)
+        if history is None:
+            history = self.scanner.data_fetcher.get_daily_data(ticker, period=self.period)
+            if history.empty:
+                return None
+            dates = pd.to_datetime(history["date"])
+            if dates.dt.tz is not None:
+                dates = dates.dt.tz_localize(None)
+            # A provider may already carry a partial bar for today; the snapshot replaces it.
+            history = history.assign(date=dates)
+            history = history[history["date"] < pd.Timestamp(session)].reset_index(drop=True)
+            self._history[ticker] = history
+
+        close = float(quote["close"])
+        bar = {
+            "date": pd.Timestamp(session),
+            "open": self._quote_value(quote, "open", close),
+            "high": self._quote_value(quote, "high", close),
+            "low": self._quote_value(quote, "low", close),
+            "close": close,
+            "volume": self._quote_value(quote, "volume", 0.0),
+        }
+        bar["amount"] = self._quote_value(quote, "amount", close * bar["volume"])
+        return pd.concat([history, pd.DataFrame([bar])], ignore_index=True)
+
+    def _check_transition(
+        self,
+        market: str,
+        ticker: str,
+        result: Dict[str, Any],
+        session: date,
+        current: datetime,
+    ) -> None:
+        rating = result.get("rating")
+        previous = self._ratings.get(ticker)
+        self._ratings[ticker] = rating
+        if previous is None or previous == rating or rating not in self.alert_ratings:
+            return
+        alert_key = f"{session.isoformat()}:{ticker}:{rating}:intraday"
+        if self.state.was_alerted(alert_key):
+            return
+        data_info = result.get("data_info") or {}
+        self.notifier.send({
+            "event": "smart_money_intraday_transition",
+            "market": market,
+            "date": session.isoformat(),
+            "timestamp": current.isoformat(),
+            "ticker": ticker,
+            "score": float(result.get("score", 0.0)),
+            "rating": rating,
+            "previous_rating": previous,
+            "price": data_info.get("last_close"),
+            "signal_count": int(result.get("signal_count", 0)),
+            "inflow_count": int(result.get("inflow_count", 0)),
+            "outflow_count": int(result.get("outflow_count", 0)),
+            "provisional": True,
+        })
+        self.state.mark_alerted(alert_key)
+
+    @classmethod
+    def _quote_fingerprint(cls, quote: pd.Series) -> Tuple[Any, ...]:
+        return tuple(
+            cls._quote_value(quote, column, None)
+            for column in ("open", "high", "low", "close", "volume", "amount")
+        )
+
+    @staticmethod
+    def _quote_value(quote: pd.Series, column: str, default: Optional[float]) -> Optional[float]:
+        value = quote.get(column)
+        return default if value is None or pd.isna(value) else float(value)
+
+    @staticmethod
+    def _parse_sessions(spec: str) -> list[tuple[clock, clock]]:
+        """Parse ``"09:30-11:30,13:00-15:00"``; an end before the start wraps midnight."""
+        sessions = []
+        for span in str(spec).split(","):
+            if not span.strip():
+                continue
+            start, end = (
+                clock(*(int(part) for part in value.strip().split(":")))
+                for value in span.split("-", 1)
+            )
+            sessions.append((start, end))
+        return sessions
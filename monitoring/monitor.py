@@ -2,66 +2,20 @@
 
 from __future__ import annotations
 
-import json
 import logging
-import os
-import tempfile
+import threading
 import time
-from datetime import datetime
-from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
 from typing import Any, Dict, Iterable, Optional
 from zoneinfo import ZoneInfo
 
 from .notifiers import NotificationRouter
+from .state import MonitorState
 
 logger = logging.getLogger(__name__)
 
 
-class MonitorState:
-    """Persistent run/alert keys used to suppress duplicate work."""
-
-    def __init__(self, path: str) -> None:
-        self.path = Path(path).expanduser().resolve()
-        self.data = self._load()
-
-    def _load(self) -> Dict[str, Any]:
-        try:
-            return json.loads(self.path.read_text(encoding="utf-8"))
-        except (OSError, ValueError, TypeError):
-            return {"runs": {}, "alerts": []}
-
-    def was_run(self, market: str, date: str) -> bool:
-        return self.data.get("runs", {}).get(market) == date
-
-    def mark_run(self, market: str, date: str) -> None:
-        self.data.setdefault("runs", {})[market] = date
-        self.save()
-
-    def was_alerted(self, key: str) -> bool:
-        return key in self.data.get("alerts", [])
-
-    def mark_alerted(self, key: str) -> None:
-        alerts = self.data.setdefault("alerts", [])
-        alerts.append(key)
-        self.data["alerts"] = alerts[-2000:]
-        self.save()
-
-    def save(self) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        descriptor, temporary_name = tempfile.mkstemp(
-            prefix=f".{self.path.name}-",
-            suffix=".tmp",
-            dir=self.path.parent,
-        )
-        try:
-            with os.fdopen(descriptor, "w", encoding="utf-8") as handle:
-                json.dump(self.data, handle, ensure_ascii=False, indent=2)
-            os.replace(temporary_name, self.path)
-        finally:
-            if os.path.exists(temporary_name):
-                os.unlink(temporary_name)
-
-
 class EndOfDayMonitor:
     """Run configured stock pools after each market closes."""
 
@@ -80,9 +34,18 @@ class EndOfDayMonitor:
             getattr(app_config, "ALERT_RATINGS", ("STRONG_BUY", "STRONG_SELL"))
         )
         self.notifier = notifier or NotificationRouter.from_config(app_config)
-        self.state = state or MonitorState(
-            getattr(app_config, "MONITOR_STATE_PATH", "./cache/monitor_state.json")
+        self.state = state or MonitorState.from_config(app_config)
+        self.delta_rescan = bool(getattr(app_config, "MONITOR_DELTA_RESCAN", True))
+        self.window = timedelta(minutes=float(getattr(app_config, "MONITOR_WINDOW_MINUTES", 120)))
+        self.prefetch_enabled = bool(getattr(app_config, "MONITOR_PREFETCH_ENABLED", False))
+        self.prefetch_lead = timedelta(
+            minutes=float(getattr(app_config, "MONITOR_PREFETCH_LEAD_MINUTES", 30))
         )
+        self.timings: Dict[str, Dict[str, Any]] = {}
+        self._timings_lock = threading.Lock()
+        self._market_index: Optional[Dict[str, list[str]]] = None
+        self._market_index_pool: tuple = ()
+        self._market_index_lock = threading.Lock()
 
     def due_markets(self, now: Optional[datetime] = None) -> list[str]:
         current = now or datetime.now(self.timezone)
@@ -91,14 +54,64 @@ class EndOfDayMonitor:
         due = []
         date_key = current.date().isoformat()
         for market, schedule in self.schedules.items():
-            hour, minute = (int(value) for value in schedule.split(":"))
-            scheduled = current.replace(hour=hour, minute=minute, second=0, microsecond=0)
+            scheduled = self._scheduled_at(current, schedule)
             if current >= scheduled and not self.state.was_run(market, date_key):
                 due.append(market)
         return due
 
+    def due_prefetches(self, now: Optional[datetime] = None) -> list[str]:
+        """Markets inside their prefetch lead whose scan has not started yet."""
+        current = now or datetime.now(self.timezone)
+        if not self.prefetch_enabled or current.weekday() >= 5:
+            return []
+        due = []
+        date_key = current.date().isoformat()
+        for market, schedule in self.schedules.items():
+            scheduled = self._scheduled_at(current, schedule)
+            if (
+                scheduled - self.prefetch_lead <= current < scheduled
+                and not self.state.was_run(self._prefetch_key(market), date_key)
+                and not self.state.was_run(market, date_key)
+            ):
+                due.append(market)
+        return due
+
+    def prefetch_market(self, market: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Warm the persistent caches a market's scheduled scan will read."""
+        current = now or datetime.now(self.timezone)
+        date_key = current.date().isoformat()
+        tickers = self._market_tickers(market)
+        summary: Dict[str, Any] = {}
+        if tickers:
+            schedule = self.schedules.get(market)
+            scheduled = self._scheduled_at(current, schedule) if schedule else current
+            calendar = self.scanner.data_fetcher.trading_calendar(market)
+            # Bars fetched before the scan's session closes are keyed to the previous
+            # session and would not be reused, so only disclosures are warmed then.
+            bars_final = (
+                calendar.last_completed_session(current)
+                == calendar.last_completed_session(scheduled)
+            )
+            summary = self.scanner.prefetch(
+                tickers,
+                period=int(getattr(self.config, "MONITOR_PERIOD", 250)),
+                bars=bars_final,
+                disclosures=bool(getattr(self.config, "MONITOR_ANALYZE_STRUCTURE", False)),
+                names=False,
+                priority="background",
+            )
+        self.state.mark_run(self._prefetch_key(market), date_key)
+        return summary
+
     def run_market(self, market: str, now: Optional[datetime] = None) -> Dict[str, Any]:
         current = now or datetime.now(self.timezone)
+        started = time.monotonic()
+        try:
+            return self._run_market(market, current)
+        finally:
+            self._record_timing(market, current, time.monotonic() - started)
+
+    def _run_market(self, market: str, current: datetime) -> Dict[str, Any]:
         date_key = current.date().isoformat()
         tickers = self._market_tickers(market)
         if not tickers:
@@ -106,34 +119,52 @@ class EndOfDayMonitor:
             self.state.mark_run(market, date_key)
             return {}
 
-        results = self.scanner.scan_batch(
-            tickers,
-            period=int(getattr(self.config, "MONITOR_PERIOD", 250)),
-            analyze_structure=bool(
+        scan_options: Dict[str, Any] = {
+            "period": int(getattr(self.config, "MONITOR_PERIOD", 250)),
+            "analyze_structure": bool(
                 getattr(self.config, "MONITOR_ANALYZE_STRUCTURE", False)
             ),
-        )
-        for ticker, result in results.items():
-            if not result.get("success") or result.get("rating") not in self.alert_ratings:
-                continue
-            alert_key = f"{date_key}:{ticker}:{result['rating']}"
-            if self.state.was_alerted(alert_key):
-                continue
-            payload = {
-                "event": "smart_money_signal",
-                "market": market,
-                "date": date_key,
-                "timestamp": current.isoformat(),
-                "ticker": ticker,
-                "score": float(result.get("score", 0.0)),
-                "rating": result["rating"],
-                "signal_count": int(result.get("signal_count", 0)),
-                "inflow_count": int(result.get("inflow_count", 0)),
-                "outflow_count": int(result.get("outflow_count", 0)),
-            }
-            self.notifier.send(payload)
-            self.state.mark_alerted(alert_key)
-        self.state.mark_run(market, date_key)
+            # Scheduled runs yield provider slots to interactive lookups and web batches.
+            "priority": "background",
+        }
+        if self.delta_rescan:
+            # Tickers whose latest bar is unchanged reuse their stored result.
+            scan_options["result_cache"] = self.state.results
+        results = self.scanner.scan_batch(tickers, **scan_options)
+        reused = sum(1 for result in results.values() if result.get("reused"))
+        if reused:
+            logger.info(
+                "%s: re-analyzed %d tickers, reused %d without new bars",
+                market,
+                len(results) - reused,
+                reused,
+            )
+        # Alert keys, stored results and the run marker are committed together.
+        with self.state.batch():
+            for ticker, result in results.items():
+                if not result.get("success") or result.get("rating") not in self.alert_ratings:
+                    continue
+                if result.get("reused"):
+                    # No new bar since the last run, so there is nothing new to report.
+                    continue
+                alert_key = f"{date_key}:{ticker}:{result['rating']}"
+                if self.state.was_alerted(alert_key):
+                    continue
+                payload = {
+                    "event": "smart_money_signal",
+                    "market": market,
+                    "date": date_key,
+                    "timestamp": current.isoformat(),
+                    "ticker": ticker,
+                    "score": float(result.get("score", 0.0)),
+                    "rating": result["rating"],
+                    "signal_count": int(result.get("signal_count", 0)),
+                    "inflow_count": int(result.get("inflow_count", 0)),
+                    "outflow_count": int(result.get("outflow_count", 0)),
+                }
+                self.notifier.send(payload)
+                self.state.mark_alerted(alert_key)
+            self.state.mark_run(market, date_key)
         return results
 
     def run_once(
@@ -141,10 +172,19 @@ class EndOfDayMonitor:
         markets: Optional[Iterable[str]] = None,
         now: Optional[datetime] = None,
     ) -> Dict[str, Dict[str, Any]]:
-        return {
-            market: self.run_market(market, now=now)
-            for market in (markets or self.schedules.keys())
-        }
+        """Run markets concurrently; fetches share the scanner's budget."""
+        selected = list(markets or self.schedules.keys())
+        if len(selected) <= 1:
+            return {market: self.run_market(market, now=now) for market in selected}
+        with ThreadPoolExecutor(
+            max_workers=len(selected),
+            thread_name_prefix="smartmoney-monitor",
+        ) as executor:
+            futures = {
+                market: executor.submit(self.run_market, market, now)
+                for market in selected
+            }
+            return {market: future.result() for market, future in futures.items()}
 
     def serve_forever(self) -> None:
         poll_seconds = max(5.0, float(getattr(self.config, "MONITOR_POLL_SECONDS", 60)))
@@ -153,17 +193,85 @@ class EndOfDayMonitor:
             self.timezone,
             self.schedules,
         )
-        while True:
-            now = datetime.now(self.timezone)
-            for market in self.due_markets(now):
-                try:
-                    self.run_market(market, now=now)
-                except Exception as error:
-                    logger.error("Scheduled scan for %s failed: %s", market, error, exc_info=True)
-            time.sleep(poll_seconds)
+        running: Dict[str, Future] = {}
+        prefetching: Dict[str, Future] = {}
+        with ThreadPoolExecutor(
+            # A market's prefetch may still be finishing when its scan starts.
+            max_workers=max(1, 2 * len(self.schedules)),
+            thread_name_prefix="smartmoney-monitor",
+        ) as executor:
+            while True:
+                for label, jobs in (("scan", running), ("prefetch", prefetching)):
+                    for market, future in list(jobs.items()):
+                        if not future.done():
+                            continue
+                        del jobs[market]
+                        error = future.exception()
+                        if error is not None:
+                            logger.error(
+                                "Scheduled %s for %s failed: %s", label, market, error, exc_info=error
+                            )
+                now = datetime.now(self.timezone)
+                for market in self.due_prefetches(now):
+                    if market not in prefetching:
+                        prefetching[market] = executor.submit(self.prefetch_market, market, now)
+                for market in self.due_markets(now):
+                    if market not in running:
+                        running[market] = executor.submit(self.run_market, market, now)
+                time.sleep(poll_seconds)
+
+    def close(self) -> None:
+        """Deliver alerts still queued in the notifier before the process exits."""
+        close = getattr(self.notifier, "close", None)
+        if callable(close):
+            close()
+
+    @staticmethod
+    def _scheduled_at(current: datetime, schedule: str) -> datetime:
+        hour, minute = (int(value) for value in schedule.split(":"))
+        return current.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+    @staticmethod
+    def _prefetch_key(market: str) -> str:
+        return f"{market}:prefetch"
 
     def _market_tickers(self, market: str) -> list[str]:
-        return [
-            ticker for ticker in getattr(self.config, "STOCK_POOL", [])
-            if self.scanner.data_fetcher._detect_market(ticker) == market
-        ]
+        pool = tuple(getattr(self.config, "STOCK_POOL", []))
+        # Markets run concurrently; build the index once rather than per thread.
+        with self._market_index_lock:
+            if self._market_index is None or pool != self._market_index_pool:
+                index: Dict[str, list[str]] = {}
+                for ticker in pool:
+                    index.setdefault(
+                        self.scanner.data_fetcher._detect_market(ticker), []
+                    ).append(ticker)
+                self._market_index, self._market_index_pool = index, pool
+            return list(self._market_index.get(market, []))
+
+    def _record_timing(self, market: str, current: datetime, duration: float) -> None:
+        """Keep the last run time per market and flag runs that overran the window."""
+        finished = current + timedelta(seconds=duration)
+        deadline = None
+        schedule = self.schedules.get(market)
+        if schedule:
+            scheduled = self._scheduled_at(current, schedule)
+            # Manual and catch-up runs outside the post-close window are not judged.
+            if scheduled <= current <= scheduled + self.window:
+                deadline = scheduled + self.window
+        within_window = deadline is None or finished <= deadline
+        with self._timings_lock:
+            self.timings[market] = {
+                "started_at": current.isoformat(),
+                "duration_seconds": round(duration, 3),
+                "deadline": deadline.isoformat() if deadline else None,
+                "within_window": within_window,
+            }
+        if within_window:
+            logger.info("%s run finished in %.1fs", market, duration)
+        else:
+            logger.warning(
+                "%s run finished in %.1fs, after its window closed at %s",
+                market,
+                duration,
+                deadline.isoformat(),
+            )
@@ -4,9 +4,13 @@ from __future__ import annotations
 
 import json
 import logging
+import queue
 import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, Iterable, Protocol
+from typing import Any, Dict, Iterable, Optional, Protocol, Sequence
+
+from data_fetcher.transport import HTTPTransport, shared_transport
 
 logger = logging.getLogger(__name__)
 
@@ -39,20 +43,128 @@ class JsonlNotifier:
 
 
 class WebhookNotifier:
-    def __init__(self, url: str, timeout: float = 10.0) -> None:
+    """POST alerts over the shared pooled HTTP transport, retrying transient failures.
+
+    Connection errors are retried only by the transport's adapter
+    (``HTTP_RETRIES``). The loop in ``_post`` retries what the adapter does
+    not retry for a POST: 429/5xx responses and read timeouts. An unreachable
+    webhook therefore gets ``HTTP_RETRIES + 1`` connection attempts per
+    alert, not that many times ``max_retries + 1``.
+
+    With ``batch_size > 1`` alerts are grouped into one envelope
+    ``{"event": "smart_money_signals", "count": n, "alerts": [...]}``;
+    otherwise each alert is posted on its own, as before.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        batch_size: int = 1,
+        transport: Optional[HTTPTransport] = None,
+    ) -> None:
         self.url = url
+        self.transport = transport
         self.timeout = timeout
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_seconds = max(0.0, float(backoff_seconds))
+        self.batch_size = max(1, int(batch_size))
+        self._session = None
+        self._session_lock = threading.Lock()
 
     def send(self, payload: Dict[str, Any]) -> None:
+        self._post(payload)
+
+    def send_batch(self, payloads: Sequence[Dict[str, Any]]) -> None:
+        """Post every alert or chunk; one that still fails after retries is
+        logged and skipped so the rest of the batch is delivered."""
+        if self.batch_size == 1:
+            bodies: list[Any] = list(payloads)
+        else:
+            bodies = []
+            for start in range(0, len(payloads), self.batch_size):
+                chunk = list(payloads[start:start + self.batch_size])
+                bodies.append({"event": "smart_money_signals", "count": len(chunk), "alerts": chunk})
+        for body in bodies:
+            try:
+                self._post(body)
+            except Exception as error:
+                alerts = body.get("alerts", [body])
+                logger.error(
+                    "Webhook delivery failed; dropped %d alert(s) %s: %s",
+                    len(alerts),
+                    ", ".join(str(alert.get("ticker")) for alert in alerts),
+                    error,
+                )
+
+    def close(self) -> None:
+        # The pooled session belongs to the shared transport and stays open.
+        with self._session_lock:
+            self._session = None
+
+    def _post(self, body: Any) -> None:
         import requests
 
-        response = requests.post(self.url, json=payload, timeout=self.timeout)
-        response.raise_for_status()
+        session = self._get_session()
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = session.post(self.url, json=body, timeout=self.timeout)
+                if response.status_code not in self.RETRY_STATUSES:
+                    response.raise_for_status()
+                    return
+                error: Exception = requests.HTTPError(
+                    f"{response.status_code} from webhook", response=response
+                )
+            except requests.ReadTimeout as transient:
+                error = transient
+            if attempt == self.max_retries:
+                raise error
+            delay = self.backoff_seconds * (2 ** attempt)
+            logger.warning(
+                "Webhook delivery failed (%s); retry %d/%d in %.1fs",
+                error,
+                attempt + 1,
+                self.max_retries,
+                delay,
+            )
+            time.sleep(delay)
+
+    def _get_session(self) -> Any:
+        with self._session_lock:
+            if self._session is None:
+                self._session = (self.transport or shared_transport()).session
+            return self._session
 
 
 class NotificationRouter:
-    def __init__(self, notifiers: Iterable[Notifier]) -> None:
+    """Fan alerts out to every channel, optionally from a background sender.
+
+    In asynchronous mode ``send`` only enqueues into a bounded buffer; a daemon
+    thread drains it in batches so slow channels never delay scanning. When the
+    buffer is full new alerts are dropped and counted rather than blocking.
+    """
+
+    def __init__(
+        self,
+        notifiers: Iterable[Notifier],
+        asynchronous: bool = False,
+        queue_size: int = 1000,
+        batch_size: int = 20,
+        batch_window_seconds: float = 1.0,
+    ) -> None:
         self.notifiers = list(notifiers)
+        self.asynchronous = asynchronous
+        self.batch_size = max(1, int(batch_size))
+        self.batch_window_seconds = max(0.0, float(batch_window_seconds))
+        self.dropped = 0
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max(1, int(queue_size)))
+        self._closed = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
 
     @classmethod
     def from_config(cls, app_config: Any) -> "NotificationRouter":
@@ -66,18 +178,112 @@ class NotificationRouter:
                 WebhookNotifier(
                     webhook,
                     float(getattr(app_config, "DATA_REQUEST_TIMEOUT", 15)),
+                    max_retries=getattr(app_config, "ALERT_WEBHOOK_RETRIES", 3),
+                    backoff_seconds=getattr(app_config, "ALERT_WEBHOOK_BACKOFF_SECONDS", 1.0),
+                    batch_size=getattr(app_config, "ALERT_WEBHOOK_BATCH_SIZE", 1),
+                    transport=shared_transport(app_config),
                 )
             )
-        return cls(notifiers)
+        return cls(
+            notifiers,
+            asynchronous=bool(getattr(app_config, "ALERT_ASYNC_ENABLED", False)),
+            queue_size=getattr(app_config, "ALERT_QUEUE_SIZE", 1000),
+            batch_size=getattr(app_config, "ALERT_BATCH_SIZE", 20),
+            batch_window_seconds=getattr(app_config, "ALERT_BATCH_WINDOW_SECONDS", 1.0),
+        )
 
     def send(self, payload: Dict[str, Any]) -> None:
+        if not self.asynchronous:
+            self._dispatch([payload])
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(payload)
+        except queue.Full:
+            self.dropped += 1
+            logger.error(
+                "Alert buffer full (%d); dropped %s %s",
+                self._queue.maxsize,
+                payload.get("ticker"),
+                payload.get("rating"),
+            )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued alert has been dispatched."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 30.0) -> bool:
+        """Flush pending alerts, stop the sender and release channel resources."""
+        flushed = self.flush(timeout)
+        if not flushed:
+            logger.error("%d alerts still pending at shutdown", self._queue.unfinished_tasks)
+        self._closed.set()
+        if self._worker is not None:
+            self._worker.join(timeout=5)
         for notifier in self.notifiers:
-            try:
-                notifier.send(payload)
-            except Exception as error:
-                logger.error(
-                    "Alert channel %s failed: %s",
-                    type(notifier).__name__,
-                    error,
-                    exc_info=True,
+            close = getattr(notifier, "close", None)
+            if callable(close):
+                close()
+        return flushed
+
+    def _ensure_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._closed.clear()
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name="smartmoney-alerts",
+                    daemon=True,
                 )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            try:
+                batch = [self._queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.batch_window_seconds
+            while len(batch) < self.batch_size:
+                # Take whatever is already buffered, then wait out the window.
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._dispatch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _dispatch(self, payloads: Sequence[Dict[str, Any]]) -> None:
+        for notifier in self.notifiers:
+            send_batch = getattr(notifier, "send_batch", None)
+            if callable(send_batch):
+                self._deliver(notifier, send_batch, payloads)
+            else:
+                for payload in payloads:
+                    self._deliver(notifier, notifier.send, payload)
+
+    @staticmethod
+    def _deliver(notifier: Any, method: Any, argument: Any) -> None:
+        try:
+            method(argument)
+        except Exception as error:
+            logger.error(
+                "Alert channel %s failed: %s",
+                type(notifier).__name__,
+                error,
+                exc_info=True,
+            )
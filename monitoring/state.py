@@ -0,0 +1,275 @@
+"""SQLite-backed run and alert keys for the end-of-day monitor."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400.0
+
+
+class MonitorState:
+    """Persistent run/alert keys used to suppress duplicate work.
+
+    Alert keys inside the retention window are mirrored in an in-memory set, so
+    ``was_alerted`` never touches the database. Writes made inside ``batch()``
+    are committed in a single transaction when the block exits.
+    """
+
+    def __init__(self, path: str, retention_days: float = 30.0) -> None:
+        path = Path(path).expanduser().resolve()
+        legacy_path = path if path.suffix == ".json" else path.with_suffix(".json")
+        self.path = path.with_suffix(".sqlite3") if path.suffix == ".json" else path
+        self.retention_seconds = max(0.0, float(retention_days)) * SECONDS_PER_DAY
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._pending_runs: Dict[str, str] = {}
+        self._pending_alerts: Dict[str, float] = {}
+        self._pending_results: Dict[str, Tuple[str, str, float]] = {}
+        self.results = TickerResultStore(self)
+        self._initialize()
+        self._import_legacy_json(legacy_path)
+        self._runs = self._load_runs()
+        self._alerts = self._load_alerts()
+        self._prune()
+
+    @classmethod
+    def from_config(cls, app_config: Any) -> "MonitorState":
+        return cls(
+            getattr(app_config, "MONITOR_STATE_PATH", "./cache/monitor_state.sqlite3"),
+            retention_days=getattr(app_config, "MONITOR_ALERT_RETENTION_DAYS", 30),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA busy_timeout=30000")
+        return connection
+
+    def _initialize(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS monitor_runs (
+                    market TEXT PRIMARY KEY,
+                    run_date TEXT NOT NULL
+                )
+            """)
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS monitor_alerts (
+                    alert_key TEXT PRIMARY KEY,
+                    alerted_at REAL NOT NULL
+                )
+            """)
+            connection.execute("""
+                CREATE INDEX IF NOT EXISTS idx_monitor_alerts_time
+                ON monitor_alerts (alerted_at)
+            """)
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS ticker_results (
+                    ticker TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def was_run(self, market: str, date: str) -> bool:
+        with self._lock:
+            return self._runs.get(market) == date
+
+    def mark_run(self, market: str, date: str) -> None:
+        with self._lock:
+            self._runs[market] = date
+            self._pending_runs[market] = date
+            self._commit_unless_batched()
+
+    def was_alerted(self, key: str) -> bool:
+        with self._lock:
+            return key in self._alerts
+
+    def mark_alerted(self, key: str) -> None:
+        with self._lock:
+            self._alerts.add(key)
+            self._pending_alerts[key] = time.time()
+            self._commit_unless_batched()
+
+    @contextmanager
+    def batch(self) -> Iterator["MonitorState"]:
+        """Defer this thread's writes until its outermost block exits, then commit once."""
+        self._local.depth = self._batch_depth() + 1
+        try:
+            yield self
+        finally:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                self.save()
+
+    def save(self) -> None:
+        """Commit pending writes and drop alerts older than the retention window."""
+        with self._lock:
+            if not (self._pending_runs or self._pending_alerts or self._pending_results):
+                return
+            with self._connect() as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO monitor_runs (market, run_date) VALUES (?, ?)",
+                    self._pending_runs.items(),
+                )
+                connection.executemany(
+                    "INSERT OR IGNORE INTO monitor_alerts (alert_key, alerted_at) VALUES (?, ?)",
+                    self._pending_alerts.items(),
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO ticker_results "
+                    "(ticker, fingerprint, result, updated_at) VALUES (?, ?, ?, ?)",
+                    [(ticker, *row) for ticker, row in self._pending_results.items()],
+                )
+            self._pending_runs.clear()
+            self._pending_alerts.clear()
+            self._pending_results.clear()
+            self._prune()
+
+    def _batch_depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    def _commit_unless_batched(self) -> None:
+        if self._batch_depth() == 0:
+            self.save()
+
+    def _prune(self) -> None:
+        if not self.retention_seconds:
+            return
+        cutoff = time.time() - self.retention_seconds
+        with self._connect() as connection:
+            expired = [
+                row[0] for row in connection.execute(
+                    "SELECT alert_key FROM monitor_alerts WHERE alerted_at < ?",
+                    (cutoff,),
+                )
+            ]
+            if expired:
+                connection.execute(
+                    "DELETE FROM monitor_alerts WHERE alerted_at < ?",
+                    (cutoff,),
+                )
+            # Tickers dropped from the pool stop refreshing and age out too.
+            connection.execute(
+                "DELETE FROM ticker_results WHERE updated_at < ?",
+                (cutoff,),
+            )
+        self._alerts.difference_update(expired)
+
+    def _load_runs(self) -> Dict[str, str]:
+        with self._connect() as connection:
+            return dict(connection.execute("SELECT market, run_date FROM monitor_runs"))
+
+    def _load_alerts(self) -> set[str]:
+        with self._connect() as connection:
+            return {row[0] for row in connection.execute("SELECT alert_key FROM monitor_alerts")}
+
+    def _import_legacy_json(self, legacy_path: Path) -> None:
+        """Move runs and alert keys from the former JSON state file into SQLite."""
+        if not legacy_path.is_file():
+            return
+        try:
+            data = json.loads(legacy_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError, TypeError) as error:
+            logger.warning("Ignoring unreadable monitor state %s: %s", legacy_path, error)
+            return
+        now = time.time()
+        alerts = [
+            (str(key), self._legacy_alert_time(str(key), now))
+            for key in data.get("alerts", [])
+        ]
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO monitor_runs (market, run_date) VALUES (?, ?)",
+                [(str(market), str(day)) for market, day in data.get("runs", {}).items()],
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO monitor_alerts (alert_key, alerted_at) VALUES (?, ?)",
+                alerts,
+            )
+        legacy_path.replace(legacy_path.with_name(f"{legacy_path.name}.migrated"))
+        logger.info("Migrated %d alert keys from %s", len(alerts), legacy_path)
+
+    @staticmethod
+    def _legacy_alert_time(key: str, default: float) -> float:
+        """Alert keys start with the market date (``YYYY-MM-DD:ticker:rating``)."""
+        try:
+            day = date.fromisoformat(key.split(":", 1)[0])
+        except ValueError:
+            return default
+        return datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp()
+
+
+class TickerResultStore:
+    """Last analyzed bar fingerprint and score result per ticker.
+
+    Implements the ``get``/``set`` cache interface of
+    ``SmartMoneyScanner.scan_stock``. A result is reused only while the
+    ticker's latest bar (date and OHLCV hash) and the scoring settings are
+    unchanged. Writes are buffered and committed by ``MonitorState.save``.
+    """
+
+    def __init__(self, state: MonitorState) -> None:
+        self._state = state
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+        ticker, fingerprint = str(key[0]), self._fingerprint(key)
+        with self._state._lock:
+            pending = self._state._pending_results.get(ticker)
+        if pending is not None:
+            stored_fingerprint, payload = pending[0], pending[1]
+        else:
+            with self._state._connect() as connection:
+                row = connection.execute(
+                    "SELECT fingerprint, result FROM ticker_results WHERE ticker = ?",
+                    (ticker,),
+                ).fetchone()
+            if row is None:
+                return None
+            stored_fingerprint, payload = row
+        if stored_fingerprint != fingerprint:
+            return None
+        result = json.loads(payload)
+        result["reused"] = True
+        return result
+
+    def set(self, key: Tuple[Any, ...], result: Dict[str, Any]) -> None:
+        # The price frame and the deferred report are not persisted; reused
+        # results carry scores only.
+        stored = {
+            name: value for name, value in result.items()
+            if name not in {"data", "report", "reused"}
+        }
+        payload = json.dumps(stored, ensure_ascii=False, default=_json_default)
+        with self._state._lock:
+            self._state._pending_results[str(key[0])] = (
+                self._fingerprint(key),
+                payload,
+                time.time(),
+            )
+
+    @staticmethod
+    def _fingerprint(key: Tuple[Any, ...]) -> str:
+        encoded = json.dumps(list(key[1:]), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Iterable, Optional
 
 import numpy as np
 import pandas as pd
@@ -13,6 +13,7 @@ class AkQuantIndicatorEngine:
 
     REQUIRED_COLUMNS = {"open", "high", "low", "close", "volume"}
     SUPPORTED_BACKENDS = {"auto", "python", "rust"}
+    MA_PERIODS = (5, 10, 20, 60, 120, 250)
 
     def __init__(self, backend: str = "rust") -> None:
         backend = backend.strip().lower()
@@ -35,8 +36,16 @@ class AkQuantIndicatorEngine:
             )
         return pd.Series(array, index=index, dtype=float)
 
-    def enrich(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Return a copy of an OHLCV frame enriched with technical indicators."""
+    def enrich(
+        self,
+        df: pd.DataFrame,
+        indicators: Optional[Iterable[str]] = None,
+    ) -> pd.DataFrame:
+        """Return a copy of an OHLCV frame enriched with technical indicators.
+
+        ``indicators`` limits the output to the named columns (``"ma20"``,
+        ``"obv"``, ``"rsi"``, ``"macd"``, ``"mfi"``); all are computed by default.
+        """
         if df.empty:
             return df.copy()
 
@@ -51,7 +60,14 @@ class AkQuantIndicatorEngine:
         low = result["low"].to_numpy(dtype=float, copy=False)
         volume = result["volume"].to_numpy(dtype=float, copy=False)
 
-        for period in (5, 10, 20, 60, 120, 250):
+        wanted = None if indicators is None else set(indicators)
+
+        def selected(name: str) -> bool:
+            return wanted is None or name in wanted
+
+        for period in self.MA_PERIODS:
+            if not selected(f"ma{period}"):
+                continue
             values = self.talib.SMA(
                 close,
                 timeperiod=period,
@@ -59,35 +75,39 @@ class AkQuantIndicatorEngine:
             )
             result[f"ma{period}"] = self._series(values, result.index)
 
-        result["obv"] = self._series(
-            self.talib.OBV(close, volume, backend=self.backend),
-            result.index,
-        )
-        result["rsi"] = self._series(
-            self.talib.RSI(close, timeperiod=14, backend=self.backend),
-            result.index,
-        )
-
-        macd, signal, histogram = self.talib.MACD(
-            close,
-            fastperiod=12,
-            slowperiod=26,
-            signalperiod=9,
-            backend=self.backend,
-        )
-        result["macd"] = self._series(macd, result.index)
-        result["macd_signal"] = self._series(signal, result.index)
-        result["macd_hist"] = self._series(histogram, result.index)
-
-        result["mfi"] = self._series(
-            self.talib.MFI(
-                high,
-                low,
+        if selected("obv"):
+            result["obv"] = self._series(
+                self.talib.OBV(close, volume, backend=self.backend),
+                result.index,
+            )
+        if selected("rsi"):
+            result["rsi"] = self._series(
+                self.talib.RSI(close, timeperiod=14, backend=self.backend),
+                result.index,
+            )
+
+        if selected("macd"):
+            macd, signal, histogram = self.talib.MACD(
                 close,
-                volume,
-                timeperiod=14,
+                fastperiod=12,
+                slowperiod=26,
+                signalperiod=9,
                 backend=self.backend,
-            ),
-            result.index,
-        )
+            )
+            result["macd"] = self._series(macd, result.index)
+            result["macd_signal"] = self._series(signal, result.index)
+            result["macd_hist"] = self._series(histogram, result.index)
+
+        if selected("mfi"):
+            result["mfi"] = self._series(
+                self.talib.MFI(
+                    high,
+                    low,
+                    close,
+                    volume,
+                    timeperiod=14,
+                    backend=self.backend,
+                ),
+                result.index,
+            )
         return result
@@ -8,13 +8,101 @@
 - 评级: STRONG_BUY, BUY, NEUTRAL, SELL, STRONG_SELL
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+from functools import lru_cache
+import html
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# 报告分隔线与固定段落，预先拼接一次，渲染时直接复用
+_RULE = "=" * 70
+_SUBRULE = "-" * 70
+_SECTION_RULE = "-" * 60
+
+_REPORT_HEADER = (
+    _RULE,
+    "      Smart Money Tracker - 机构资金动向分析报告",
+    _RULE,
+    "",
+)
+
+_DISCLAIMER = (
+    _SECTION_RULE,
+    "免责声明:",
+    _SECTION_RULE,
+    "本报告仅供学习研究使用，不构成任何投资建议。",
+    "投资有风险，决策需谨慎。",
+    "",
+)
+
+# 各方向信号段落：标题与信号行格式 (进场权重带 + 号)
+_SIGNAL_SECTIONS = {
+    'inflow': (
+        (_RULE, "  进场信号 (吸筹/Accumulation) 🟢", _RULE, ""),
+        "[+{weight}] {name}",
+    ),
+    'outflow': (
+        (_RULE, "  离场信号 (派发/Distribution) 🔴", _RULE, ""),
+        "[{weight}] {name}",
+    ),
+}
+
+_RATING_INDICATORS = {
+    'STRONG_BUY': '🚀🚀',
+    'BUY': '🚀',
+    'NEUTRAL': '⚪',
+    'SELL': '⚠️',
+    'STRONG_SELL': '🛑🛑'
+}
+
+_SIGNAL_NAMES = {
+    # 进场/吸筹信号
+    'ACCUMULATION_BREAKOUT': '放量突破横盘区',
+    'WYCKOFF_SPRING': '威科夫弹簧/震仓',
+    'OBV_BULLISH_DIVERGENCE': 'OBV 看涨背离',
+    'MFI_BULLISH_DIVERGENCE': 'MFI 看涨背离',
+    'MFI_OVERSOLD': 'MFI 超卖',
+    'NEW_INSTITUTION': '新机构进入十大股东',
+    'INSTITUTIONAL_BUY_IN': '机构增持',
+    'SHAREHOLDER_COUNT_DECREASE': '股东户数减少',
+    'BID_WALL_SUPPORT': '买单墙支撑',
+    'RSP_STRONG': '相对强度强势',
+    'POSITIVE_NEWS': '正面新闻/催化剂',
+    'EARNINGS_BEAT': '业绩超预期',
+    'POLICY_TAILWIND': '有利政策',
+
+    # 离场/派发信号
+    'HIGH_VOLUME_STAGNATION': '高位放量滞涨',
+    'HIGH_VOLUME_DECLINE': '放量下跌',
+    'BREAK_SUPPORT_HEAVY_VOLUME': '放量跌破支撑位',
+    'LOW_VOLUME_RISE': '高位缩量上涨',
+    'OBV_BEARISH_DIVERGENCE': 'OBV 看跌背离',
+    'MFI_BEARISH_DIVERGENCE': 'MFI 看跌背离',
+    'MFI_OVERBOUGHT': 'MFI 超买',
+    'RSI_BEARISH_DIVERGENCE': 'RSI 看跌背离',
+    'MACD_BEARISH_DIVERGENCE': 'MACD 看跌背离',
+    'INSTITUTIONAL_SELL_OFF': '机构大幅减持',
+    'SHAREHOLDER_COUNT_INCREASE': '股东户数显著增加',
+    'INSIDER_SELLING': '董监高减持',
+    'ASK_WALL_PRESSURE': '卖盘压单',
+    'RSP_WEAK': '相对强度疲弱',
+    'SECTOR_UNDERPERFORMANCE': '跑输行业板块',
+    'NEGATIVE_NEWS': '负面新闻',
+    'EARNINGS_WARNING': '业绩预警',
+    'POLICY_HEADWIND': '不利政策',
+}
+
+
+@lru_cache(maxsize=512)
+def _signal_heading(direction: str, signal_name: str, weight: Any) -> str:
+    """信号标题行 (按方向、信号和权重缓存)"""
+    template = _SIGNAL_SECTIONS[direction][1]
+    return template.format(weight=weight, name=_SIGNAL_NAMES.get(signal_name, signal_name))
+
+
 class ReportGenerator:
     """报告生成器"""
 
@@ -27,11 +115,31 @@ class ReportGenerator:
         """
         self.config = config
 
-    def generate_report(
+    def lazy_report(
         self,
         ticker: str,
         score_result: Dict[str, Any],
         recommendation: str
+    ) -> 'LazyReport':
+        """
+        创建延迟渲染的报告，首次读取时才生成文本
+
+        Args:
+            ticker: 股票代码
+            score_result: 评分结果
+            recommendation: 投资建议
+
+        Returns:
+            LazyReport 对象，分析时间固定为创建时刻
+        """
+        return LazyReport(self, ticker, score_result, recommendation, datetime.now())
+
+    def generate_report(
+        self,
+        ticker: str,
+        score_result: Dict[str, Any],
+        recommendation: str,
+        analysis_time: Optional[datetime] = None
     ) -> str:
         """
         生成文本格式报告 (双向评分)
@@ -40,29 +148,25 @@ class ReportGenerator:
             ticker: 股票代码
             score_result: 评分结果 (支持双向评分)
             recommendation: 投资建议
+            analysis_time: 分析时间，默认当前时间
 
         Returns:
             格式化的报告文本
         """
-        report_lines = []
-
-        # 报告头部
-        report_lines.append("=" * 70)
-        report_lines.append("      Smart Money Tracker - 机构资金动向分析报告")
-        report_lines.append("=" * 70)
-        report_lines.append("")
+        analysis_time = analysis_time or datetime.now()
+        report_lines = list(_REPORT_HEADER)
 
         # 基本信息
         report_lines.append(f"股票代码: {ticker}")
-        report_lines.append(f"分析时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        report_lines.append(f"分析时间: {analysis_time.strftime('%Y-%m-%d %H:%M:%S')}")
         
         # 数据信息
         data_info = score_result.get('data_info', {})
         if data_info:
             report_lines.append("")
-            report_lines.append("-" * 70)
+            report_lines.append(_SUBRULE)
             report_lines.append("数据概览:")
-            report_lines.append("-" * 70)
+            report_lines.append(_SUBRULE)
             if 'record_count' in data_info:
                 report_lines.append(f"数据记录数: {data_info['record_count']} 条")
             if 'date_range' in data_info:
@@ -89,87 +193,9 @@ class ReportGenerator:
         report_lines.append(f"触发信号数: {signal_count} (进场: {inflow_count}, 离场: {outflow_count})")
         report_lines.append("")
 
-        # 吸筹信号 (正分)
-        inflow_signals = score_result.get('inflow_signals', {})
-        if inflow_signals:
-            report_lines.append("=" * 70)
-            report_lines.append("  进场信号 (吸筹/Accumulation) 🟢")
-            report_lines.append("=" * 70)
-            report_lines.append("")
-
-            for signal_name, signal_info in inflow_signals.items():
-                weight = signal_info['weight']
-                data = signal_info['data']
-
-                # 信号名称和权重
-                report_lines.append(f"[+{weight}] {self._translate_signal_name(signal_name)}")
-
-                # 信号描述
-                if 'description' in data:
-                    report_lines.append(f"      {data['description']}")
-
-                # 信号日期
-                if 'signal_date' in data and data['signal_date']:
-                    date_str = self._format_date(data['signal_date'])
-                    report_lines.append(f"      信号日期: {date_str}")
-
-                # 详细信息
-                if 'details' in data and data['details']:
-                    for key, value in data['details'].items():
-                        # 显示所有详细信息，包括 debug 数据
-                        if isinstance(value, (list, dict)):
-                            report_lines.append(f"        • {key}:")
-                            if isinstance(value, list):
-                                for item in value:
-                                    report_lines.append(f"            - {item}")
-                            else:
-                                for k, v in value.items():
-                                    report_lines.append(f"            - {k}: {v}")
-                        else:
-                            report_lines.append(f"        • {key}: {value}")
-
-                report_lines.append("")
-
-        # 派发信号 (负分)
-        outflow_signals = score_result.get('outflow_signals', {})
-        if outflow_signals:
-            report_lines.append("=" * 70)
-            report_lines.append("  离场信号 (派发/Distribution) 🔴")
-            report_lines.append("=" * 70)
-            report_lines.append("")
-
-            for signal_name, signal_info in outflow_signals.items():
-                weight = signal_info['weight']
-                data = signal_info['data']
-
-                # 信号名称和权重
-                report_lines.append(f"[{weight}] {self._translate_signal_name(signal_name)}")
-
-                # 信号描述
-                if 'description' in data:
-                    report_lines.append(f"      {data['description']}")
-
-                # 信号日期
-                if 'signal_date' in data and data['signal_date']:
-                    date_str = self._format_date(data['signal_date'])
-                    report_lines.append(f"      信号日期: {date_str}")
-
-                # 详细信息
-                if 'details' in data and data['details']:
-                    for key, value in data['details'].items():
-                        # 显示所有详细信息，包括 debug 数据
-                        if isinstance(value, (list, dict)):
-                            report_lines.append(f"        • {key}:")
-                            if isinstance(value, list):
-                                for item in value:
-                                    report_lines.append(f"            - {item}")
-                            else:
-                                for k, v in value.items():
-                                    report_lines.append(f"            - {k}: {v}")
-                        else:
-                            report_lines.append(f"        • {key}: {value}")
-
-                report_lines.append("")
+        # 吸筹信号 (正分) 与派发信号 (负分)
+        self._append_signals(report_lines, 'inflow', score_result.get('inflow_signals', {}))
+        self._append_signals(report_lines, 'outflow', score_result.get('outflow_signals', {}))
 
         # 无信号情况
         if signal_count == 0:
@@ -177,34 +203,65 @@ class ReportGenerator:
             report_lines.append("")
 
         # 投资建议
-        report_lines.append("-" * 60)
+        report_lines.append(_SECTION_RULE)
         report_lines.append("投资建议:")
-        report_lines.append("-" * 60)
+        report_lines.append(_SECTION_RULE)
         report_lines.append("")
         report_lines.append(recommendation)
         report_lines.append("")
 
         # 免责声明
-        report_lines.append("-" * 60)
-        report_lines.append("免责声明:")
-        report_lines.append("-" * 60)
-        report_lines.append("本报告仅供学习研究使用，不构成任何投资建议。")
-        report_lines.append("投资有风险，决策需谨慎。")
-        report_lines.append("")
+        report_lines.extend(_DISCLAIMER)
 
         return "\n".join(report_lines)
 
+    def _append_signals(
+        self,
+        report_lines: List[str],
+        direction: str,
+        signals: Dict[str, Any]
+    ) -> None:
+        """追加一个方向的信号段落"""
+        if not signals:
+            return
+        report_lines.extend(_SIGNAL_SECTIONS[direction][0])
+
+        for signal_name, signal_info in signals.items():
+            data = signal_info['data']
+
+            # 信号名称和权重
+            report_lines.append(_signal_heading(direction, signal_name, signal_info['weight']))
+
+            # 信号描述
+            if 'description' in data:
+                report_lines.append(f"      {data['description']}")
+
+            # 信号日期
+            if 'signal_date' in data and data['signal_date']:
+                date_str = self._format_date(data['signal_date'])
+                report_lines.append(f"      信号日期: {date_str}")
+
+            # 详细信息
+            if 'details' in data and data['details']:
+                for key, value in data['details'].items():
+                    # 显示所有详细信息，包括 debug 数据
+                    if isinstance(value, (list, dict)):
+                        report_lines.append(f"        • {key}:")
+                        if isinstance(value, list):
+                            for item in value:
+                                report_lines.append(f"            - {item}")
+                        else:
+                            for k, v in value.items():
+                                report_lines.append(f"            - {k}: {v}")
+                    else:
+                        report_lines.append(f"        • {key}: {value}")
+
+            report_lines.append("")
+
     @staticmethod
     def _get_rating_indicator(rating: str) -> str:
         """获取评级对应的指示符"""
-        indicators = {
-            'STRONG_BUY': '🚀🚀',
-            'BUY': '🚀',
-            'NEUTRAL': '⚪',
-            'SELL': '⚠️',
-            'STRONG_SELL': '🛑🛑'
-        }
-        return indicators.get(rating, '')
+        return _RATING_INDICATORS.get(rating, '')
 
     @staticmethod
     def _format_date(date_value) -> str:
@@ -216,49 +273,14 @@ class ReportGenerator:
     @staticmethod
     def _translate_signal_name(signal_name: str) -> str:
         """将信号代码翻译为中文名称 (双向)"""
-        translations = {
-            # 进场/吸筹信号
-            'ACCUMULATION_BREAKOUT': '放量突破横盘区',
-            'WYCKOFF_SPRING': '威科夫弹簧/震仓',
-            'OBV_BULLISH_DIVERGENCE': 'OBV 看涨背离',
-            'MFI_BULLISH_DIVERGENCE': 'MFI 看涨背离',
-            'MFI_OVERSOLD': 'MFI 超卖',
-            'NEW_INSTITUTION': '新机构进入十大股东',
-            'INSTITUTIONAL_BUY_IN': '机构增持',
-            'SHAREHOLDER_COUNT_DECREASE': '股东户数减少',
-            'BID_WALL_SUPPORT': '买单墙支撑',
-            'RSP_STRONG': '相对强度强势',
-            'POSITIVE_NEWS': '正面新闻/催化剂',
-            'EARNINGS_BEAT': '业绩超预期',
-            'POLICY_TAILWIND': '有利政策',
-
-            # 离场/派发信号
-            'HIGH_VOLUME_STAGNATION': '高位放量滞涨',
-            'HIGH_VOLUME_DECLINE': '放量下跌',
-            'BREAK_SUPPORT_HEAVY_VOLUME': '放量跌破支撑位',
-            'LOW_VOLUME_RISE': '高位缩量上涨',
-            'OBV_BEARISH_DIVERGENCE': 'OBV 看跌背离',
-            'MFI_BEARISH_DIVERGENCE': 'MFI 看跌背离',
-            'MFI_OVERBOUGHT': 'MFI 超买',
-            'RSI_BEARISH_DIVERGENCE': 'RSI 看跌背离',
-            'MACD_BEARISH_DIVERGENCE': 'MACD 看跌背离',
-            'INSTITUTIONAL_SELL_OFF': '机构大幅减持',
-            'SHAREHOLDER_COUNT_INCREASE': '股东户数显著增加',
-            'INSIDER_SELLING': '董监高减持',
-            'ASK_WALL_PRESSURE': '卖盘压单',
-            'RSP_WEAK': '相对强度疲弱',
-            'SECTOR_UNDERPERFORMANCE': '跑输行业板块',
-            'NEGATIVE_NEWS': '负面新闻',
-            'EARNINGS_WARNING': '业绩预警',
-            'POLICY_HEADWIND': '不利政策',
-        }
-        return translations.get(signal_name, signal_name)
+        return _SIGNAL_NAMES.get(signal_name, signal_name)
 
     def generate_json_report(
         self,
         ticker: str,
         score_result: Dict[str, Any],
-        recommendation: str
+        recommendation: str,
+        analysis_time: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """
         生成 JSON 格式报告 (双向评分)
@@ -267,13 +289,14 @@ class ReportGenerator:
             ticker: 股票代码
             score_result: 评分结果
             recommendation: 投资建议
+            analysis_time: 分析时间，默认当前时间
 
         Returns:
             JSON 格式的报告
         """
         return {
             'ticker': ticker,
-            'analysis_time': datetime.now().isoformat(),
+            'analysis_time': (analysis_time or datetime.now()).isoformat(),
             'score': score_result.get('score', 0),
             'score_range': score_result.get('score_range', '(-10 to +10)'),
             'rating': score_result.get('rating', 'NEUTRAL'),
@@ -287,6 +310,101 @@ class ReportGenerator:
         }
 
 
+    def generate_html_report(
+        self,
+        ticker: str,
+        score_result: Dict[str, Any],
+        recommendation: str,
+        analysis_time: Optional[datetime] = None
+    ) -> str:
+        """
+        生成 HTML 格式报告 (文本报告转义后置于 <pre> 中，保留对齐)
+
+        Args:
+            ticker: 股票代码
+            score_result: 评分结果
+            recommendation: 投资建议
+            analysis_time: 分析时间，默认当前时间
+
+        Returns:
+            HTML 片段
+        """
+        text = self.generate_report(ticker, score_result, recommendation, analysis_time)
+        rating = html.escape(str(score_result.get('rating', 'NEUTRAL')))
+        return (
+            f'<article class="smart-money-report" data-ticker="{html.escape(ticker)}" '
+            f'data-rating="{rating}"><pre>{html.escape(text)}</pre></article>'
+        )
+
+
+class LazyReport:
+    """
+    延迟渲染的分析报告
+
+    扫描结果只保存渲染所需的评分数据，文本/JSON/HTML 在首次读取时生成并缓存。
+    批量扫描和监控不读取报告，因此不再承担字符串拼接开销。
+    str(report) 返回文本报告，与此前 result['report'] 的字符串用法兼容。
+    """
+
+    __slots__ = ('_generator', 'ticker', 'score_result', 'recommendation',
+                 'analysis_time', '_rendered')
+
+    def __init__(
+        self,
+        generator: ReportGenerator,
+        ticker: str,
+        score_result: Dict[str, Any],
+        recommendation: str,
+        analysis_time: datetime
+    ):
+        self._generator = generator
+        self.ticker = ticker
+        self.score_result = score_result
+        self.recommendation = recommendation
+        self.analysis_time = analysis_time
+        self._rendered: Dict[str, Any] = {}
+
+    def render(self, format: str = 'text') -> Any:
+        """
+        渲染报告
+
+        Args:
+            format: 'text'、'json' 或 'html'
+
+        Returns:
+            对应格式的报告，同一格式只渲染一次
+        """
+        if format not in self._rendered:
+            renderers = {
+                'text': self._generator.generate_report,
+                'json': self._generator.generate_json_report,
+                'html': self._generator.generate_html_report,
+            }
+            if format not in renderers:
+                raise ValueError(f"不支持的报告格式: {format}")
+            self._rendered[format] = renderers[format](
+                self.ticker, self.score_result, self.recommendation, self.analysis_time
+            )
+        return self._rendered[format]
+
+    @property
+    def text(self) -> str:
+        return self.render('text')
+
+    def to_json(self) -> Dict[str, Any]:
+        return self.render('json')
+
+    def to_html(self) -> str:
+        return self.render('html')
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        state = 'rendered' if 'text' in self._rendered else 'deferred'
+        return f"<LazyReport {self.ticker} ({state})>"
+
+
 def generate_report(
     ticker: str,
     score_result: Dict[str, Any],
@@ -302,7 +420,7 @@ def generate_report(
         score_result: 评分结果
         recommendation: 投资建议
         config: 配置模块
-        format: 报告格式 ('text' 或 'json')
+        format: 报告格式 ('text'、'json' 或 'html')
 
     Returns:
         报告内容
@@ -311,5 +429,7 @@ def generate_report(
 
     if format == 'json':
         return generator.generate_json_report(ticker, score_result, recommendation)
+    elif format == 'html':
+        return generator.generate_html_report(ticker, score_result, recommendation)
     else:
         return generator.generate_report(ticker, score_result, recommendation)
@@ -4,6 +4,7 @@
 const API_BASE = window.location.origin;
 const LANGUAGE_STORAGE_KEY = 'smartmoneytracker-language';
 const DEFAULT_LANGUAGE = 'en';
+const JOB_POLL_INTERVAL_MS = 1000;
 
 const translations = {
     en: {
@@ -393,26 +394,25 @@ async function analyzeBatchStocks() {
     hideError();
 
     try {
-        const response = await fetch(`${API_BASE}/api/batch`, {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                tickers,
-                period,
-                analyze_structure: analyzeStructure
-            })
+        let batchData = null;
+        await streamEvents('/api/batch/stream', {
+            tickers,
+            period,
+            analyze_structure: analyzeStructure
+        }, 'batchAnalysisFailed', (event, payload) => {
+            if (event === 'start') {
+                batchData = { success: true, count: 0, results: [] };
+                displayBatchResults(batchData);
+            } else if (event === 'result') {
+                appendBatchResult(batchData, payload.result);
+                updateLoadingMessage(
+                    `${t('analyzing')} ${payload.completed}/${payload.total}`
+                );
+            } else if (event === 'error') {
+                throw new Error(translateApiError(payload.error, 'batchAnalysisFailed'));
+            }
         });
 
-        const data = await response.json();
-
-        if (!response.ok || !data.success) {
-            throw new Error(translateApiError(data.error, 'batchAnalysisFailed'));
-        }
-
-        displayBatchResults(data);
-
     } catch (error) {
         console.error('Batch analysis error:', error);
         showError(error.message || t('batchAnalysisFailed'));
@@ -421,6 +421,78 @@ async function analyzeBatchStocks() {
     }
 }
 
+// POST a request and dispatch each Server-Sent Event as it arrives.
+async function streamEvents(path, body, failureKey, onEvent) {
+    const response = await fetch(`${API_BASE}${path}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+    });
+    if (!response.ok) {
+        const data = await response.json().catch(() => ({}));
+        throw new Error(translateApiError(data.error, failureKey));
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const message = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            let event = 'message';
+            let data = '';
+            message.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            });
+            onEvent(event, data ? JSON.parse(data) : {});
+        }
+    }
+}
+
+// Submit a background job and poll its progress until it finishes.
+async function runJob(path, body, failureKey, messageKey = 'analyzing') {
+    const response = await fetch(`${API_BASE}${path}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(body)
+    });
+    let job = await response.json();
+    if (!response.ok || !job.success) {
+        throw new Error(translateApiError(job.error, failureKey));
+    }
+
+    const results = [];
+    let offset = 0;
+    while (true) {
+        const poll = await fetch(
+            `${API_BASE}/api/jobs/${job.job_id}/results?offset=${offset}`
+        );
+        job = await poll.json();
+        if (!poll.ok || !job.success) {
+            throw new Error(translateApiError(job.error, failureKey));
+        }
+        results.push(...job.results);
+        offset = job.next_offset;
+        const { completed, total } = job.progress;
+        if (total > 1) {
+            updateLoadingMessage(`${t(messageKey)} ${completed}/${total}`);
+        }
+        if (job.status === 'succeeded') {
+            return { ...job, results };
+        }
+        if (job.status === 'failed' || job.status === 'cancelled') {
+            throw new Error(translateApiError(job.error, failureKey));
+        }
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    }
+}
+
 async function runBacktest() {
     const ticker = tickerInput.value.trim().toUpperCase();
     if (!ticker) {
@@ -431,20 +503,14 @@ async function runBacktest() {
     showLoading('backtesting');
     hideError();
     try {
-        const response = await fetch(`${API_BASE}/api/backtest`, {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                ticker,
-                period: parseInt(document.getElementById('backtest_period').value),
-                warmup: 120,
-                rebalance: parseInt(document.getElementById('backtest_rebalance').value)
-            })
-        });
-        const data = await response.json();
-        if (!response.ok || !data.success) {
-            throw new Error(translateApiError(data.error, 'backtestFailed'));
-        }
+        const job = await runJob('/api/jobs/backtest', {
+            ticker,
+            period: parseInt(document.getElementById('backtest_period').value),
+            warmup: 120,
+            rebalance: parseInt(document.getElementById('backtest_rebalance').value),
+            layout: 'columns'
+        }, 'backtestFailed', 'backtesting');
+        const data = job.result;
         displayBacktestResult(data);
     } catch (error) {
         console.error('Backtest error:', error);
@@ -545,6 +611,13 @@ function displayBatchResults(data, shouldScroll = true) {
     });
 }
 
+function appendBatchResult(data, result) {
+    data.results.push(result);
+    data.count = data.results.length;
+    document.getElementById('batchCount').textContent = data.count;
+    document.getElementById('batchResultsList').appendChild(createBatchResultItem(result));
+}
+
 function displayBacktestResult(data, shouldScroll = true) {
     lastBacktestResult = data;
     lastSingleResult = null;
@@ -580,14 +653,25 @@ function displayBacktestResult(data, shouldScroll = true) {
         </div>
     `).join('');
 
-    renderLineChart('equityChart', data.series || [], [
+    const series = columnsToRows(data.series);
+    renderLineChart('equityChart', series, [
         { key: 'strategy', color: '#29d69c' },
         { key: 'benchmark', color: '#84909e' }
     ]);
-    renderLineChart('drawdownChart', data.series || [], [
+    renderLineChart('drawdownChart', series, [
         { key: 'drawdown', color: '#ff5b6e', fill: true }
     ], { includeZero: true, percentAxis: true });
-    renderSignalChart(data.signals || []);
+    renderSignalChart(columnsToRows(data.signals));
+}
+
+// Backtest series arrive as one array per column; charts read row objects.
+function columnsToRows(columns) {
+    if (Array.isArray(columns)) return columns;
+    const keys = Object.keys(columns || {});
+    if (!keys.length) return [];
+    return columns[keys[0]].map((_, index) =>
+        Object.fromEntries(keys.map(key => [key, columns[key][index]]))
+    );
 }
 
 function metricTone(value) {
@@ -927,6 +1011,10 @@ function showLoading(messageKey = 'analyzing') {
     backtestBtn.disabled = true;
 }
 
+function updateLoadingMessage(message) {
+    loadingIndicator.querySelector('p').textContent = message;
+}
+
 // Hide Loading
 function hideLoading() {
     loadingIndicator.style.display = 'none';
@@ -37,6 +37,14 @@ class TestAkQuantIndicatorEngine(unittest.TestCase):
         self.assertTrue(np.isfinite(result['rsi'].iloc[-1]))
         self.assertTrue(np.isfinite(result['mfi'].iloc[-1]))
 
+    def test_enrich_limits_output_to_requested_indicators(self):
+        full = self.engine.enrich(self.frame)
+        result = self.engine.enrich(self.frame, indicators={'ma20', 'macd'})
+
+        added = set(result.columns) - set(self.frame.columns)
+        self.assertEqual(added, {'ma20', 'macd', 'macd_signal', 'macd_hist'})
+        pd.testing.assert_series_equal(result['macd'], full['macd'])
+
     def test_enrich_does_not_mutate_input(self):
         original_columns = list(self.frame.columns)
         self.engine.enrich(self.frame)
@@ -7,12 +7,15 @@ import unittest
 import json
 import sys
 import os
+import time
 import numpy as np
+import pandas as pd
 from unittest.mock import Mock, patch
 
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import app as app_module
 from app import app, format_signals, convert_to_json_serializable
 
 
@@ -239,7 +242,193 @@ class TestFlaskAPI(unittest.TestCase):
         self.assertTrue(payload['success'])
         self.assertEqual(payload['ticker'], 'TEST')
         self.assertEqual(payload['series'][0]['strategy'], 100.0)
-        result.to_dict.assert_called_once_with(include_series=True)
+        result.to_dict.assert_called_once_with(include_series=True, layout='records')
+
+    @patch('app.scanner.data_fetcher.get_stock_name', return_value='Test Stock')
+    @patch('app.backtester.run')
+    def test_backtest_api_columnar_layout(self, run_backtest, _stock_name):
+        result = Mock()
+        result.to_dict.return_value = {
+            'ticker': 'TEST',
+            'summary': {'total_return': 0.1},
+            'layout': 'columns',
+            'series': {'date': ['2025-01-01'], 'strategy': [100.0]},
+        }
+        run_backtest.return_value = result
+
+        response = self.client.post(
+            '/api/backtest',
+            data=json.dumps({'ticker': 'TEST', 'layout': 'columns'}),
+            content_type='application/json'
+        )
+        self.assertEqual(json.loads(response.data)['series']['strategy'], [100.0])
+        result.to_dict.assert_called_once_with(include_series=True, layout='columns')
+
+        response = self.client.post(
+            '/api/jobs/backtest',
+            data=json.dumps({'ticker': 'TEST', 'layout': 'rows'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def _wait_for_job(self, job_id):
+        for _ in range(200):
+            payload = json.loads(
+                self.client.get(f'/api/jobs/{job_id}/results').data
+            )
+            if payload['status'] in {'succeeded', 'failed', 'cancelled'}:
+                return payload
+            time.sleep(0.01)
+        self.fail('job did not finish')
+
+    @patch('app.scanner.data_fetcher.get_stock_name', return_value='Test Stock')
+    @patch('app.scanner.scan_stock')
+    def test_batch_job_reports_progress_and_results(self, scan_stock, _stock_name):
+        scan_stock.side_effect = lambda ticker, *_, **__: {
+            'ticker': ticker, 'success': True, 'score': 2, 'rating': 'BUY',
+            'signal_count': 1, 'recommendation': 'watch',
+        }
+        response = self.client.post(
+            '/api/jobs/batch',
+            data=json.dumps({'tickers': ['aapl', 'msft', 'AAPL']}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 202)
+        submitted = json.loads(response.data)
+        self.assertEqual(submitted['progress']['total'], 2)
+
+        payload = self._wait_for_job(submitted['job_id'])
+        self.assertEqual(payload['status'], 'succeeded')
+        self.assertEqual(payload['progress']['completed'], 2)
+        self.assertEqual(
+            sorted(item['ticker'] for item in payload['results']),
+            ['AAPL', 'MSFT'],
+        )
+        later = json.loads(self.client.get(
+            f"/api/jobs/{submitted['job_id']}/results?offset=2"
+        ).data)
+        self.assertEqual(later['results'], [])
+
+    @patch('app.scanner.data_fetcher.get_stock_name', return_value='Test Stock')
+    @patch('app.backtester.run')
+    def test_backtest_job_returns_final_payload(self, run_backtest, _stock_name):
+        result = Mock()
+        result.to_dict.return_value = {
+            'ticker': 'TEST', 'summary': {'total_return': 0.1}, 'series': [],
+        }
+        run_backtest.return_value = result
+        response = self.client.post(
+            '/api/jobs/backtest',
+            data=json.dumps({'ticker': 'test'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 202)
+        payload = self._wait_for_job(json.loads(response.data)['job_id'])
+        self.assertEqual(payload['status'], 'succeeded')
+        self.assertEqual(payload['result']['stock_name'], 'Test Stock')
+
+    @patch('app.scanner.data_fetcher.get_stock_name', return_value='Test Stock')
+    @patch('app.scanner.scan_stock')
+    def test_batch_stream_emits_result_per_ticker(self, scan_stock, _stock_name):
+        scan_stock.side_effect = lambda ticker, *_, **__: {
+            'ticker': ticker, 'success': False, 'error': '无法获取数据',
+        }
+        response = self.client.post(
+            '/api/batch/stream',
+            data=json.dumps({'tickers': ['aapl', ' AAPL ', '', 'MSFT']}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        events = []
+        for block in response.get_data(as_text=True).strip().split('\n\n'):
+            event_line, data_line = block.split('\n')
+            events.append((event_line[len('event: '):],
+                           json.loads(data_line[len('data: '):])))
+
+        self.assertEqual([name for name, _ in events],
+                         ['start', 'result', 'result', 'done'])
+        self.assertEqual(events[0][1]['total'], 2)
+        self.assertEqual(events[2][1]['completed'], 2)
+        self.assertEqual(events[1][1]['result']['error'], '无法获取数据')
+        self.assertEqual(events[-1][1]['count'], 2)
+        self.assertEqual(
+            sorted(call.args[0] for call in scan_stock.call_args_list), ['AAPL', 'MSFT']
+        )
+
+    def test_batch_stream_missing_tickers(self):
+        response = self.client.post(
+            '/api/batch/stream',
+            data=json.dumps({'tickers': []}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_job_endpoints_validate_input_and_unknown_ids(self):
+        response = self.client.post(
+            '/api/jobs/batch',
+            data=json.dumps({}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get('/api/jobs/missing').status_code, 404)
+        self.assertEqual(
+            self.client.post('/api/jobs/missing/cancel').status_code, 404
+        )
+
+
+class TestServingProfile(unittest.TestCase):
+    """生产服务模式：应用工厂、预热与就绪检查"""
+
+    def setUp(self):
+        self.client = app.test_client()
+        self.state_patch = patch.dict(app_module.warmup_state, {
+            'status': 'pending',
+            'started_at': None,
+            'finished_at': None,
+            'summary': None,
+        })
+        self.state_patch.start()
+        self.addCleanup(self.state_patch.stop)
+
+    def test_ready_reports_503_until_warm_up_finishes(self):
+        self.assertEqual(self.client.get('/api/health').status_code, 200)
+        response = self.client.get('/api/ready')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(json.loads(response.data)['status'], 'pending')
+
+        summary = {'benchmarks': {'^GSPC': 250}, 'names': 3, 'errors': []}
+        with patch.object(app_module.scanner, 'warm_up', return_value=summary) as warm_up:
+            self.assertIs(app_module.create_app(warm=True), app)
+            app_module.create_app(warm=True)
+
+        warm_up.assert_called_once()
+        response = self.client.get('/api/ready')
+        data = json.loads(response.data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data['status'], 'ready')
+        self.assertEqual(data['warmup']['names'], 3)
+
+    def test_warm_up_failure_does_not_block_readiness(self):
+        with patch.object(app_module.scanner, 'warm_up', side_effect=RuntimeError('offline')):
+            app_module.create_app(warm=True)
+        data = json.loads(self.client.get('/api/ready').data)
+        self.assertEqual(data['status'], 'ready')
+        self.assertIn('offline', data['warmup']['errors'])
+
+    def test_create_app_without_warm_up_is_ready_immediately(self):
+        with patch.object(app_module.scanner, 'warm_up') as warm_up:
+            app_module.create_app(warm=False)
+        warm_up.assert_not_called()
+        self.assertEqual(self.client.get('/api/ready').status_code, 200)
+
+    def test_gunicorn_profile_preloads_app_factory(self):
+        import runpy
+        settings = runpy.run_path(
+            os.path.join(os.path.dirname(__file__), '..', 'gunicorn.conf.py')
+        )
+        self.assertEqual(settings['wsgi_app'], 'app:create_app()')
+        self.assertTrue(settings['preload_app'])
 
 
 class TestSignalScoreDisplay(unittest.TestCase):
@@ -327,6 +516,20 @@ class TestJSONSerialization(unittest.TestCase):
         self.assertAlmostEqual(result['float_val'], 3.14)
         self.assertEqual(result['array_val'], [1, 2, 3])
 
+    def test_convert_pandas_objects_columnwise(self):
+        """测试 pandas 对象按列转换，缺失值转为 None"""
+        frame = pd.DataFrame({'close': [1.0, np.nan], 'volume': [10, 20]})
+        result = convert_to_json_serializable({
+            'frame': frame,
+            'series': frame['close'],
+            'values': np.array([0.5, np.nan]),
+            'plain': [1, 2.5, 'x', None],
+        })
+        self.assertEqual(result['frame'], {'close': [1.0, None], 'volume': [10, 20]})
+        self.assertEqual(result['series'], [1.0, None])
+        self.assertEqual(result['values'], [0.5, None])
+        self.assertEqual(result['plain'], [1, 2.5, 'x', None])
+
     def test_format_signals_with_numpy_types(self):
         """测试格式化包含 numpy 类型的信号"""
         signals = {
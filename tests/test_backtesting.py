@@ -8,6 +8,7 @@ import pandas as pd
 
 import config
 from backtesting import SignalBacktestConfig, SignalBacktester
+from backtesting.serialization import frame_to_columns, frame_to_records, isoformat_column
 from data_fetcher.manager import DataFetcher
 
 
@@ -91,6 +92,56 @@ class TestSignalBacktester(unittest.TestCase):
         self.assertIn("drawdown", payload["series"][0])
         json.dumps(payload)
 
+    def test_columnar_layout_matches_records(self):
+        run = SignalBacktester(
+            config, self.fetcher, evaluator=self.trend_evaluator
+        ).run("TEST", data=make_prices(), settings=self.settings)
+        records = run.to_dict(include_series=True)
+        columns = run.to_dict(include_series=True, layout="columns")
+
+        self.assertEqual(columns["layout"], "columns")
+        for key in ("series", "signals", "orders", "trades"):
+            rebuilt = [
+                dict(zip(columns[key], row)) for row in zip(*columns[key].values())
+            ]
+            self.assertEqual(rebuilt, records[key])
+        self.assertEqual(
+            records["series"][0]["date"], run.equity_curve.index[60].isoformat()
+        )
+        json.dumps(columns, allow_nan=False)
+
+        with self.assertRaises(ValueError):
+            run.to_dict(layout="rows")
+
+
+class TestColumnarSerialization(unittest.TestCase):
+    def test_datetimes_match_isoformat(self):
+        for index in (
+            pd.date_range("2025-03-07", periods=4, freq="D", tz="America/New_York"),
+            pd.DatetimeIndex(["2025-01-02 09:30:00.250", None]),
+            pd.date_range("2025-01-01", periods=3, freq="B"),
+        ):
+            expected = [None if pd.isna(value) else value.isoformat() for value in index]
+            self.assertEqual(isoformat_column(index), expected)
+
+    def test_missing_values_become_null(self):
+        frame = pd.DataFrame({
+            "price": [1.5, np.nan],
+            "qty": np.array([1, 2], dtype=np.int64),
+            "date": [pd.Timestamp("2025-01-02"), pd.NaT],
+            "side": ["buy", None],
+            "held": pd.to_timedelta(["1 days", None]),
+        })
+        self.assertEqual(frame_to_columns(frame), {
+            "price": [1.5, None],
+            "qty": [1, 2],
+            "date": ["2025-01-02T00:00:00", None],
+            "side": ["buy", None],
+            "held": ["1 days 00:00:00", None],
+        })
+        self.assertEqual(frame_to_records(frame)[1]["price"], None)
+        self.assertEqual(frame_to_records(frame.iloc[0:0]), [])
+
 
 if __name__ == "__main__":
     unittest.main()
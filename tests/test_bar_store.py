@@ -0,0 +1,237 @@
+"""Tests for the trade-date keyed local bar store and its daily ingest."""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+from data_fetcher.bar_store import DailyBarStore
+from data_fetcher.ingest import DailyBarIngestor
+from data_fetcher.manager import DataFetcher
+from data_fetcher.trading_calendar import TradingCalendar
+
+
+def _history(dates, close=10.0):
+    return pd.DataFrame({
+        'date': pd.to_datetime(dates),
+        'open': close, 'high': close + 1, 'low': close - 1,
+        'close': close, 'volume': 1000.0, 'amount': 10000.0,
+    })
+
+
+def _cross_section(tickers, close=11.0):
+    return pd.DataFrame({
+        'ticker': tickers,
+        'open': close, 'high': close + 1, 'low': close - 1,
+        'close': close, 'volume': 2000.0, 'amount': 22000.0,
+    })
+
+
+class FakeFetcher:
+    def __init__(self, failing=(), expired=()):
+        self.failing = set(failing)
+        self.expired = set(expired)
+        self.cross_sections = []
+        self.histories = []
+        self.calendar = TradingCalendar.for_market('A_STOCK')
+
+    def trading_calendar(self, market):
+        return self.calendar
+
+    def get_a_share_cross_section(self, trade_date):
+        self.cross_sections.append(trade_date)
+        if trade_date in self.failing:
+            return None, 'tushare'
+        if trade_date in self.expired:
+            return None, 'expired'
+        return _cross_section(['600519.SH', '000858.SZ']), 'tushare'
+
+    def get_a_share_history(self, ticker, start_date, end_date):
+        self.histories.append(ticker)
+        return _history(['2026-08-05', '2026-08-06'])
+
+
+class TestDailyBarStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = DailyBarStore(os.path.join(self.directory.name, 'bars.sqlite3'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_load_requires_backfill_and_current_ingest(self):
+        self.store.backfill('600519.SH', _history(['2026-08-05', '2026-08-06']), '2026-01-01')
+        self.assertIsNone(self.store.load('600519.SH', '20260101', '20260807', 'A_STOCK', '20260807'))
+
+        self.store.append_cross_section('A_STOCK', '20260807', _cross_section(['600519.SH']), 'tushare')
+        frame = self.store.load('600519.SH', '20260101', '20260807', 'A_STOCK', '20260807')
+
+        self.assertEqual(frame['close'].tolist(), [10.0, 10.0, 11.0])
+        self.assertEqual(frame['date'].iloc[-1], pd.Timestamp('2026-08-07'))
+        # Cross-section rows alone do not make an un-backfilled ticker complete.
+        self.assertIsNone(self.store.load('000858.SZ', '20260101', '20260807', 'A_STOCK', '20260807'))
+        # History before the backfill start is unknown.
+        self.assertIsNone(self.store.load('600519.SH', '20251201', '20260807', 'A_STOCK', '20260807'))
+
+    def test_empty_cross_section_is_recorded(self):
+        self.store.append_cross_section('A_STOCK', '20261001', pd.DataFrame(), 'tushare')
+        self.assertEqual(self.store.latest_ingest('A_STOCK'), '2026-10-01')
+        self.assertEqual(self.store.stats()['bars'], 0)
+
+
+class TestDailyBarIngestor(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = DailyBarStore(os.path.join(self.directory.name, 'bars.sqlite3'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_first_run_ingests_end_date_and_backfills_once(self):
+        fetcher = FakeFetcher()
+        ingestor = DailyBarIngestor(fetcher, self.store)
+
+        result = ingestor.run(['600519.SH'], '20260807', 30, all_tickers=True)
+        ingestor.run(['600519.SH'], '20260807', 30, all_tickers=True)
+
+        self.assertEqual(fetcher.cross_sections, ['20260807'])
+        self.assertEqual(result['ingested'], {'20260807': 2})
+        self.assertEqual(sorted(fetcher.histories), ['000858.SZ', '600519.SH'])
+
+    def test_ingest_skips_weekends_and_stops_at_first_failure(self):
+        self.store.append_cross_section('A_STOCK', '20260806', pd.DataFrame(), 'tushare')
+        fetcher = FakeFetcher(failing={'20260810'})
+
+        counts = DailyBarIngestor(fetcher, self.store).ingest('20260812')
+
+        self.assertEqual(fetcher.cross_sections, ['20260807', '20260810'])
+        self.assertEqual(list(counts), ['20260807'])
+        self.assertEqual(self.store.latest_ingest('A_STOCK'), '2026-08-07')
+
+    def test_expired_date_is_skipped_and_tickers_are_backfilled_again(self):
+        self.store.append_cross_section('A_STOCK', '20260806', pd.DataFrame(), 'tushare')
+        self.store.backfill('600519.SH', _history(['2026-08-05', '2026-08-06']), '2026-07-01')
+        fetcher = FakeFetcher(expired={'20260807'})
+
+        with self.assertLogs('data_fetcher.ingest', level='ERROR'):
+            result = DailyBarIngestor(fetcher, self.store).run(
+                ['600519.SH'], '20260810', 30, all_tickers=True
+            )
+
+        self.assertEqual(fetcher.cross_sections, ['20260807', '20260810'])
+        self.assertEqual(result['ingested'], {'20260810': 2})
+        self.assertEqual(self.store.latest_ingest('A_STOCK'), '2026-08-10')
+        # The reset backfill is refetched, so the missed date comes from history.
+        self.assertEqual(sorted(fetcher.histories), ['000858.SZ', '600519.SH'])
+
+    def test_expired_last_date_keeps_market_tickers(self):
+        self.store.append_cross_section(
+            'A_STOCK', '20260806', _cross_section(['600519.SH']), 'tushare'
+        )
+        fetcher = FakeFetcher(expired={'20260807'})
+
+        with self.assertLogs('data_fetcher.ingest', level='ERROR'):
+            DailyBarIngestor(fetcher, self.store).run([], '20260807', 30, all_tickers=True)
+
+        self.assertEqual(fetcher.histories, ['600519.SH'])
+
+    def test_ingest_skips_exchange_holidays(self):
+        self.store.append_cross_section('A_STOCK', '20260930', pd.DataFrame(), 'tushare')
+        fetcher = FakeFetcher()
+
+        DailyBarIngestor(fetcher, self.store).ingest('20261009')
+
+        self.assertEqual(fetcher.cross_sections, ['20261008', '20261009'])
+
+
+class TestDataFetcherBarStore(unittest.TestCase):
+    def test_akshare_backfill_and_snapshot_cross_section_share_units(self):
+        """腾讯历史 (股) 与东方财富快照 (手) 写入日线库前统一为股"""
+        with tempfile.TemporaryDirectory() as directory:
+            fetcher = DataFetcher(SimpleNamespace(
+                A_STOCK_DATA_SOURCE='akshare',
+                AKSHARE_HISTORY_SOURCE='tencent',
+                CACHE_ENABLED=False,
+                TUSHARE_TOKEN='',
+                QUANT_ENGINE='native',
+                AKSHARE_ENABLED=False,
+            ))
+            calendar = fetcher.trading_calendar('A_STOCK')
+            fetcher.akshare_available = True
+            fetcher.ak = Mock()
+            fetcher.ak.stock_zh_a_hist_tx.return_value = pd.DataFrame({
+                'date': ['2026-08-05', '2026-08-06'],
+                'open': 10.0, 'high': 11.0, 'low': 9.0, 'close': 10.0,
+                'volume': 150000.0, 'amount': 1_500_000.0,
+            })
+            fetcher.ak.stock_zh_a_spot_em.return_value = pd.DataFrame({
+                '代码': ['600519'], '名称': ['贵州茅台'], '最新价': [11.0],
+                '今开': [10.5], '最高': [11.2], '最低': [10.4],
+                '成交量': [1500.0], '成交额': [1_650_000.0],
+            })
+            store = DailyBarStore(os.path.join(directory, 'bars.sqlite3'))
+
+            with patch.object(
+                calendar, 'last_completed_session', return_value=pd.Timestamp('2026-08-07')
+            ), patch('data_fetcher.manager.datetime') as clock:
+                clock.now.return_value = datetime(2026, 8, 7, 16, 0)
+                DailyBarIngestor(fetcher, store).run(['600519.SH'], '20260807', 30)
+                frame = store.load('600519.SH', '20260805', '20260807', 'A_STOCK', '20260807')
+
+            self.assertEqual(frame['volume'].tolist(), [150000.0, 150000.0, 150000.0])
+            self.assertEqual(frame['amount'].tolist(), [1_500_000.0, 1_500_000.0, 1_650_000.0])
+
+    def test_tushare_bars_are_converted_to_shares_and_yuan(self):
+        fetcher = DataFetcher(SimpleNamespace(
+            CACHE_ENABLED=False, TUSHARE_TOKEN='', QUANT_ENGINE='native', AKSHARE_ENABLED=False,
+        ))
+        fetcher.ts_api = Mock()
+        fetcher.ts_api.daily.return_value = pd.DataFrame({
+            'ts_code': ['600519.SH'], 'trade_date': ['20260807'],
+            'open': [10.0], 'high': [11.0], 'low': [9.0], 'close': [10.0],
+            'vol': [1500.0], 'amount': [1500.0],
+        })
+
+        history = fetcher.get_a_share_history('600519.SH', '20260801', '20260807')
+        cross_section, source = fetcher.get_a_share_cross_section('20260807')
+
+        self.assertEqual(source, 'tushare')
+        for frame in (history, cross_section):
+            self.assertEqual(frame['volume'].iloc[0], 150000.0)
+            self.assertEqual(frame['amount'].iloc[0], 1_500_000.0)
+
+    def test_a_share_daily_data_is_served_from_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            settings = SimpleNamespace(
+                A_STOCK_DATA_SOURCE='akshare',
+                AKSHARE_HISTORY_SOURCE='tencent',
+                DATA_REQUEST_TIMEOUT=15,
+                CACHE_ENABLED=True,
+                PERSISTENT_CACHE_ENABLED=False,
+                CACHE_DIR=directory,
+                TUSHARE_TOKEN='',
+                QUANT_ENGINE='native',
+                AKSHARE_ENABLED=False,
+                BAR_STORE_ENABLED=True,
+                BAR_STORE_PATH=os.path.join(directory, 'bars.sqlite3'),
+            )
+            fetcher = DataFetcher(settings)
+            fetcher.bar_store.backfill('600519.SH', _history(['2026-08-06']), '2026-08-01')
+            fetcher.bar_store.append_cross_section(
+                'A_STOCK', '20260807', _cross_section(['600519.SH']), 'tushare'
+            )
+
+            with patch.object(fetcher, '_get_a_stock_daily') as provider:
+                # A Sunday end date snaps to Friday's session, which the store covers.
+                frame = fetcher.get_daily_data('600519.SH', '20260801', '20260809')
+
+            provider.assert_not_called()
+            self.assertEqual(frame['close'].tolist(), [10.0, 11.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,24 +5,23 @@ import time
 import unittest
 from unittest.mock import patch
 
+import pandas as pd
+
+from data_fetcher.scheduler import FetchScheduler
 from main import SmartMoneyScanner
 
 
 class TestBatchConcurrency(unittest.TestCase):
     def setUp(self):
         self.scanner = SmartMoneyScanner()
-        self.scanner.batch_rate_limits = {
-            'A_STOCK': 0.0,
-            'US_STOCK': 0.0,
-            'HK_STOCK': 0.0,
-        }
+        self.scheduler = self.scanner.data_fetcher.scheduler = FetchScheduler(budget=6)
 
     def test_batch_is_bounded_and_preserves_input_order(self):
         active = 0
         peak = 0
         lock = threading.Lock()
 
-        def fake_scan(ticker, _period, _structure):
+        def fake_scan(ticker, _period, _structure, **_options):
             nonlocal active, peak
             with lock:
                 active += 1
@@ -39,6 +38,39 @@ class TestBatchConcurrency(unittest.TestCase):
         self.assertEqual(list(results), tickers)
         self.assertEqual(peak, 2)
 
+    def test_concurrent_batches_share_fetch_budget(self):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def fake_scan(ticker, _period, _structure, **_options):
+            nonlocal active, peak
+            with self.scheduler.slot('A_STOCK'):
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.02)
+                with lock:
+                    active -= 1
+            return {'ticker': ticker, 'success': True}
+
+        self.scheduler.budget = 2
+        with patch.object(self.scanner, 'scan_stock', side_effect=fake_scan):
+            batches = [
+                threading.Thread(
+                    target=self.scanner.scan_batch,
+                    args=([f'{market}{index}' for index in range(4)],),
+                    kwargs={'max_workers': 3},
+                )
+                for market in ('A', 'B')
+            ]
+            for batch in batches:
+                batch.start()
+            for batch in batches:
+                batch.join()
+
+        self.assertEqual(peak, 2)
+
     def test_duplicate_tickers_are_scanned_once(self):
         with patch.object(
             self.scanner,
@@ -50,12 +82,27 @@ class TestBatchConcurrency(unittest.TestCase):
         self.assertEqual(list(results), ['AAPL'])
         scan.assert_called_once()
 
+    def test_batch_results_drop_frames_unless_requested(self):
+        with patch.object(
+            self.scanner,
+            'scan_stock',
+            side_effect=lambda ticker, *_, **__: {
+                'ticker': ticker, 'success': True, 'data': object(),
+            },
+        ):
+            slim = self.scanner.scan_batch(['AAPL', 'MSFT'], max_workers=2)
+            full = self.scanner.scan_batch(['AAPL'], max_workers=1, keep_data=True)
+
+        self.assertTrue(all('data' not in result for result in slim.values()))
+        self.assertIn('data', full['AAPL'])
+
     def test_rate_limit_is_scoped_by_market(self):
-        self.scanner.batch_rate_limits['US_STOCK'] = 0.03
+        self.scheduler.rate_limits['US_STOCK'] = 0.03
         started = []
 
-        def fake_scan(ticker, _period, _structure):
-            started.append((ticker, time.monotonic()))
+        def fake_scan(ticker, _period, _structure, **_options):
+            with self.scheduler.slot(self.scanner.data_fetcher._detect_market(ticker)):
+                started.append((ticker, time.monotonic()))
             return {'ticker': ticker, 'success': True}
 
         with patch.object(self.scanner, 'scan_stock', side_effect=fake_scan):
@@ -64,6 +111,103 @@ class TestBatchConcurrency(unittest.TestCase):
         started.sort(key=lambda item: item[1])
         self.assertGreaterEqual(started[1][1] - started[0][1], 0.025)
 
+    def test_progress_callback_and_cancellation_stop_pending_tickers(self):
+        cancel = threading.Event()
+        seen = []
+
+        def on_result(ticker, _result, completed, total):
+            seen.append((ticker, completed, total))
+            cancel.set()
+
+        with patch.object(
+            self.scanner,
+            'scan_stock',
+            side_effect=lambda ticker, *_, **__: {'ticker': ticker, 'success': True},
+        ) as scan:
+            results = self.scanner.scan_batch(
+                ['AAPL', 'MSFT', 'TSLA', 'NVDA'],
+                max_workers=1,
+                on_result=on_result,
+                cancel_event=cancel,
+            )
+
+        self.assertEqual(seen[0][1:], (1, 4))
+        self.assertLess(scan.call_count, 4)
+        self.assertEqual(list(results), [ticker for ticker, *_ in seen])
+
+    def test_iter_batch_yields_in_completion_order(self):
+        delays = {'AAPL': 0.05, 'MSFT': 0.0}
+
+        def fake_scan(ticker, _period, _structure, **_options):
+            time.sleep(delays[ticker])
+            return {'ticker': ticker, 'success': True}
+
+        with patch.object(self.scanner, 'scan_stock', side_effect=fake_scan):
+            streamed = [
+                ticker for ticker, _ in
+                self.scanner.iter_batch(['AAPL', 'MSFT'], max_workers=2)
+            ]
+
+        self.assertEqual(streamed, ['MSFT', 'AAPL'])
+
+    def test_closing_iter_batch_cancels_queued_tickers(self):
+        with patch.object(
+            self.scanner,
+            'scan_stock',
+            side_effect=lambda ticker, *_, **__: {'ticker': ticker, 'success': True},
+        ) as scan:
+            stream = self.scanner.iter_batch(
+                ['AAPL', 'MSFT', 'TSLA', 'NVDA'], max_workers=1
+            )
+            next(stream)
+            stream.close()
+
+        self.assertLess(scan.call_count, 4)
+
+    def test_prefetch_warms_bars_benchmarks_disclosures_and_names(self):
+        fetcher = self.scanner.data_fetcher
+        fetcher.disclosure_cache = object()
+        fetcher._stock_name_cache = {'AAPL': '苹果'}
+        frame = pd.DataFrame({'close': [1.0]})
+        priorities = []
+
+        def record(result):
+            def fetch(*_args, **_kwargs):
+                priorities.append(fetcher.scheduler._local.context[0])
+                return result
+            return fetch
+
+        with patch.object(fetcher, 'get_daily_data', side_effect=record(frame)) as bars, \
+                patch.object(fetcher, 'get_institutional_holdings', side_effect=record(frame)), \
+                patch.object(fetcher, 'get_shareholder_count', side_effect=record(pd.DataFrame())), \
+                patch.object(fetcher, 'get_stock_name', side_effect=record('贵州茅台')) as names:
+            summary = self.scanner.prefetch(['600519.SH', 'aapl'], period=120)
+
+        self.assertEqual(
+            sorted(call.args[0] for call in bars.call_args_list),
+            ['000001.SH', '600519.SH', 'AAPL', '^GSPC'],
+        )
+        self.assertTrue(all(call.kwargs == {'period': 120} for call in bars.call_args_list))
+        names.assert_called_once_with('600519.SH')
+        self.assertEqual(summary['bars'], 2)
+        self.assertEqual(summary['benchmarks'], {'000001.SH': 1, '^GSPC': 1})
+        self.assertEqual(summary['disclosures'], 2)
+        self.assertEqual(summary['names'], 1)
+        self.assertEqual(set(priorities), {'background'})
+
+    def test_prefetch_of_an_empty_list_fetches_nothing(self):
+        fetcher = self.scanner.data_fetcher
+        with patch.object(fetcher, 'get_daily_data') as bars, \
+                patch.object(fetcher, 'get_institutional_holdings') as holdings, \
+                patch.object(fetcher, 'get_stock_name') as names:
+            summary = self.scanner.prefetch([], period=120)
+
+        bars.assert_not_called()
+        holdings.assert_not_called()
+        names.assert_not_called()
+        self.assertEqual(summary['bars'], 0)
+        self.assertEqual(summary['benchmarks'], {})
+
 
 if __name__ == '__main__':
     unittest.main()
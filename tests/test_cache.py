@@ -3,14 +3,17 @@
 import tempfile
 import time
 import unittest
+from contextlib import nullcontext
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import patch
 
 import pandas as pd
 
-from data_fetcher.cache import DataFrameTTLCache
+import config
+from data_fetcher.cache import DataFrameTTLCache, MemoryTTLCache, NegativeResultCache
 from data_fetcher.manager import DataFetcher
+from main import SmartMoneyScanner
 
 
 class TestDataFrameTTLCache(unittest.TestCase):
@@ -53,6 +56,85 @@ class TestDataFrameTTLCache(unittest.TestCase):
         self.assertIsNone(self.cache.get('daily', key, ttl_seconds=3600))
         self.assertFalse(path.exists())
 
+    def test_expiry_is_judged_from_the_manifest(self):
+        key = ('TEST', '20260801', '20260810')
+        self.cache.set('daily', key, self.frame)
+        time.sleep(0.001)
+        with patch('data_fetcher.cache.gzip.open') as read:
+            self.assertIsNone(self.cache.get('daily', key, ttl_seconds=0))
+        read.assert_not_called()
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+        self.cache.set('daily', key, self.frame)
+        with patch('data_fetcher.cache.time.time', return_value=time.time() + 7200):
+            self.assertEqual(self.cache.clear_expired(3600), 1)
+        self.assertFalse(self.cache._path('daily', key).exists())
+
+    def test_least_recently_used_entries_are_evicted_over_quota(self):
+        self.cache.set('daily', ('probe',), self.frame)
+        size = self.cache.stats()['bytes']
+        cache = DataFrameTTLCache(self.temporary.name, max_bytes=2 * size + size // 2)
+        cache.ACCESS_RESOLUTION = 0
+        cache.delete('daily', ('probe',))
+
+        cache.set('daily', ('a',), self.frame)
+        cache.set('daily', ('b',), self.frame)
+        self.assertIsNotNone(cache.get('daily', ('a',), 3600))
+        cache.set('disclosure', ('c',), self.frame)
+
+        self.assertIsNotNone(cache.get('daily', ('a',), 3600))
+        self.assertIsNone(cache.get('daily', ('b',), 3600))
+        self.assertFalse(cache._path('daily', ('b',)).exists())
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 2)
+        self.assertLessEqual(stats['bytes'], cache.max_bytes)
+        self.assertEqual(stats['namespaces']['disclosure']['entries'], 1)
+
+    def test_running_total_tracks_writes_replacements_and_deletes(self):
+        def total():
+            with self.cache._manifest() as connection:
+                return connection.execute('SELECT bytes FROM totals').fetchone()[0]
+
+        self.cache.set('daily', ('a',), self.frame)
+        self.cache.set('daily', ('b',), self.frame)
+        self.cache.set('daily', ('a',), pd.concat([self.frame] * 20, ignore_index=True))
+        self.assertEqual(total(), self.cache.stats()['bytes'])
+        self.cache.delete('daily', ('b',))
+        self.assertEqual(total(), self.cache.stats()['bytes'])
+        with patch('data_fetcher.cache.time.time', return_value=time.time() + 7200):
+            self.cache.clear_expired(3600)
+        self.assertEqual(total(), 0)
+
+    def test_manifests_without_a_running_total_are_upgraded(self):
+        key = ('TEST', '20260801', '20260810')
+        self.cache.set('daily', key, self.frame)
+        with self.cache._manifest() as connection:
+            for trigger in ('insert', 'delete', 'update'):
+                connection.execute(f'DROP TRIGGER entries_total_{trigger}')
+            connection.execute('DROP TABLE totals')
+            connection.execute('PRAGMA user_version = 1')
+
+        upgraded = DataFrameTTLCache(self.temporary.name, max_bytes=1)
+        with upgraded._manifest() as connection:
+            self.assertEqual(
+                connection.execute('SELECT bytes FROM totals').fetchone()[0],
+                self.cache._path('daily', key).stat().st_size,
+            )
+        upgraded.set('daily', ('other',), self.frame)
+        self.assertIsNone(upgraded.get('daily', key, 3600))
+        self.assertEqual(upgraded.stats()['entries'], 1)
+
+    def test_files_from_before_the_manifest_are_indexed(self):
+        key = ('TEST', '20260801', '20260810')
+        self.cache.set('daily', key, self.frame)
+        self.cache.manifest_path.unlink()
+
+        upgraded = DataFrameTTLCache(self.temporary.name)
+        pd.testing.assert_frame_equal(upgraded.get('daily', key, 3600), self.frame)
+        self.assertEqual(upgraded.stats()['namespaces'], {
+            'daily': {'entries': 1, 'bytes': self.cache._path('daily', key).stat().st_size},
+        })
+
 
 class TestDataFetcherPersistentCache(unittest.TestCase):
     def test_second_fetcher_uses_disk_without_provider_call(self):
@@ -86,5 +168,259 @@ class TestDataFetcherPersistentCache(unittest.TestCase):
             pd.testing.assert_frame_equal(restored, expected)
 
 
+class TestMemoryTTLCache(unittest.TestCase):
+    def test_lru_eviction_and_ttl(self):
+        cache = MemoryTTLCache(max_entries=2, ttl_seconds=3600)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(len(cache), 2)
+
+        expiring = MemoryTTLCache(ttl_seconds=0)
+        expiring.set('a', 1)
+        time.sleep(0.001)
+        self.assertIsNone(expiring.get('a'))
+
+
+class TestScanResultCache(unittest.TestCase):
+    def setUp(self):
+        self.scanner = SmartMoneyScanner()
+        self.scanner.result_cache = MemoryTTLCache(ttl_seconds=3600)
+        self.frame = self._frame(pd.Timestamp('2026-08-07'))
+
+    @staticmethod
+    def _frame(last_date):
+        dates = pd.bdate_range(end=last_date, periods=80)
+        close = pd.Series(range(100, 180), dtype=float)
+        return pd.DataFrame({
+            'date': dates, 'open': close, 'high': close + 1, 'low': close - 1,
+            'close': close, 'volume': 1000.0, 'amount': close * 1000.0,
+        })
+
+    def _scan(self, frame, **kwargs):
+        with patch.object(
+            self.scanner.data_fetcher, 'get_daily_data', return_value=frame
+        ), patch('main.analyze_price_volume', return_value={}) as analyze:
+            result = self.scanner.scan_stock(
+                'AAPL', period=80, analyze_structure=False, **kwargs
+            )
+        return result, analyze.call_count
+
+    def test_repeat_request_is_served_from_cache(self):
+        first, calls = self._scan(self.frame, use_cache=True)
+        second, cached_calls = self._scan(self.frame, use_cache=True)
+        self.assertEqual(calls, 1)
+        self.assertEqual(cached_calls, 0)
+        self.assertIs(first, second)
+
+    def test_new_bar_or_weight_change_invalidates(self):
+        self._scan(self.frame, use_cache=True)
+        _, calls = self._scan(
+            self._frame(pd.Timestamp('2026-08-10')), use_cache=True
+        )
+        self.assertEqual(calls, 1)
+
+        with patch.dict(config.SIGNAL_WEIGHTS, {'RSP_STRONG': 2}):
+            _, calls = self._scan(self.frame, use_cache=True)
+        self.assertEqual(calls, 1)
+
+    def test_slim_result_drops_frame_but_keeps_summary(self):
+        full, _ = self._scan(self.frame, use_cache=True)
+        slim, calls = self._scan(self.frame, use_cache=True, keep_data=False)
+
+        self.assertEqual(calls, 0)
+        self.assertIn('data', full)
+        self.assertNotIn('data', slim)
+        self.assertEqual(slim['data_info']['last_date'], '2026-08-07')
+        self.assertEqual(slim['score'], full['score'])
+
+        with patch.object(
+            self.scanner.data_fetcher, 'get_daily_data', return_value=self.frame
+        ):
+            frame = self.scanner.load_frame('AAPL', period=80)
+        self.assertEqual(list(frame.columns), list(full['data'].columns))
+
+    def test_cache_is_opt_in(self):
+        self._scan(self.frame)
+        _, calls = self._scan(self.frame)
+        self.assertEqual(calls, 1)
+
+
+class TestScannerWarmUp(unittest.TestCase):
+    def test_warm_up_primes_benchmarks_and_names(self):
+        scanner = SmartMoneyScanner()
+        fetcher = scanner.data_fetcher
+        frame = TestScanResultCache._frame(pd.Timestamp('2026-08-07'))
+        with patch.object(fetcher, 'get_daily_data', return_value=frame) as daily, \
+                patch.object(fetcher, 'calculate_technical_indicators') as indicators, \
+                patch.object(fetcher, 'get_stock_name', side_effect=lambda t: {'AAPL': '苹果'}.get(t, t)):
+            summary = scanner.warm_up(period=120, tickers=['AAPL', 'UNKNOWN', 'aapl'])
+
+        benchmarks = set(config.MARKET_BENCHMARKS.values())
+        self.assertEqual(set(summary['benchmarks']), benchmarks)
+        self.assertEqual(daily.call_count, len(benchmarks))
+        daily.assert_called_with(daily.call_args.args[0], period=120)
+        indicators.assert_called_once()
+        self.assertEqual(summary['names'], 1)
+        self.assertEqual(summary['errors'], [])
+
+
+
+class TestDisclosureCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings = SimpleNamespace(
+            A_STOCK_DATA_SOURCE='tushare',
+            CACHE_ENABLED=True,
+            PERSISTENT_CACHE_ENABLED=True,
+            CACHE_DIR=self.directory.name,
+            TUSHARE_TOKEN='',
+            QUANT_ENGINE='native',
+            AKSHARE_ENABLED=False,
+            DISCLOSURE_CACHE_TTL_HOURS={'shareholder_count': 1.0},
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @staticmethod
+    def _counts(*periods):
+        return pd.DataFrame({
+            'ts_code': '600519.SH',
+            'end_date': list(periods),
+            'holder_num': [1000 + index for index in range(len(periods))],
+        })
+
+    def _fetch(self, frame, clock=None):
+        fetcher = DataFetcher(self.settings)
+        later = patch('data_fetcher.cache.time.time', return_value=clock) if clock else nullcontext()
+        with later, patch.object(
+            fetcher, '_get_shareholder_count_tushare', return_value=frame
+        ) as provider:
+            result = fetcher.get_shareholder_count('600519.SH')
+        return result, provider
+
+    def test_disclosures_are_shared_across_fetchers_and_returned_as_copies(self):
+        period = DataFetcher._report_period().strftime('%Y%m%d')
+        first, provider = self._fetch(self._counts(period, '20240331'))
+        first['holder_num'] = 0
+        second, cached_provider = self._fetch(pd.DataFrame())
+
+        provider.assert_called_once()
+        cached_provider.assert_not_called()
+        self.assertEqual(second['holder_num'].tolist(), [1000, 1001])
+
+    def test_only_data_missing_the_latest_period_is_revalidated_after_ttl(self):
+        current = DataFetcher._report_period().strftime('%Y%m%d')
+        self._fetch(self._counts(current))
+        _, complete = self._fetch(pd.DataFrame(), clock=time.time() + 7200)
+        complete.assert_not_called()
+
+        fetcher = DataFetcher(self.settings)
+        fetcher.revalidate_disclosures('600519.SH', ['shareholder_count'])
+        self._fetch(self._counts('20240331'))
+        _, stale = self._fetch(self._counts('20240331'), clock=time.time() + 7200)
+        stale.assert_called_once()
+
+    def test_explicit_report_date_is_part_of_the_key(self):
+        fetcher = DataFetcher(self.settings)
+        holdings = pd.DataFrame({'end_date': ['20231231'], 'holder_name': ['Fund A']})
+        with patch.object(fetcher, '_get_a_stock_holders', return_value=holdings) as provider:
+            fetcher.get_institutional_holdings('600519.SH', '20231231')
+            fetcher.get_institutional_holdings('600519.SH', '20231231')
+            fetcher.get_institutional_holdings('600519.SH', '20240331')
+
+        self.assertEqual(provider.call_count, 2)
+
+
+
+class TestNegativeResultCache(unittest.TestCase):
+    def test_consecutive_misses_escalate_and_persist(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = DataFrameTTLCache(directory)
+            cache = NegativeResultCache(60, 200, store=store)
+            now = time.time()
+
+            first = cache.add('DEAD', 'no data')
+            with patch('data_fetcher.cache.time.time', return_value=now + 61):
+                self.assertIsNone(cache.get('DEAD'))
+                second = cache.add('DEAD', 'still no data')
+            with patch('data_fetcher.cache.time.time', return_value=now + 211):
+                third = NegativeResultCache(60, 200, store=store).add('DEAD', 'no data')
+
+            self.assertEqual(first['failures'], 1)
+            self.assertAlmostEqual(first['until'] - now, 60, delta=1)
+            self.assertEqual(second['failures'], 2)
+            self.assertAlmostEqual(second['until'] - (now + 61), 120, delta=1)
+            self.assertEqual(third['failures'], 3)
+            self.assertAlmostEqual(third['until'] - (now + 211), 200, delta=1)
+            with patch('data_fetcher.cache.time.time', return_value=third['until'] + 201):
+                self.assertEqual(cache.add('DEAD', 'relisted?')['failures'], 1)
+
+            restored = NegativeResultCache(60, 200, store=store)
+            self.assertEqual(restored.get('DEAD')['reason'], 'relisted?')
+            restored.discard('DEAD')
+            self.assertIsNone(NegativeResultCache(60, 200, store=store).get('DEAD'))
+
+    def test_discard_in_another_process_takes_effect_at_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            monitor = NegativeResultCache(60, 200, store=DataFrameTTLCache(directory))
+            worker = NegativeResultCache(60, 200, store=DataFrameTTLCache(directory))
+            monitor.add('FLAKY', 'no data')
+            self.assertIsNotNone(worker.get('FLAKY'))
+
+            monitor.discard('FLAKY')
+
+            self.assertIsNone(worker.get('FLAKY'))
+            self.assertEqual(worker.add('FLAKY', 'no data')['failures'], 1)
+
+
+class TestDataFetcherUnavailableTickers(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.fetcher = DataFetcher(SimpleNamespace(
+            CACHE_ENABLED=True,
+            PERSISTENT_CACHE_ENABLED=True,
+            CACHE_DIR=self.directory.name,
+            TUSHARE_TOKEN='',
+            QUANT_ENGINE='native',
+            AKSHARE_ENABLED=False,
+        ))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_empty_lookups_are_skipped_until_the_ttl_expires(self):
+        with patch.object(self.fetcher, '_get_us_stock_daily', return_value=pd.DataFrame()) as provider:
+            self.fetcher.get_daily_data('DEAD', period=30)
+            self.fetcher.get_daily_data('DEAD', period=30)
+            # Explicit historical windows always reach the providers.
+            self.fetcher.get_daily_data('DEAD', '20200101', '20200301')
+
+        self.assertEqual(provider.call_count, 2)
+        self.assertIn('US_STOCK', self.fetcher.unavailable_reason('DEAD'))
+
+        frame = TestScanResultCache._frame(pd.Timestamp('2026-08-07'))
+        with patch('data_fetcher.cache.time.time', return_value=time.time() + 2 * 86400), \
+                patch.object(self.fetcher, '_get_us_stock_daily', return_value=frame):
+            self.fetcher.get_daily_data('DEAD', period=30)
+        self.assertIsNone(self.fetcher.unavailable_reason('DEAD'))
+
+    def test_batch_skips_rate_limit_for_unavailable_tickers(self):
+        scanner = SmartMoneyScanner()
+        with patch.object(scanner.data_fetcher, 'unavailable_reason', return_value='delisted'), \
+                patch.object(scanner.data_fetcher.scheduler, 'context') as slot, \
+                patch.object(scanner, 'scan_stock') as scan:
+            result = scanner._scan_batch_item('DEAD', 30, False)
+
+        slot.assert_not_called()
+        scan.assert_not_called()
+        self.assertEqual(result, {
+            'ticker': 'DEAD', 'success': False, 'error': '无法获取数据', 'reason': 'delisted',
+        })
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,121 @@
+"""Tests for the compact daily bar representation."""
+
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from data_fetcher.compact import (
+    PRICE_RTOL,
+    compact_bars,
+    day_ordinals,
+    from_day_ordinals,
+    is_compact,
+)
+from data_fetcher.manager import DataFetcher
+from data_fetcher.shared_bars import COMPACT_RECORD_DTYPE, SharedBarStore
+from main import SmartMoneyScanner
+
+
+def _bars(periods=300, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, periods)))
+    return pd.DataFrame({
+        'date': pd.bdate_range(end='2026-08-07', periods=periods),
+        'open': close * (1 + rng.normal(0, 0.005, periods)),
+        'high': close * 1.02,
+        'low': close * 0.98,
+        'close': close,
+        'volume': rng.integers(1_000, 10_000, periods).astype(float),
+        'amount': close * 5_000.0,
+    })
+
+
+class TestCompactBars(unittest.TestCase):
+    def test_prices_are_float32_within_tolerance_and_volume_is_integer(self):
+        frame = _bars()
+        compact = compact_bars(frame)
+
+        self.assertTrue(is_compact(compact))
+        self.assertEqual(compact['close'].dtype, np.float32)
+        self.assertEqual(compact['volume'].dtype, np.int32)
+        self.assertEqual(compact['date'].dtype, frame['date'].dtype)
+        for column in ('open', 'high', 'low', 'close', 'amount'):
+            np.testing.assert_allclose(compact[column], frame[column], rtol=PRICE_RTOL)
+        np.testing.assert_array_equal(compact['volume'], frame['volume'])
+        self.assertIs(compact_bars(compact), compact)
+        self.assertEqual(frame['close'].dtype, np.float64)
+
+    def test_volume_falls_back_to_wider_types(self):
+        frame = _bars(periods=3)
+        large = compact_bars(frame.assign(volume=[1.0, 3e9, 2.0]))
+        self.assertEqual(large['volume'].dtype, np.int64)
+        self.assertEqual(large['volume'].iloc[1], 3_000_000_000)
+
+        partial = compact_bars(frame.assign(volume=[1.0, np.nan, 2.5]))
+        self.assertEqual(partial['volume'].dtype, np.float32)
+        self.assertFalse(is_compact(partial))
+
+    def test_day_ordinals_round_trip(self):
+        dates = pd.DatetimeIndex(['1990-12-19', '2026-08-07'])
+        ordinals = day_ordinals(dates)
+        self.assertEqual(ordinals.dtype, np.int32)
+        self.assertEqual(ordinals[0], (dates[0] - pd.Timestamp('1970-01-01')).days)
+        self.assertTrue(from_day_ordinals(ordinals).equals(dates))
+
+
+class TestCompactSharedBars(unittest.TestCase):
+    def test_compact_frames_use_the_compact_record_layout(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = SharedBarStore(directory)
+            key = ('AAPL', '20260101', '20260807')
+            for tz in (None, 'America/New_York'):
+                frame = compact_bars(_bars(periods=5))
+                if tz:
+                    frame['date'] = frame['date'].dt.tz_localize(tz)
+                store.set(key, frame)
+                path = store._path(store._digest(key))
+                self.assertEqual(np.load(path, mmap_mode='r').dtype, COMPACT_RECORD_DTYPE)
+                pd.testing.assert_frame_equal(store.get(key, 3600), frame)
+
+
+class TestDataFetcherCompactBars(unittest.TestCase):
+    def test_fetched_and_cached_frames_are_compact(self):
+        fetcher = DataFetcher(SimpleNamespace(
+            CACHE_ENABLED=True,
+            PERSISTENT_CACHE_ENABLED=False,
+            COMPACT_BARS_ENABLED=True,
+            TUSHARE_TOKEN='',
+            QUANT_ENGINE='native',
+            AKSHARE_ENABLED=False,
+        ))
+        with patch.object(fetcher, '_get_us_stock_daily', return_value=_bars(periods=5)):
+            fetched = fetcher.get_daily_data('AAPL', '20260801', '20260810')
+            cached = fetcher.get_daily_data('AAPL', '20260801', '20260810')
+
+        self.assertTrue(is_compact(fetched))
+        self.assertTrue(is_compact(cached))
+
+    def test_compact_frames_give_the_same_score(self):
+        frame = _bars()
+        scanner = SmartMoneyScanner()
+        with patch.object(scanner.data_fetcher, 'get_daily_data', return_value=frame):
+            full = scanner.scan_stock('AAPL', period=300, analyze_structure=False)
+        with patch.object(
+            scanner.data_fetcher, 'get_daily_data', return_value=compact_bars(frame)
+        ):
+            compact = scanner.scan_stock('AAPL', period=300, analyze_structure=False)
+
+        self.assertEqual(compact['score'], full['score'])
+        self.assertEqual(compact['rating'], full['rating'])
+        self.assertEqual(compact['triggered_signals'].keys(), full['triggered_signals'].keys())
+        np.testing.assert_allclose(
+            compact['data']['ma20'].dropna(), full['data']['ma20'].dropna(), rtol=1e-6
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@
 import unittest
 import sys
 import os
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pandas as pd
 
@@ -63,6 +63,50 @@ class TestDataFetcher(unittest.TestCase):
         # 应该返回原始代码
         self.assertEqual(name, invalid_ticker)
 
+    def test_resolved_stock_names_are_cached(self):
+        """成功解析的名称进入证券名称表，失败结果不缓存"""
+        with patch.object(self.fetcher, '_get_a_stock_name', return_value='贵州茅台') as lookup:
+            self.assertEqual(self.fetcher.get_stock_name('600519.SH'), '贵州茅台')
+            self.assertEqual(self.fetcher.get_stock_name('600519.SH'), '贵州茅台')
+        lookup.assert_called_once()
+
+        with patch.object(self.fetcher, '_get_a_stock_name', return_value='000001.SZ') as lookup:
+            self.fetcher.get_stock_name('000001.SZ')
+            self.fetcher.get_stock_name('000001.SZ')
+        self.assertEqual(lookup.call_count, 2)
+
+    def test_spot_snapshot_is_normalized_to_pool_tickers(self):
+        """全市场快照代码转换为股票池格式并统一列名"""
+        a_share = DataFetcher._normalize_spot_snapshot(pd.DataFrame({
+            '代码': ['600519', '000001', '300750'],
+            '名称': ['贵州茅台', '平安银行', '宁德时代'],
+            '最新价': [1500.0, 10.0, None],
+            '今开': [1490.0, 9.9, 200.0],
+            '最高': [1510.0, 10.1, 201.0],
+            '最低': [1480.0, 9.8, 199.0],
+            '成交量': [1000, 2000, 3000],
+            '成交额': [1.5e6, 2.0e4, 6.0e5],
+        }), 'A_STOCK')
+        self.assertEqual(list(a_share['ticker']), ['600519.SH', '000001.SZ'])
+        self.assertEqual(a_share.iloc[0]['close'], 1500.0)
+        # A股快照成交量以手计，换算为股后与日线历史单位一致
+        self.assertEqual(list(a_share['volume']), [100000.0, 200000.0])
+
+        hong_kong = DataFetcher._normalize_spot_snapshot(
+            pd.DataFrame({
+                '代码': ['00700'], '名称': ['腾讯控股'], '最新价': [380.0], '成交量': [1.2e7],
+            }),
+            'HK_STOCK',
+        )
+        self.assertEqual(list(hong_kong['ticker']), ['0700.HK'])
+        self.assertEqual(hong_kong.iloc[0]['volume'], 1.2e7)
+
+        us = DataFetcher._normalize_spot_snapshot(
+            pd.DataFrame({'代码': ['105.AAPL'], '名称': ['苹果'], '最新价': [230.0]}),
+            'US_STOCK',
+        )
+        self.assertEqual(list(us['ticker']), ['AAPL'])
+
     def test_us_stock_name_mapping(self):
         """测试美股名称映射"""
         # 测试常见美股的中文名称
@@ -206,6 +250,22 @@ class TestDataFetcher(unittest.TestCase):
         yfinance.assert_called_once_with('AAPL', '20260801', '20260810')
         pd.testing.assert_frame_equal(result, expected)
 
+    def test_yfinance_request_includes_the_end_date(self):
+        """yfinance 的 end 为开区间，请求时需顺延一天才能拿到结束交易日"""
+        bars = pd.DataFrame({
+            'Open': [100.0], 'High': [101.0], 'Low': [99.0], 'Close': [100.5], 'Volume': [500.0],
+        }, index=pd.DatetimeIndex(pd.to_datetime(['2026-08-07']), name='Date'))
+        yfinance = Mock()
+        yfinance.Ticker.return_value.history.return_value = bars
+
+        with patch.dict('sys.modules', {'yfinance': yfinance}):
+            result = self.fetcher._get_stock_daily_yfinance('AAPL', '20260801', '20260807')
+
+        yfinance.Ticker.return_value.history.assert_called_once_with(
+            start='2026-08-01', end='2026-08-08', timeout=self.fetcher.request_timeout
+        )
+        self.assertTrue(DataFetcher._covers_session(result, pd.Timestamp('2026-08-07')))
+
     def test_market_indexes_use_akshare_sina(self):
         """美股和港股基准指数也应避开 Yahoo 限流。"""
         source = pd.DataFrame({
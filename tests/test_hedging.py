@@ -0,0 +1,169 @@
+"""Tests for hedged requests across redundant daily-bar providers."""
+
+import os
+import signal
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+
+from data_fetcher.hedging import LatencyTracker, ProviderHedger
+from data_fetcher.manager import DataFetcher
+
+
+def _frame(close):
+    return pd.DataFrame({
+        'date': pd.to_datetime(['2026-08-07']),
+        'open': [close], 'high': [close], 'low': [close],
+        'close': [close], 'volume': [1000.0], 'amount': [close * 1000.0],
+    })
+
+
+class TestLatencyTracker(unittest.TestCase):
+    def test_delay_follows_recent_percentile_within_bounds(self):
+        tracker = LatencyTracker(
+            percentile=95, window=20, min_samples=5,
+            default_delay=1.0, min_delay=0.1, max_delay=3.0,
+        )
+        for seconds in (0.2, 0.2, 0.2, 0.2):
+            tracker.record('tencent', seconds)
+        self.assertEqual(tracker.delay('tencent'), 1.0)
+
+        tracker.record('tencent', 0.6)
+        self.assertAlmostEqual(tracker.delay('tencent'), 0.52)
+
+        for _ in range(20):
+            tracker.record('tencent', 0.01)
+        self.assertEqual(tracker.delay('tencent'), 0.1)
+        for _ in range(20):
+            tracker.record('slow', 10.0)
+        self.assertEqual(tracker.delay('slow'), 3.0)
+
+
+class TestProviderHedger(unittest.TestCase):
+    def setUp(self):
+        self.hedger = ProviderHedger(LatencyTracker(default_delay=0.05, min_delay=0.0), max_workers=4)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.hedger.close()
+
+    def _slow(self, frame):
+        def call():
+            self.release.wait(5)
+            return frame
+        return call
+
+    def test_slow_primary_is_hedged_by_the_secondary(self):
+        secondary = _frame(2.0)
+        frame, provider = self.hedger.fetch([
+            ('primary', self._slow(_frame(1.0))),
+            ('secondary', lambda: secondary),
+        ])
+
+        self.assertEqual(provider, 'secondary')
+        pd.testing.assert_frame_equal(frame, secondary)
+
+    def test_failed_primary_hands_over_without_waiting(self):
+        self.hedger.tracker.default_delay = 5.0
+        calls = []
+
+        def broken():
+            calls.append('primary')
+            raise ConnectionError('reset')
+
+        started = time.monotonic()
+        frame, provider = self.hedger.fetch([
+            ('primary', broken),
+            ('empty', pd.DataFrame),
+            ('tertiary', lambda: _frame(3.0)),
+        ])
+
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(provider, 'tertiary')
+        self.assertEqual(frame['close'].iloc[0], 3.0)
+        self.assertEqual(calls, ['primary'])
+
+    def test_fast_primary_never_starts_the_secondary(self):
+        secondary = []
+        self.hedger.tracker.default_delay = 5.0
+        frame, provider = self.hedger.fetch([
+            ('primary', lambda: _frame(1.0)),
+            ('secondary', lambda: secondary.append(1) or _frame(2.0)),
+        ])
+
+        self.assertEqual(provider, 'primary')
+        self.assertEqual(secondary, [])
+        self.assertEqual(len(self.hedger.tracker._samples['primary']), 1)
+
+    def test_exhausted_chain_returns_empty_or_reraises(self):
+        frame, provider = self.hedger.fetch([('a', pd.DataFrame), ('b', pd.DataFrame)])
+        self.assertTrue(frame.empty)
+        self.assertIsNone(provider)
+
+        def broken():
+            raise TimeoutError('read timed out')
+
+        with self.assertRaises(TimeoutError):
+            self.hedger.fetch([('a', broken), ('b', pd.DataFrame)])
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires os.fork')
+    def test_forked_child_gets_its_own_pool(self):
+        self.hedger.fetch([('primary', lambda: _frame(1.0))])
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - runs in the child
+            signal.alarm(5)
+            try:
+                frame, provider = self.hedger.fetch([('primary', lambda: _frame(2.0))])
+                os._exit(0 if provider == 'primary' and frame['close'].iloc[0] == 2.0 else 1)
+            except BaseException:
+                os._exit(2)
+        _, status = os.waitpid(pid, 0)
+
+        self.assertTrue(os.WIFEXITED(status), 'child fetch hung')
+        self.assertEqual(os.WEXITSTATUS(status), 0)
+        frame, provider = self.hedger.fetch([('primary', lambda: _frame(3.0))])
+        self.assertEqual(frame['close'].iloc[0], 3.0)
+
+
+class TestDataFetcherHedging(unittest.TestCase):
+    def test_daily_data_uses_the_first_provider_to_answer(self):
+        fetcher = DataFetcher(SimpleNamespace(
+            CACHE_ENABLED=False,
+            TUSHARE_TOKEN='',
+            QUANT_ENGINE='native',
+            AKSHARE_ENABLED=False,
+            HEDGED_REQUESTS_ENABLED=True,
+            HEDGE_DEFAULT_DELAY_SECONDS=0.05,
+            HEDGE_MIN_DELAY_SECONDS=0.0,
+        ))
+        release = threading.Event()
+        expected = _frame(100.0)
+
+        def slow_akshare(*args):
+            release.wait(5)
+            return _frame(99.0)
+
+        self.assertEqual(
+            [name for name, _ in fetcher._daily_providers('US_STOCK')],
+            ['akshare_sina_us', 'yfinance'],
+        )
+        try:
+            with patch.object(fetcher, '_get_us_stock_daily_akshare', side_effect=slow_akshare), \
+                    patch.object(fetcher, '_get_stock_daily_yfinance', return_value=expected) as yfinance:
+                result = fetcher.get_daily_data('AAPL', '20260801', '20260810')
+        finally:
+            release.set()
+            fetcher.hedger.close()
+
+        yfinance.assert_called_once_with('AAPL', '20260801', '20260810')
+        pd.testing.assert_frame_equal(result, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Tests for the bounded background job queue."""
+
+import threading
+import time
+import unittest
+
+from jobs import JobQueue, JobQueueFull
+
+
+def wait_until_done(job, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not job.done and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return job
+
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.queue = JobQueue(max_workers=1, max_pending=1, history_limit=10)
+
+    def tearDown(self):
+        self.queue.shutdown()
+
+    def test_progress_partial_results_and_final_result(self):
+        def target(job):
+            for index in range(3):
+                job.report({'index': index}, index + 1, 3)
+            return {'count': 3}
+
+        job = wait_until_done(self.queue.submit('batch', target, total=3))
+
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(job.result, {'count': 3})
+        self.assertEqual(job.partial_results(1), [{'index': 1}, {'index': 2}])
+        status = job.to_dict()
+        self.assertEqual(status['progress']['completed'], 3)
+        self.assertEqual(status['progress']['ratio'], 1.0)
+
+    def test_failure_is_recorded(self):
+        def target(_job):
+            raise ValueError('no data')
+
+        job = wait_until_done(self.queue.submit('backtest', target))
+        self.assertEqual(job.status, 'failed')
+        self.assertEqual(job.error, 'no data')
+
+    def test_queue_is_bounded_and_queued_jobs_cancel_immediately(self):
+        release = threading.Event()
+        running = self.queue.submit('batch', lambda job: release.wait(2))
+        queued = self.queue.submit('batch', lambda job: 'unreachable')
+
+        with self.assertRaises(JobQueueFull):
+            self.queue.submit('batch', lambda job: None)
+
+        self.queue.cancel(queued.id)
+        self.assertEqual(queued.status, 'cancelled')
+        release.set()
+        wait_until_done(running)
+        self.assertEqual(running.status, 'succeeded')
+        self.assertIsNone(queued.result)
+
+    def test_running_job_cancels_cooperatively(self):
+        started = threading.Event()
+
+        def target(job):
+            started.set()
+            job.cancel_event.wait(2)
+            return None
+
+        job = self.queue.submit('batch', target)
+        started.wait(1)
+        self.queue.cancel(job.id)
+        wait_until_done(job)
+        self.assertEqual(job.status, 'cancelled')
+
+    def test_unknown_job_returns_none(self):
+        self.assertIsNone(self.queue.get('missing'))
+        self.assertIsNone(self.queue.cancel('missing'))
+
+
+if __name__ == '__main__':
+    unittest.main()
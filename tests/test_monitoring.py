@@ -1,13 +1,26 @@
 """Tests for scheduled market scans and duplicate-safe alerts."""
 
+import json
 import tempfile
+import threading
+import time
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta
+from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from zoneinfo import ZoneInfo
 
-from monitoring import EndOfDayMonitor, MonitorState
+import pandas as pd
+
+from data_fetcher.trading_calendar import TradingCalendar
+from monitoring import (
+    EndOfDayMonitor,
+    IntradayMonitor,
+    MonitorState,
+    NotificationRouter,
+    WebhookNotifier,
+)
 
 
 class TestEndOfDayMonitor(unittest.TestCase):
@@ -47,6 +60,32 @@ class TestEndOfDayMonitor(unittest.TestCase):
         saturday = datetime(2026, 8, 8, 18, 0, tzinfo=ZoneInfo('Asia/Shanghai'))
         self.assertEqual(self.monitor.due_markets(saturday), [])
 
+    def test_prefetch_runs_once_before_each_scan(self):
+        shanghai = ZoneInfo('Asia/Shanghai')
+        before_a_close = datetime(2026, 8, 10, 15, 10, tzinfo=shanghai)
+        self.assertEqual(self.monitor.due_prefetches(before_a_close), [])
+
+        self.monitor.prefetch_enabled = True
+        self.scanner.data_fetcher.trading_calendar.side_effect = TradingCalendar.for_market
+        self.scanner.prefetch.return_value = {'bars': 1}
+        self.assertEqual(self.monitor.due_prefetches(before_a_close), ['A_STOCK'])
+
+        self.monitor.prefetch_market('A_STOCK', before_a_close)
+        # The 15:30 scan reads bars for a session that has not closed at 15:10.
+        self.scanner.prefetch.assert_called_once_with(
+            ['600519.SH'], period=250, bars=False, disclosures=False,
+            names=False, priority='background',
+        )
+        self.assertEqual(self.monitor.due_prefetches(before_a_close), [])
+
+        before_us_scan = datetime(2026, 8, 11, 6, 10, tzinfo=shanghai)
+        self.assertEqual(self.monitor.due_prefetches(before_us_scan), ['US_STOCK'])
+        self.monitor.prefetch_market('US_STOCK', before_us_scan)
+        self.assertTrue(self.scanner.prefetch.call_args.kwargs['bars'])
+        self.assertEqual(
+            self.monitor.due_prefetches(datetime(2026, 8, 11, 6, 30, tzinfo=shanghai)), []
+        )
+
     def test_only_configured_ratings_alert_and_duplicates_are_suppressed(self):
         self.scanner.scan_batch.return_value = {
             '600519.SH': {
@@ -69,6 +108,366 @@ class TestEndOfDayMonitor(unittest.TestCase):
         self.assertEqual(payload['rating'], 'STRONG_BUY')
         self.assertTrue(self.monitor.state.was_run('A_STOCK', '2026-08-10'))
 
+    def test_markets_run_concurrently_with_cached_index_and_timings(self):
+        both_running = threading.Barrier(2, timeout=2)
+
+        def scan_batch(tickers, **_kwargs):
+            both_running.wait()
+            return {ticker: {'success': True, 'rating': 'NEUTRAL'} for ticker in tickers}
+
+        self.scanner.scan_batch.side_effect = scan_batch
+        now = datetime(2026, 8, 10, 16, 0, tzinfo=ZoneInfo('Asia/Shanghai'))
+
+        results = self.monitor.run_once(['A_STOCK', 'US_STOCK'], now)
+        self.monitor.run_once(['A_STOCK', 'US_STOCK'], now)
+
+        self.assertEqual(list(results['A_STOCK']), ['600519.SH'])
+        self.assertEqual(list(results['US_STOCK']), ['AAPL'])
+        self.assertEqual(self.scanner.data_fetcher._detect_market.call_count, 2)
+        self.assertTrue(self.monitor.timings['A_STOCK']['within_window'])
+        self.assertIsNotNone(self.monitor.timings['A_STOCK']['deadline'])
+        # A manual US run at 16:00 is outside the 06:30 post-close window.
+        self.assertIsNone(self.monitor.timings['US_STOCK']['deadline'])
+
+    def test_reused_results_do_not_alert(self):
+        self.scanner.scan_batch.return_value = {
+            '600519.SH': {
+                'success': True, 'rating': 'STRONG_BUY', 'score': 7, 'reused': True,
+            },
+        }
+        now = datetime(2026, 8, 10, 16, 0, tzinfo=ZoneInfo('Asia/Shanghai'))
+
+        self.monitor.run_market('A_STOCK', now)
+
+        self.notifier.send.assert_not_called()
+        self.assertIs(
+            self.scanner.scan_batch.call_args.kwargs['result_cache'],
+            self.monitor.state.results,
+        )
+
+
+class TestIntradayMonitor(unittest.TestCase):
+    def setUp(self):
+        self.temporary = tempfile.TemporaryDirectory()
+        self.config = SimpleNamespace(
+            MONITOR_TIMEZONE='Asia/Shanghai',
+            MONITOR_SCHEDULES={},
+            MONITOR_INTRADAY_SESSIONS={
+                'A_STOCK': '09:30-11:30,13:00-15:00',
+                'US_STOCK': '21:30-05:00',
+            },
+            ALERT_RATINGS=('STRONG_BUY', 'STRONG_SELL'),
+            MONITOR_STATE_PATH=f'{self.temporary.name}/state.sqlite3',
+            MONITOR_PERIOD=250,
+            BATCH_MAX_WORKERS=2,
+            STOCK_POOL=['600519.SH', '000001.SZ'],
+        )
+        self.scanner = Mock()
+        self.scanner.data_fetcher._detect_market.return_value = 'A_STOCK'
+        self.scanner.data_fetcher.get_daily_data.return_value = pd.DataFrame({
+            'date': pd.to_datetime(['2026-08-06', '2026-08-07', '2026-08-10']),
+            'open': [10.0, 10.5, 11.0],
+            'high': [11.0, 11.5, 11.2],
+            'low': [9.5, 10.0, 10.8],
+            'close': [10.5, 11.0, 11.1],
+            'volume': [1000.0, 1200.0, 300.0],
+        })
+        self.snapshot = pd.DataFrame({
+            'ticker': ['600519.SH', '000001.SZ', '688981.SH'],
+            'close': [12.0, 9.0, 50.0],
+            'open': [11.2, 9.1, 49.0],
+            'high': [12.1, 9.2, 51.0],
+            'low': [11.1, 8.9, 48.0],
+            'volume': [2500.0, 800.0, 100.0],
+        })
+        self.scanner.data_fetcher.get_spot_snapshot.return_value = self.snapshot
+        self.notifier = Mock()
+        self.monitor = IntradayMonitor(
+            self.scanner,
+            self.config,
+            notifier=self.notifier,
+            state=MonitorState(self.config.MONITOR_STATE_PATH),
+        )
+        self.now = datetime(2026, 8, 10, 10, 0, tzinfo=ZoneInfo('Asia/Shanghai'))
+
+    def tearDown(self):
+        self.temporary.cleanup()
+
+    def test_session_date_handles_breaks_weekends_and_midnight_wrap(self):
+        tz = ZoneInfo('Asia/Shanghai')
+        monday = datetime(2026, 8, 10, 10, 0, tzinfo=tz).date()
+        self.assertEqual(self.monitor.session_date('A_STOCK', self.now), monday)
+        self.assertIsNone(
+            self.monitor.session_date('A_STOCK', datetime(2026, 8, 10, 12, 0, tzinfo=tz))
+        )
+        self.assertIsNone(
+            self.monitor.session_date('A_STOCK', datetime(2026, 8, 8, 10, 0, tzinfo=tz))
+        )
+        # The US session opened on Friday evening in Shanghai and runs into Saturday.
+        self.assertEqual(
+            self.monitor.session_date('US_STOCK', datetime(2026, 8, 8, 2, 0, tzinfo=tz)),
+            datetime(2026, 8, 7).date(),
+        )
+        self.assertIsNone(
+            self.monitor.session_date('US_STOCK', datetime(2026, 8, 10, 2, 0, tzinfo=tz))
+        )
+
+    def _scan_by_close(self, strong_closes):
+        threads = []
+
+        def scan_stock(ticker, period, analyze_structure=True, data=None, keep_data=True):
+            threads.append(threading.current_thread().name)
+            close = float(data['close'].iloc[-1])
+            return {
+                'success': True, 'ticker': ticker, 'score': 5,
+                'rating': 'STRONG_BUY' if close in strong_closes else 'NEUTRAL',
+                'data_info': {'last_close': close},
+            }
+
+        self.scanner.scan_stock.side_effect = scan_stock
+        return threads
+
+    def test_poll_uses_one_snapshot_and_alerts_on_rating_transition(self):
+        threads = self._scan_by_close({12.5})
+
+        self.monitor.poll_market('A_STOCK', now=self.now)
+        self.notifier.send.assert_not_called()
+        self.snapshot.loc[0, 'close'] = 12.5
+        self.monitor.poll_market('A_STOCK', now=self.now)
+
+        self.assertEqual(self.scanner.data_fetcher.get_spot_snapshot.call_count, 2)
+        # History is loaded once per ticker and session; only the snapshot is polled.
+        self.assertEqual(self.scanner.data_fetcher.get_daily_data.call_count, 2)
+        frame = next(
+            call.kwargs['data'] for call in self.scanner.scan_stock.call_args_list
+            if call.args[0] == '600519.SH'
+        )
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(frame['date'].iloc[-1], pd.Timestamp('2026-08-10'))
+        self.assertEqual(frame['close'].iloc[-1], 12.0)
+        self.assertTrue(all(name.startswith('intraday-rescore') for name in threads))
+
+        self.notifier.send.assert_called_once()
+        payload = self.notifier.send.call_args.args[0]
+        self.assertEqual(payload['event'], 'smart_money_intraday_transition')
+        self.assertEqual(payload['ticker'], '600519.SH')
+        self.assertEqual(payload['previous_rating'], 'NEUTRAL')
+        self.assertEqual(payload['price'], 12.5)
+        self.assertTrue(payload['provisional'])
+
+    def test_tickers_with_unchanged_quotes_are_not_rescored(self):
+        self._scan_by_close(set())
+        self.monitor.poll_market('A_STOCK', now=self.now)
+        self.snapshot.loc[1, 'volume'] = 900.0
+        results = self.monitor.poll_market('A_STOCK', now=self.now)
+
+        rescored = [call.args[0] for call in self.scanner.scan_stock.call_args_list]
+        self.assertEqual(sorted(rescored), ['000001.SZ', '000001.SZ', '600519.SH'])
+        self.assertTrue(results['600519.SH']['reused'])
+        self.assertNotIn('reused', results['000001.SZ'])
+
+        # A new session rescores everything again.
+        self.monitor.poll_market('A_STOCK', now=self.now + timedelta(days=1))
+        self.assertEqual(self.scanner.scan_stock.call_count, 5)
+
+
+class TestMonitorState(unittest.TestCase):
+    def setUp(self):
+        self.temporary = tempfile.TemporaryDirectory()
+        self.path = Path(self.temporary.name) / 'state.sqlite3'
+
+    def tearDown(self):
+        self.temporary.cleanup()
+
+    def test_batch_commits_once_and_persists(self):
+        state = MonitorState(str(self.path))
+        with patch.object(state, '_connect', wraps=state._connect) as connect:
+            with state.batch():
+                for index in range(50):
+                    state.mark_alerted(f'2026-08-10:T{index}:STRONG_BUY')
+                state.mark_run('A_STOCK', '2026-08-10')
+                self.assertTrue(state.was_alerted('2026-08-10:T7:STRONG_BUY'))
+                connect.assert_not_called()
+        # One commit plus one retention sweep.
+        self.assertEqual(connect.call_count, 2)
+
+        reopened = MonitorState(str(self.path))
+        self.assertTrue(reopened.was_alerted('2026-08-10:T49:STRONG_BUY'))
+        self.assertTrue(reopened.was_run('A_STOCK', '2026-08-10'))
+
+    def test_retention_is_time_based(self):
+        state = MonitorState(str(self.path), retention_days=1)
+        with patch('monitoring.state.time.time', return_value=time.time() - 3 * 86400):
+            state.mark_alerted('old')
+        state.mark_alerted('recent')
+        self.assertFalse(state.was_alerted('old'))
+        self.assertTrue(state.was_alerted('recent'))
+        self.assertFalse(MonitorState(str(self.path), retention_days=1).was_alerted('old'))
+
+    def test_legacy_json_state_is_migrated(self):
+        legacy = Path(self.temporary.name) / 'state.json'
+        today = datetime.now().date().isoformat()
+        legacy.write_text(json.dumps({
+            'runs': {'US_STOCK': today},
+            'alerts': [f'{today}:AAPL:STRONG_BUY', '2001-01-02:OLD:STRONG_SELL'],
+        }), encoding='utf-8')
+
+        state = MonitorState(str(legacy))
+
+        self.assertEqual(state.path.suffix, '.sqlite3')
+        self.assertTrue(state.was_run('US_STOCK', today))
+        self.assertTrue(state.was_alerted(f'{today}:AAPL:STRONG_BUY'))
+        self.assertFalse(state.was_alerted('2001-01-02:OLD:STRONG_SELL'))
+        self.assertFalse(legacy.exists())
+
+
+class TestTickerResultStore(unittest.TestCase):
+    def setUp(self):
+        from main import SmartMoneyScanner
+
+        self.temporary = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.temporary.name) / 'state.sqlite3')
+        self.scanner = SmartMoneyScanner()
+        dates = pd.bdate_range(end='2026-08-07', periods=80)
+        close = pd.Series(range(100, 180), dtype=float)
+        self.frame = pd.DataFrame({
+            'date': dates, 'open': close, 'high': close + 1, 'low': close - 1,
+            'close': close, 'volume': 1000.0, 'amount': close * 1000.0,
+        })
+
+    def tearDown(self):
+        self.temporary.cleanup()
+
+    def _scan(self, store, frame):
+        with patch.object(
+            self.scanner.data_fetcher, 'get_daily_data', return_value=frame
+        ), patch('main.analyze_price_volume', return_value={}) as analyze:
+            result = self.scanner.scan_stock(
+                'AAPL', period=80, analyze_structure=False, result_cache=store
+            )
+        return result, analyze.call_count
+
+    def test_unchanged_bar_reuses_persisted_result(self):
+        state = MonitorState(self.path)
+        first, calls = self._scan(state.results, self.frame)
+        self.assertEqual(calls, 1)
+        self.assertNotIn('reused', first)
+        state.save()
+
+        reopened = MonitorState(self.path)
+        reused, calls = self._scan(reopened.results, self.frame)
+        self.assertEqual(calls, 0)
+        self.assertTrue(reused['reused'])
+        self.assertEqual(reused['rating'], first['rating'])
+
+        revised = self.frame.copy()
+        revised.loc[revised.index[-1], 'close'] += 1.0
+        fresh, calls = self._scan(reopened.results, revised)
+        self.assertEqual(calls, 1)
+        self.assertNotIn('reused', fresh)
+
+
+class RecordingNotifier:
+    def __init__(self, release=None):
+        self.batches = []
+        self.release = release
+
+    def send_batch(self, payloads):
+        if self.release is not None:
+            self.release.wait(2)
+        self.batches.append(list(payloads))
+
+
+class TestNotificationRouter(unittest.TestCase):
+    def test_async_send_does_not_wait_for_slow_channels(self):
+        release = threading.Event()
+        channel = RecordingNotifier(release)
+        router = NotificationRouter([channel], asynchronous=True, batch_window_seconds=0)
+
+        started = time.monotonic()
+        router.send({'ticker': 'AAPL'})
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(channel.batches, [])
+
+        release.set()
+        self.assertTrue(router.close(timeout=2))
+        self.assertEqual(channel.batches, [[{'ticker': 'AAPL'}]])
+
+    def test_queued_alerts_are_batched_and_buffer_is_bounded(self):
+        release = threading.Event()
+        channel = RecordingNotifier(release)
+        router = NotificationRouter(
+            [channel], asynchronous=True, queue_size=3, batch_size=10,
+            batch_window_seconds=0,
+        )
+        router.send({'ticker': 'first'})
+        deadline = time.monotonic() + 2
+        while router._queue.qsize() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        for index in range(5):
+            router.send({'ticker': index})
+
+        self.assertEqual(router.dropped, 2)
+        release.set()
+        router.close(timeout=2)
+        self.assertEqual(channel.batches[1], [{'ticker': 0}, {'ticker': 1}, {'ticker': 2}])
+
+    def test_channel_failure_does_not_stop_other_channels(self):
+        failing = Mock(spec=['send'])
+        failing.send.side_effect = RuntimeError('down')
+        channel = RecordingNotifier()
+        NotificationRouter([failing, channel]).send({'ticker': 'AAPL'})
+        self.assertEqual(channel.batches, [[{'ticker': 'AAPL'}]])
+
+
+class TestWebhookNotifier(unittest.TestCase):
+    def test_retries_transient_status_with_backoff(self):
+        notifier = WebhookNotifier('https://hooks.test', max_retries=2, backoff_seconds=0.5)
+        notifier._session = Mock()
+        notifier._session.post.side_effect = [
+            Mock(status_code=503), Mock(status_code=200),
+        ]
+        with patch('monitoring.notifiers.time.sleep') as sleep:
+            notifier.send({'ticker': 'AAPL'})
+        self.assertEqual(notifier._session.post.call_count, 2)
+        sleep.assert_called_once_with(0.5)
+
+    def test_batches_alerts_into_one_envelope(self):
+        notifier = WebhookNotifier('https://hooks.test', batch_size=2)
+        notifier._session = Mock()
+        notifier._session.post.return_value = Mock(status_code=200)
+        notifier.send_batch([{'ticker': 'A'}, {'ticker': 'B'}, {'ticker': 'C'}])
+
+        bodies = [call.kwargs['json'] for call in notifier._session.post.call_args_list]
+        self.assertEqual([body['count'] for body in bodies], [2, 1])
+        self.assertEqual(bodies[0]['alerts'][1], {'ticker': 'B'})
+
+    def test_failed_post_does_not_drop_the_rest_of_the_batch(self):
+        import requests
+
+        notifier = WebhookNotifier('https://hooks.test', max_retries=0, batch_size=1)
+        notifier._session = Mock()
+        notifier._session.post.side_effect = [
+            requests.ConnectionError('refused'), Mock(status_code=200), Mock(status_code=200),
+        ]
+        with self.assertLogs('monitoring.notifiers', level='ERROR') as logs:
+            notifier.send_batch([{'ticker': 'A'}, {'ticker': 'B'}, {'ticker': 'C'}])
+
+        self.assertEqual(notifier._session.post.call_count, 3)
+        self.assertIn('A', logs.output[0])
+
+        notifier = WebhookNotifier('https://hooks.test', max_retries=0, batch_size=2)
+        notifier._session = Mock()
+        notifier._session.post.side_effect = [
+            requests.ConnectionError('refused'), Mock(status_code=200),
+        ]
+        with self.assertLogs('monitoring.notifiers', level='ERROR') as logs:
+            notifier.send_batch([{'ticker': 'A'}, {'ticker': 'B'}, {'ticker': 'C'}])
+
+        bodies = [call.kwargs['json'] for call in notifier._session.post.call_args_list]
+        self.assertEqual(bodies[1]['alerts'], [{'ticker': 'C'}])
+        self.assertIn('2 alert(s) A, B', logs.output[0])
+
 
 if __name__ == '__main__':
     unittest.main()
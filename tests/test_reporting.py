@@ -0,0 +1,79 @@
+"""
+报告生成单元测试
+测试延迟渲染与多格式输出
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+from reporting.generator import LazyReport, ReportGenerator
+
+
+class TestLazyReport(unittest.TestCase):
+    """延迟报告测试类"""
+
+    def setUp(self):
+        """测试前设置"""
+        self.generator = ReportGenerator(config)
+        self.score_result = {
+            'score': 6.5,
+            'rating': 'STRONG_BUY',
+            'signal_count': 2,
+            'inflow_count': 1,
+            'outflow_count': 1,
+            'inflow_signals': {
+                'OBV_BULLISH_DIVERGENCE': {
+                    'weight': 3,
+                    'data': {'description': 'OBV 底背离', 'signal_date': datetime(2026, 8, 7)},
+                },
+            },
+            'outflow_signals': {
+                'RSP_WEAK': {'weight': -1, 'data': {'details': {'rsp': 0.9}}},
+            },
+            'data_info': {'record_count': 250},
+        }
+
+    def test_report_is_rendered_only_on_first_read(self):
+        """创建时不渲染，首次读取后缓存"""
+        with patch.object(self.generator, 'generate_report', wraps=self.generator.generate_report) as render:
+            report = self.generator.lazy_report('600519.SH', self.score_result, '建议关注')
+            render.assert_not_called()
+
+            text = str(report)
+            self.assertIs(report.text, text)
+        render.assert_called_once()
+
+        self.assertIn('[+3] OBV 看涨背离', text)
+        self.assertIn('[-1] 相对强度疲弱', text)
+        self.assertIn('信号日期: 2026-08-07', text)
+        self.assertIn('建议关注', text)
+
+    def test_lazy_formats_share_the_analysis_time(self):
+        """文本/JSON/HTML 使用创建时的分析时间，且与直接生成的文本一致"""
+        report = self.generator.lazy_report('600519.SH', self.score_result, '建议关注')
+
+        self.assertEqual(
+            report.text,
+            self.generator.generate_report(
+                '600519.SH', self.score_result, '建议关注', report.analysis_time
+            ),
+        )
+        self.assertEqual(report.to_json()['analysis_time'], report.analysis_time.isoformat())
+        self.assertEqual(report.to_json()['rating'], 'STRONG_BUY')
+        self.assertIn('data-rating="STRONG_BUY"', report.to_html())
+        self.assertIn('&lt;', LazyReport(
+            self.generator, 'A<B', self.score_result, '<script>', report.analysis_time
+        ).to_html())
+        with self.assertRaises(ValueError):
+            report.render('pdf')
+
+
+if __name__ == '__main__':
+    unittest.main()
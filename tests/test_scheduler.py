@@ -0,0 +1,128 @@
+"""Tests for the process-wide, priority-aware fetch scheduler."""
+
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+
+from data_fetcher.manager import DataFetcher
+from data_fetcher.scheduler import FetchScheduler
+
+
+class TestFetchScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = FetchScheduler(budget=1, interactive_reserve=0)
+        self.order = []
+        self.lock = threading.Lock()
+
+    def _fetch(self, name, priority, caller=None, market='A_STOCK'):
+        def run():
+            with self.scheduler.context(priority, caller), self.scheduler.slot(market):
+                with self.lock:
+                    self.order.append(name)
+        return threading.Thread(target=run)
+
+    def _queue_behind_blocker(self, fetches):
+        """Hold the only slot until every fetch is waiting, then release it."""
+        release = threading.Event()
+        holding = threading.Event()
+
+        def blocker():
+            with self.scheduler.slot('A_STOCK'):
+                holding.set()
+                release.wait(5)
+
+        threads = [threading.Thread(target=blocker)]
+        threads[0].start()
+        holding.wait(5)
+        for fetch in fetches:
+            fetch.start()
+            threads.append(fetch)
+            # Start in a known order so arrival order is deterministic.
+            self._wait_for_waiting(len(threads) - 1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+    def _wait_for_waiting(self, count):
+        deadline = time.monotonic() + 5
+        while sum(self.scheduler.stats()['waiting'].values()) < count:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+
+    def test_interactive_fetch_jumps_queued_batch_work(self):
+        self._queue_behind_blocker([
+            self._fetch('monitor', 'background'),
+            self._fetch('batch-1', 'batch', 'job'),
+            self._fetch('batch-2', 'batch', 'job'),
+            self._fetch('analyze', 'interactive'),
+        ])
+
+        self.assertEqual(self.order, ['analyze', 'batch-1', 'batch-2', 'monitor'])
+
+    def test_concurrent_batches_alternate(self):
+        self._queue_behind_blocker([
+            self._fetch('big-1', 'batch', 'big'),
+            self._fetch('big-2', 'batch', 'big'),
+            self._fetch('big-3', 'batch', 'big'),
+            self._fetch('small-1', 'batch', 'small'),
+        ])
+
+        self.assertEqual(self.order, ['big-1', 'small-1', 'big-2', 'big-3'])
+
+    def test_interactive_reserve_admits_lookups_over_a_full_budget(self):
+        scheduler = FetchScheduler(budget=1, interactive_reserve=1)
+        admitted = threading.Event()
+        with scheduler.context('batch', 'job'), scheduler.slot('A_STOCK'):
+            def lookup():
+                with scheduler.slot('US_STOCK'):
+                    admitted.set()
+
+            thread = threading.Thread(target=lookup)
+            thread.start()
+            self.assertTrue(admitted.wait(1))
+            thread.join(1)
+
+    def test_market_rate_limit_spaces_fetch_starts(self):
+        scheduler = FetchScheduler(budget=4, rate_limits={'US_STOCK': 0.05})
+        started = []
+        for market in ('US_STOCK', 'US_STOCK', 'A_STOCK'):
+            with scheduler.slot(market):
+                started.append(time.monotonic())
+
+        self.assertGreaterEqual(started[1] - started[0], 0.045)
+        self.assertLess(started[2] - started[1], 0.045)
+
+    def test_unknown_priority_is_rejected(self):
+        with self.assertRaises(ValueError):
+            with self.scheduler.context('urgent'):
+                pass
+
+
+class TestDataFetcherScheduling(unittest.TestCase):
+    def test_only_provider_fetches_take_a_slot(self):
+        fetcher = DataFetcher(SimpleNamespace(
+            CACHE_ENABLED=True,
+            PERSISTENT_CACHE_ENABLED=False,
+            TUSHARE_TOKEN='',
+            QUANT_ENGINE='native',
+            AKSHARE_ENABLED=False,
+        ))
+        frame = pd.DataFrame({
+            'date': pd.to_datetime(['2026-08-07']),
+            'open': [1.0], 'high': [1.0], 'low': [1.0],
+            'close': [1.0], 'volume': [1.0], 'amount': [1.0],
+        })
+        with patch.object(fetcher.scheduler, 'slot', wraps=fetcher.scheduler.slot) as slot, \
+                patch.object(fetcher, '_get_us_stock_daily', return_value=frame):
+            fetcher.get_daily_data('AAPL', '20260801', '20260810')
+            fetcher.get_daily_data('AAPL', '20260801', '20260810')
+
+        slot.assert_called_once_with('US_STOCK')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,12 +6,19 @@
 import unittest
 import sys
 import os
+from types import SimpleNamespace
+from unittest.mock import patch
 
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import numpy as np
+import pandas as pd
+
 import config
 from aggregator.scorer import SignalAggregator
+from analysis.signal_plan import SignalPlan, compile_signal_plan
+from main import SmartMoneyScanner
 
 
 class TestSignalAggregator(unittest.TestCase):
@@ -237,5 +244,122 @@ class TestRatingDetermination(unittest.TestCase):
                 f"评分 {score} 应该对应评级 {expected_rating}，但得到了 {rating}")
 
 
+class TestBatchScoring(unittest.TestCase):
+    """批量向量化评分测试"""
+
+    def setUp(self):
+        """测试前设置"""
+        self.aggregator = SignalAggregator(config)
+
+    def test_matrix_matches_per_observation_scoring(self):
+        """向量化评分与逐条 calculate_score 结果一致"""
+        names = list(config.SIGNAL_WEIGHTS)
+        rng = np.random.default_rng(7)
+        matrix = rng.random((200, len(names))) < 0.15
+        frame = pd.DataFrame(matrix, columns=names)
+
+        scores, ratings = self.aggregator.score_matrix(frame)
+
+        for row in range(len(frame)):
+            expected = self.aggregator.calculate_score({
+                name: {} for name in frame.columns[matrix[row]]
+            })
+            self.assertEqual(scores[row], expected['score'])
+            self.assertEqual(ratings[row], expected['rating'])
+
+    def test_signal_lists_and_ndarray_input(self):
+        """信号名列表转矩阵，未知信号忽略，ndarray 需提供列名"""
+        frame = self.aggregator.signal_matrix([
+            ['OBV_BULLISH_DIVERGENCE', 'UNKNOWN_SIGNAL'],
+            [],
+        ])
+        scores, ratings = self.aggregator.score_matrix(frame)
+        weight = config.SIGNAL_WEIGHTS['OBV_BULLISH_DIVERGENCE']
+        self.assertEqual(list(scores), [weight, 0])
+        self.assertEqual(ratings[1], 'NEUTRAL')
+
+        array_scores, _ = self.aggregator.score_matrix(
+            frame.to_numpy(), signal_names=list(frame.columns)
+        )
+        np.testing.assert_array_equal(array_scores, scores)
+        with self.assertRaises(ValueError):
+            self.aggregator.score_matrix(frame.to_numpy())
+
+    def test_rate_scores_matches_boundaries(self):
+        """向量化评级与逐个 _determine_rating 一致 (含区间间隙)"""
+        scores = np.arange(-10, 10.5, 0.5)
+        expected = [self.aggregator._determine_rating(score) for score in scores]
+        self.assertEqual(list(self.aggregator.rate_scores(scores)), expected)
+
+
+class TestSignalPlan(unittest.TestCase):
+    """编译信号计划测试"""
+
+    def _config(self, **overrides):
+        settings = {
+            name: getattr(config, name)
+            for name in ('SIGNAL_WEIGHTS', 'SCORE_TO_RATING', 'PV_PARAMS',
+                         'INDICATOR_PARAMS', 'RELATIVE_STRENGTH_PARAMS')
+        }
+        settings.update(overrides)
+        return SimpleNamespace(**settings)
+
+    def test_default_plan_needs_only_used_indicators(self):
+        """默认配置只需要检测器读取的指标，无计分信号的检测器不启用"""
+        plan = SignalPlan(config)
+
+        self.assertEqual(set(plan.indicators), {'ma20', 'ma60', 'ma120', 'obv', 'mfi', 'rsi', 'macd'})
+        self.assertEqual(plan.min_bars, max(config.PV_PARAMS['support_ma_periods']))
+        self.assertTrue(plan.uses('price_volume'))
+        self.assertFalse(plan.uses('relative_strength'))
+
+    def test_unweighted_detectors_are_skipped(self):
+        """权重表中没有的信号不检测，对应指标也不计算"""
+        weights = {
+            name: weight for name, weight in config.SIGNAL_WEIGHTS.items()
+            if not name.startswith(('OBV_', 'WYCKOFF_', 'BREAK_SUPPORT'))
+        }
+        plan = SignalPlan(self._config(SIGNAL_WEIGHTS=weights))
+
+        self.assertNotIn('obv', plan.indicators)
+        self.assertFalse(any(name[2:].isdigit() for name in plan.indicators))
+        with patch.object(plan.indicator_signals, 'detect_obv_bullish_divergence') as detect:
+            plan.indicator_signals.analyze(pd.DataFrame({'close': [1.0]}))
+        detect.assert_not_called()
+
+    def test_plan_is_recompiled_only_when_settings_change(self):
+        """配置未变化时复用已编译计划"""
+        plan = SignalPlan(config)
+        self.assertIs(compile_signal_plan(config, plan), plan)
+
+        changed = self._config(SCORE_TO_RATING={'BUY': (1, 10)})
+        self.assertIsNot(compile_signal_plan(changed, plan), plan)
+
+    def test_minimal_indicators_give_the_same_score(self):
+        """只计算计划所需指标时，评分与完整指标一致，且不请求基准行情"""
+        rng = np.random.default_rng(11)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 300)))
+        frame = pd.DataFrame({
+            'date': pd.bdate_range(end='2026-08-07', periods=300),
+            'open': close * (1 + rng.normal(0, 0.005, 300)),
+            'high': close * 1.02,
+            'low': close * 0.98,
+            'close': close,
+            'volume': rng.integers(1_000, 10_000, 300).astype(float),
+        })
+        scanner = SmartMoneyScanner()
+        with patch.object(scanner.data_fetcher, 'get_daily_data', return_value=frame) as fetch:
+            full = scanner.scan_stock('AAPL', period=300, analyze_structure=False)
+            slim = scanner.scan_stock(
+                'AAPL', period=300, analyze_structure=False, keep_data=False
+            )
+
+        self.assertEqual(fetch.call_count, 2)
+        self.assertIn('ma250', full['data'].columns)
+        self.assertEqual(slim['score'], full['score'])
+        self.assertEqual(slim['rating'], full['rating'])
+        self.assertEqual(slim['triggered_signals'].keys(), full['triggered_signals'].keys())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,160 @@
+"""Tests for the host-wide shared daily bar store."""
+
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+
+from data_fetcher.manager import DataFetcher
+from data_fetcher.shared_bars import SharedBarStore
+
+KEY = ('AAPL', '20260801', '20260810')
+
+
+def _frame(dates=('2026-08-06', '2026-08-07'), tz=None):
+    return pd.DataFrame({
+        'date': pd.to_datetime(list(dates)).tz_localize(tz) if tz else pd.to_datetime(list(dates)),
+        'open': [1.0, 2.0], 'high': [1.5, 2.5], 'low': [0.5, 1.5],
+        'close': [1.2, 2.2], 'volume': [1000, 2000], 'amount': [1200.0, 4400.0],
+    })
+
+
+class TestSharedBarStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SharedBarStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip_keeps_values_dtypes_and_time_zone(self):
+        for tz in (None, 'America/New_York'):
+            frame = _frame(tz=tz)
+            self.assertTrue(self.store.set(KEY, frame))
+            loaded = self.store.get(KEY, 3600)
+            pd.testing.assert_frame_equal(loaded, frame)
+            loaded.loc[0, 'close'] = 99.0
+            self.assertEqual(self.store.get(KEY, 3600)['close'].iloc[0], 1.2)
+
+        self.assertEqual(self.store.stats(), {'frames': 1, 'rows': 2})
+
+    def test_frames_without_the_bar_layout_are_not_stored(self):
+        frame = _frame()
+        self.assertFalse(self.store.set(KEY, frame.assign(turnover=1.0)))
+        self.assertFalse(self.store.set(KEY, frame[['close', 'date']]))
+        self.assertIsNone(self.store.get(KEY, 3600))
+
+    def test_expired_frames_are_served_only_when_complete(self):
+        self.store.set(KEY, _frame())
+        with patch('data_fetcher.shared_bars.time.time', return_value=time.time() + 7200):
+            self.assertIsNotNone(self.store.get(KEY, 3600, complete=lambda frame: True))
+            self.assertIsNone(self.store.get(KEY, 3600, complete=lambda frame: False))
+        self.assertIsNone(self.store.get(KEY, 3600))
+
+    def test_stale_frames_are_dropped_on_write(self):
+        self.store.set(('MSFT', '20260101', '20260110'), _frame())
+        with patch('data_fetcher.shared_bars.time.time', return_value=time.time() + 8 * 86400):
+            self.store.set(KEY, _frame())
+        self.assertEqual(self.store.stats()['frames'], 1)
+
+    def test_lock_files_of_stale_frames_are_removed(self):
+        stale_key = ('MSFT', '20260101', '20260110')
+        with self.store.fetch_lock(stale_key):
+            self.store.set(stale_key, _frame())
+        lock_path = self.store._lock_path(self.store._digest(stale_key))
+        self.assertTrue(lock_path.exists())
+        with patch('data_fetcher.shared_bars.time.time', return_value=time.time() + 8 * 86400):
+            self.store.set(KEY, _frame())
+        self.assertFalse(lock_path.exists())
+
+    def test_fetch_locks_of_different_keys_do_not_block_each_other(self):
+        # A key that shared a lock stripe with KEY when locks were striped.
+        stripe = int(self.store._digest(KEY)[:8], 16) % 256
+        other_key = next(
+            key for key in (('MSFT', '20260801', str(index)) for index in range(100_000))
+            if int(self.store._digest(key)[:8], 16) % 256 == stripe
+        )
+        other_process = SharedBarStore(self.directory.name)
+        held, release = threading.Event(), threading.Event()
+
+        def hold():
+            with self.store.fetch_lock(KEY):
+                held.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        try:
+            self.assertTrue(held.wait(5))
+            for store in (self.store, other_process):
+                acquired = []
+                lookup = threading.Thread(
+                    target=lambda s=store: acquired.append(self._lock_briefly(s, other_key))
+                )
+                lookup.start()
+                lookup.join(1)
+                self.assertEqual(acquired, [other_key])
+        finally:
+            release.set()
+            holder.join(5)
+        self.assertEqual(self.store._locks, {})
+
+    @staticmethod
+    def _lock_briefly(store, key):
+        with store.fetch_lock(key):
+            return key
+
+
+class TestDataFetcherSharedBars(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.config = SimpleNamespace(
+            CACHE_ENABLED=True,
+            PERSISTENT_CACHE_ENABLED=False,
+            SHARED_BAR_STORE_ENABLED=True,
+            SHARED_BAR_STORE_DIR=self.directory.name,
+            TUSHARE_TOKEN='',
+            QUANT_ENGINE='native',
+            AKSHARE_ENABLED=False,
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_fetchers_sharing_a_directory_fetch_each_key_once(self):
+        # Separate instances hold separate lock files, as separate processes do.
+        fetchers = [DataFetcher(self.config) for _ in range(3)]
+        calls = []
+        frame = _frame()
+
+        def slow_fetch(*args):
+            calls.append(args)
+            time.sleep(0.05)
+            return frame
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda f=fetcher: results.append(
+                f.get_daily_data('AAPL', '20260801', '20260810')
+            ))
+            for fetcher in fetchers
+        ]
+        with patch.object(DataFetcher, '_get_us_stock_daily', side_effect=slow_fetch):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 3)
+        for result in results:
+            pd.testing.assert_frame_equal(result, frame)
+        self.assertTrue(all(not fetcher._daily_data_cache for fetcher in fetchers))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+"""Tests for per-market trading calendars and calendar-keyed daily fetches."""
+
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from data_fetcher.cache import DataFrameTTLCache
+from data_fetcher.manager import DataFetcher
+from data_fetcher.trading_calendar import TradingCalendar
+
+SHANGHAI = ZoneInfo('Asia/Shanghai')
+
+
+class TestTradingCalendar(unittest.TestCase):
+    def test_market_holiday_rules(self):
+        nyse = TradingCalendar.for_market('US_STOCK')
+        self.assertFalse(nyse.is_session('2026-04-03'))  # Good Friday
+        self.assertFalse(nyse.is_session('2026-06-19'))  # Juneteenth
+        self.assertFalse(nyse.is_session('2026-07-03'))  # Independence Day observed
+        self.assertFalse(nyse.is_session('2026-11-26'))  # Thanksgiving
+        self.assertTrue(nyse.is_session('2021-06-18'))   # before Juneteenth was added
+
+        hkex = TradingCalendar.for_market('HK_STOCK', holidays=['2026-02-17'])
+        self.assertFalse(hkex.is_session('2026-02-17'))
+        self.assertEqual(
+            [day.strftime('%m-%d') for day in hkex.sessions('2022-12-23', '2022-12-29')],
+            ['12-23', '12-28', '12-29'],
+        )
+
+        sse = TradingCalendar.for_market('A_STOCK')
+        self.assertEqual(
+            [day.strftime('%m-%d') for day in sse.sessions('2026-09-30', '2026-10-09')],
+            ['09-30', '10-08', '10-09'],
+        )
+
+    def test_last_completed_session_waits_for_close_and_skips_weekends(self):
+        calendar = TradingCalendar.for_market('A_STOCK')
+        monday_morning = datetime(2026, 8, 10, 10, 0, tzinfo=SHANGHAI)
+        monday_evening = datetime(2026, 8, 10, 16, 0, tzinfo=SHANGHAI)
+
+        self.assertEqual(calendar.last_completed_session(monday_morning), pd.Timestamp('2026-08-07'))
+        self.assertEqual(calendar.last_completed_session(monday_evening), pd.Timestamp('2026-08-10'))
+        self.assertFalse(calendar.has_traded_since('2026-08-07', monday_morning))
+        self.assertTrue(calendar.has_traded_since('2026-08-07', monday_evening))
+
+        # US close is judged in New York time: Saturday morning in Shanghai is Friday evening there.
+        nyse = TradingCalendar.for_market('US_STOCK')
+        saturday = datetime(2026, 8, 8, 6, 30, tzinfo=SHANGHAI)
+        self.assertEqual(nyse.last_completed_session(saturday), pd.Timestamp('2026-08-07'))
+
+    def test_window_start_counts_sessions(self):
+        calendar = TradingCalendar.for_market('A_STOCK')
+        start = calendar.window_start('2026-10-11', 5)
+
+        self.assertEqual(start, pd.Timestamp('2026-09-28'))
+        self.assertEqual(len(calendar.sessions(start, '2026-10-11')), 5)
+
+    def test_provider_sessions_replace_rules_inside_their_span(self):
+        calendar = TradingCalendar.for_market('A_STOCK').with_sessions(
+            ['2026-02-13', '2026-02-23', '2026-02-24']
+        )
+
+        self.assertFalse(calendar.is_session('2026-02-16'))  # Spring Festival
+        self.assertTrue(calendar.is_session('2026-02-24'))
+        self.assertFalse(calendar.is_session('2026-10-01'))  # rule outside the span
+
+
+class TestDataFetcherCalendar(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.settings = SimpleNamespace(
+            A_STOCK_DATA_SOURCE='akshare',
+            CACHE_ENABLED=True,
+            PERSISTENT_CACHE_ENABLED=True,
+            CACHE_DIR=self.directory.name,
+            CACHE_EXPIRY_DAYS=1,
+            TUSHARE_TOKEN='',
+            QUANT_ENGINE='native',
+            AKSHARE_ENABLED=False,
+        )
+        self.frame = pd.DataFrame({
+            'date': pd.to_datetime(['2026-08-06', '2026-08-07']),
+            'open': [10.0, 10.5], 'high': [11.0, 11.5], 'low': [9.5, 10.0],
+            'close': [10.5, 11.0], 'volume': [1000.0, 1200.0], 'amount': [0.0, 0.0],
+        })
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _fetch_at(self, fetcher, moment, **kwargs):
+        calendar = fetcher.trading_calendar('US_STOCK')
+        session = calendar.last_completed_session(moment)
+        with patch.object(calendar, 'last_completed_session', return_value=session):
+            return fetcher.get_daily_data('TEST', **kwargs)
+
+    def test_weekend_requests_share_the_last_session_key(self):
+        fetcher = DataFetcher(self.settings)
+        saturday = datetime(2026, 8, 8, 12, 0, tzinfo=ZoneInfo('America/New_York'))
+        sunday = datetime(2026, 8, 9, 12, 0, tzinfo=ZoneInfo('America/New_York'))
+
+        with patch.object(fetcher, '_get_us_stock_daily', return_value=self.frame) as provider:
+            self._fetch_at(fetcher, saturday, period=5)
+            self._fetch_at(fetcher, sunday, period=5)
+
+        provider.assert_called_once_with('TEST', '20260803', '20260807')
+
+    def test_expired_cache_covering_the_last_session_is_reused(self):
+        fetcher = DataFetcher(self.settings)
+        saturday = datetime(2026, 8, 8, 12, 0, tzinfo=ZoneInfo('America/New_York'))
+        with patch.object(fetcher, '_get_us_stock_daily', return_value=self.frame):
+            self._fetch_at(fetcher, saturday, period=5)
+
+        later = DataFetcher(self.settings)
+        with patch('data_fetcher.cache.time.time', return_value=time.time() + 3 * 86400), \
+                patch.object(later, '_get_us_stock_daily') as provider:
+            restored = self._fetch_at(later, saturday, period=5)
+
+        provider.assert_not_called()
+        self.assertEqual(restored['close'].tolist(), [10.5, 11.0])
+
+    def test_a_share_sessions_load_once_from_tushare(self):
+        fetcher = DataFetcher(self.settings)
+        fetcher.ts_api = Mock()
+        fetcher.ts_api.trade_cal.return_value = pd.DataFrame({
+            'cal_date': ['20260213', '20260223', '20260224'],
+        })
+
+        self.assertFalse(fetcher.trading_calendar('A_STOCK').is_session('2026-02-16'))
+        fetcher.trading_calendar('A_STOCK')
+        fetcher.ts_api.trade_cal.assert_called_once()
+
+        restored = DataFetcher(self.settings)
+        restored.ts_api = Mock()
+        self.assertFalse(restored.trading_calendar('A_STOCK').is_session('2026-02-16'))
+        restored.ts_api.trade_cal.assert_not_called()
+
+
+class TestDataFrameTTLCacheCompleteness(unittest.TestCase):
+    def test_incomplete_expired_frames_are_dropped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = DataFrameTTLCache(directory)
+            cache.set('daily', ('key',), pd.DataFrame({'value': [1]}))
+
+            self.assertIsNotNone(cache.get('daily', ('key',), 0, complete=lambda frame: True))
+            time.sleep(0.01)
+            self.assertIsNone(cache.get('daily', ('key',), 0, complete=lambda frame: False))
+            self.assertEqual(os.listdir(os.path.join(directory, 'daily')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
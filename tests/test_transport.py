@@ -0,0 +1,72 @@
+"""Tests for the shared pooled HTTP transport."""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from data_fetcher.transport import HTTPTransport
+from monitoring import WebhookNotifier
+
+
+class TestHTTPTransport(unittest.TestCase):
+    def test_session_is_pooled_with_retries_and_default_timeout(self):
+        transport = HTTPTransport.from_config(SimpleNamespace(
+            DATA_REQUEST_TIMEOUT=7, HTTP_POOL_SIZE=12, HTTP_RETRIES=3, HTTP_BACKOFF_JITTER=0.25,
+        ))
+        session = transport.session
+        adapter = session.get_adapter('https://quotes.example.com/')
+
+        self.assertIs(transport.session, session)
+        self.assertIs(session.get_adapter('http://other.example.com/'), adapter)
+        self.assertEqual(adapter._pool_maxsize, 12)
+        self.assertEqual(adapter.max_retries.total, 3)
+        self.assertEqual(adapter.max_retries.jitter, 0.25)
+
+        response = requests.Response()
+        response.status_code = 200
+        with patch.object(HTTPAdapter, 'send', return_value=response) as send:
+            transport.get('https://quotes.example.com/a')
+            transport.get('https://quotes.example.com/b', timeout=2)
+        self.assertEqual([call.kwargs['timeout'] for call in send.call_args_list], [7.0, 2])
+
+        transport.close()
+        self.assertIsNot(transport.session, session)
+
+    def test_webhooks_share_the_transport_session(self):
+        transport = HTTPTransport()
+        transport._session = Mock()
+        transport._session.post.return_value = Mock(status_code=200)
+        first = WebhookNotifier('https://hooks.example.com/a', transport=transport)
+        second = WebhookNotifier('https://hooks.example.com/b', transport=transport)
+
+        first.send({'ticker': 'AAPL'})
+        second.send({'ticker': 'MSFT'})
+        first.close()
+
+        self.assertEqual(transport._session.post.call_count, 2)
+        transport._session.close.assert_not_called()
+
+    def test_webhook_leaves_connection_errors_to_the_transport(self):
+        transport = HTTPTransport()
+        transport._session = Mock()
+        transport._session.post.side_effect = requests.ConnectionError('refused')
+        notifier = WebhookNotifier(
+            'https://hooks.example.com/a', max_retries=3, backoff_seconds=0, transport=transport
+        )
+
+        with self.assertRaises(requests.ConnectionError):
+            notifier.send({'ticker': 'AAPL'})
+        self.assertEqual(transport._session.post.call_count, 1)
+
+        transport._session.post.side_effect = [
+            requests.ReadTimeout('slow'), Mock(status_code=200),
+        ]
+        notifier.send({'ticker': 'AAPL'})
+        self.assertEqual(transport._session.post.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
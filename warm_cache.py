@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Prefetch STOCK_POOL bars, benchmarks and disclosures into the persistent caches."""
+
+import argparse
+
+import config
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Warm the data caches before a scan")
+    parser.add_argument(
+        "tickers",
+        nargs="*",
+        help="Tickers to prefetch; defaults to STOCK_POOL",
+    )
+    parser.add_argument(
+        "--market",
+        action="append",
+        choices=("A_STOCK", "HK_STOCK", "US_STOCK"),
+        help="Limit the prefetch to one or more markets",
+    )
+    parser.add_argument(
+        "--period",
+        type=int,
+        default=config.MONITOR_PERIOD,
+        help="Sessions of daily history, matching the scan that follows",
+    )
+    parser.add_argument(
+        "--no-disclosures",
+        action="store_true",
+        help="Skip institutional holdings and shareholder counts",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=config.BATCH_MAX_WORKERS,
+        help="Concurrent prefetch workers (provider rate limits still apply)",
+    )
+    args = parser.parse_args()
+
+    from main import SmartMoneyScanner
+
+    scanner = SmartMoneyScanner()
+    tickers = [ticker.upper() for ticker in args.tickers] or list(config.STOCK_POOL)
+    if args.market:
+        tickers = [
+            ticker for ticker in tickers
+            if scanner.data_fetcher._detect_market(ticker) in args.market
+        ]
+    if not tickers:
+        print("no tickers to prefetch")
+        return
+    summary = scanner.prefetch(
+        tickers,
+        period=max(1, args.period),
+        disclosures=not args.no_disclosures,
+        # Names are cached in-process only; the web app resolves them at startup.
+        names=False,
+        max_workers=max(1, args.workers),
+    )
+    for benchmark, rows in summary["benchmarks"].items():
+        print(f"{benchmark}: {rows} bars")
+    print(
+        f"prefetched: {summary['bars']}/{len(tickers)} tickers with bars, "
+        f"{summary['disclosures']} disclosure datasets"
+    )
+    for error in summary["errors"]:
+        print(f"error: {error}")
+    cache = scanner.data_fetcher.persistent_cache
+    if cache is not None:
+        stats = cache.stats()
+        limit = f"{stats['max_bytes'] / 2**20:.0f} MB" if stats["max_bytes"] else "unbounded"
+        print(f"cache: {stats['entries']} entries, {stats['bytes'] / 2**20:.1f} MB of {limit}")
+    if tickers and not summary["bars"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()